@@ -6,7 +6,7 @@ Analyze 4th down attempt frequency by play style
 import random
 from gridiron_dice import *
 
-def simulate_drive_4th_down_tracking(team: str, x: int, style: str, blocks_left: int = 180) -> dict:
+def simulate_drive_4th_down_tracking(team: str, x: int, style: str, blocks_left: int = 180, drive_roll: int = None) -> dict:
     """
     Simulate a single drive and track 4th down decisions.
     Returns: dict with drive outcome details
@@ -14,8 +14,9 @@ def simulate_drive_4th_down_tracking(team: str, x: int, style: str, blocks_left:
     opponent = "Gunners" if team == "Bombers" else "Bombers"
     score = {team: 0, opponent: 0}
 
-    # Roll for drive outcome
-    drive_roll = random.randint(1, 20)
+    # Roll for drive outcome (unless the caller fixed it, e.g. for stratified sampling)
+    if drive_roll is None:
+        drive_roll = random.randint(1, 20)
     y, t = TABLES[style][drive_roll - 1]
 
     # Roll for turnover
@@ -143,8 +144,16 @@ def simulate_drive_4th_down_tracking(team: str, x: int, style: str, blocks_left:
         result["punt"] = True
         return result
 
-def analyze_4th_down_frequency(num_simulations: int = 10000):
-    """Analyze 4th down attempt frequency by play style"""
+def analyze_4th_down_frequency(num_simulations: int = 10000, stratified: bool = False):
+    """
+    Analyze 4th down attempt frequency by play style
+
+    With stratified=True every d20 drive roll face is forced exactly
+    num_simulations/20 times, so the counts below are already weighted 1/20
+    per face and converge with far fewer drives.
+    """
+    if stratified and num_simulations % 20:
+        raise ValueError("Stratified sampling needs a multiple of 20 drives per style")
 
     results = {
         "balanced": [],
@@ -158,8 +167,9 @@ def analyze_4th_down_frequency(num_simulations: int = 10000):
     print(f"Simulating {num_simulations} drives of each type from the {start_x} yard line...\n")
 
     for style in ["balanced", "run", "pass"]:
-        for _ in range(num_simulations):
-            drive_result = simulate_drive_4th_down_tracking(team, start_x, style)
+        for i in range(num_simulations):
+            drive_roll = (i % 20) + 1 if stratified else None
+            drive_result = simulate_drive_4th_down_tracking(team, start_x, style, drive_roll=drive_roll)
             results[style].append(drive_result)
 
     print("=" * 70)
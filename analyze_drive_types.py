@@ -4,9 +4,11 @@ Analyze average points per drive by drive type from the 30 yard line
 """
 
 import random
+import statistics
 from gridiron_dice import *
+from estimators import allocate_strata, stratified_mean
 
-def simulate_single_drive(team: str, x: int, style: str, blocks_left: int = 180) -> tuple:
+def simulate_single_drive(team: str, x: int, style: str, blocks_left: int = 180, drive_roll: int = None) -> tuple:
     """
     Simulate a single drive and return comprehensive stats.
     Returns: (points, is_td, is_fg_good, opponent_start_x)
@@ -14,8 +16,9 @@ def simulate_single_drive(team: str, x: int, style: str, blocks_left: int = 180)
     opponent = "Gunners" if team == "Bombers" else "Bombers"
     score = {team: 0, opponent: 0}
 
-    # Roll for drive outcome
-    drive_roll = random.randint(1, 20)
+    # Roll for drive outcome (unless the caller fixed it, e.g. for stratified sampling)
+    if drive_roll is None:
+        drive_roll = random.randint(1, 20)
     y, t = TABLES[style][drive_roll - 1]
 
     # Roll for turnover
@@ -142,68 +145,95 @@ def simulate_single_drive(team: str, x: int, style: str, blocks_left: int = 180)
         punt_x = punt_spot(team, end_x)
         return 0, 0, 0, punt_x
 
-def analyze_drive_types(num_simulations: int = 10000):
+def run_drives(team: str, start_x: int, style: str, num_simulations: int, sampling: str) -> list:
+    """
+    Simulate num_simulations drives and group them by stratum.
+
+    sampling="uniform":    one stratum, drive roll rolled as usual
+    sampling="stratified": the d20 drive roll is forced, num_simulations/20 per face
+    sampling="neyman":     forced rolls, split across faces in proportion to each
+                           face's points spread, measured on a separate pilot run
+                           of num_simulations/100 drives per face (at least 10)
+    Returns: list of strata, each a list of simulate_single_drive results
+    """
+    if sampling == "uniform":
+        return [[simulate_single_drive(team, start_x, style) for _ in range(num_simulations)]]
+
+    if sampling == "stratified":
+        counts = allocate_strata(num_simulations)
+        strata = [[] for _ in range(20)]
+    else:
+        # The pilot drives only set the split; reusing them in the estimate
+        # would bias it and understate its standard error
+        pilot = max(10, num_simulations // 100)
+        pilot_points = [[simulate_single_drive(team, start_x, style, drive_roll=face)[0] for _ in range(pilot)]
+                        for face in range(1, 21)]
+        pooled = statistics.pstdev([p for points in pilot_points for p in points])
+        # A face with no spread in its pilot may still have rare scoring drives,
+        # so every face is given at least a tenth of the pooled spread
+        stdevs = [max(statistics.pstdev(points), pooled / 10) for points in pilot_points]
+        counts = allocate_strata(num_simulations, stdevs)
+        strata = [[] for _ in range(20)]
+
+    for face in range(1, 21):
+        drives = strata[face - 1]
+        while len(drives) < counts[face - 1]:
+            drives.append(simulate_single_drive(team, start_x, style, drive_roll=face))
+    return strata
+
+def analyze_drive_types(num_simulations: int = 10000, sampling: str = "uniform"):
     """Analyze average points per drive type from the 30 yard line"""
 
-    results = {
-        "balanced": {"points": [], "tds": [], "fgs": [], "opponent_starts": []},
-        "run": {"points": [], "tds": [], "fgs": [], "opponent_starts": []},
-        "pass": {"points": [], "tds": [], "fgs": [], "opponent_starts": []}
-    }
+    if sampling != "uniform" and num_simulations < 40:
+        raise ValueError("Stratified sampling needs at least 2 drives per d20 face (40 per style)")
+    if num_simulations < 2:
+        raise ValueError("Need at least 2 drives per style for a standard error")
 
     team = "Bombers"
     start_x = 30
 
-    print(f"Simulating {num_simulations} drives of each type from the {start_x} yard line...\n")
+    print(f"Simulating {num_simulations} drives of each type from the {start_x} yard line "
+          f"({sampling} sampling)...\n")
 
+    results = {}
     for style in ["balanced", "run", "pass"]:
-        for _ in range(num_simulations):
-            points, is_td, is_fg, opponent_x = simulate_single_drive(team, start_x, style)
-            results[style]["points"].append(points)
-            results[style]["tds"].append(is_td)
-            results[style]["fgs"].append(is_fg)
-            if opponent_x is not None:  # Only count when opponent actually gets ball
-                results[style]["opponent_starts"].append(opponent_x)
+        results[style] = run_drives(team, start_x, style, num_simulations, sampling)
+
+    def estimate(style, f):
+        """Estimate E[f(drive)] and its standard error, 1/20 weight per stratum"""
+        return stratified_mean([[f(d) for d in drives] for drives in results[style]])
+
+    def opponent_start(style):
+        # Average over drives where the opponent actually gets the ball
+        got_ball, _ = estimate(style, lambda d: d[3] is not None)
+        total_x, _ = estimate(style, lambda d: d[3] if d[3] is not None else 0)
+        return total_x / got_ball if got_ball else 0
 
     print("=" * 70)
     print("COMPREHENSIVE DRIVE TYPE ANALYSIS - Starting at 30 Yard Line")
     print("=" * 70)
     print()
 
+    summary = {}
     for style in ["balanced", "run", "pass"]:
-        data = results[style]
-
-        # Calculate averages
-        avg_points = sum(data["points"]) / len(data["points"])
-        avg_tds = sum(data["tds"]) / len(data["tds"])
-        avg_fgs = sum(data["fgs"]) / len(data["fgs"])
-
-        # Opponent starting position (only when they get the ball)
-        if data["opponent_starts"]:
-            avg_opponent_start = sum(data["opponent_starts"]) / len(data["opponent_starts"])
-        else:
-            avg_opponent_start = 0
+        avg_points, points_se = estimate(style, lambda d: d[0])
+        avg_tds, tds_se = estimate(style, lambda d: d[1])
+        avg_fgs, _ = estimate(style, lambda d: d[2])
+        avg_opponent_start = opponent_start(style)
+        summary[style] = (avg_points, avg_tds, avg_fgs, avg_opponent_start)
 
         print(f"{style.upper()} OFFENSE:")
-        print(f"  Average Points per Drive:        {avg_points:.3f}")
-        print(f"  Average TDs per Drive:            {avg_tds:.3f} ({avg_tds*100:.1f}%)")
+        print(f"  Average Points per Drive:        {avg_points:.3f} (± {1.96*points_se:.3f})")
+        print(f"  Average TDs per Drive:            {avg_tds:.3f} ({avg_tds*100:.1f}% ± {196*tds_se:.1f}%)")
         print(f"  Average Successful FGs per Drive: {avg_fgs:.3f} ({avg_fgs*100:.1f}%)")
         print(f"  Avg Opponent Start Position:      {avg_opponent_start:.1f} yard line")
         print()
 
         # Detailed breakdown
-        zeros = data["points"].count(0)
-        threes = data["points"].count(3)
-        sixes = data["points"].count(6)
-        sevens = data["points"].count(7)
-        eights = data["points"].count(8)
-
         print(f"  Points Distribution:")
-        print(f"    0 points: {zeros:5d} ({100*zeros/num_simulations:5.1f}%)")
-        print(f"    3 points: {threes:5d} ({100*threes/num_simulations:5.1f}%)")
-        print(f"    6 points: {sixes:5d} ({100*sixes/num_simulations:5.1f}%)")
-        print(f"    7 points: {sevens:5d} ({100*sevens/num_simulations:5.1f}%)")
-        print(f"    8 points: {eights:5d} ({100*eights/num_simulations:5.1f}%)")
+        for pts in (0, 3, 6, 7, 8):
+            share, _ = estimate(style, lambda d: d[0] == pts)
+            print(f"    {pts} points: {round(share*num_simulations):5d} ({100*share:5.1f}%)")
         print()
 
     # Comparison summary
@@ -215,25 +245,11 @@ def analyze_drive_types(num_simulations: int = 10000):
     print("                        BALANCED    RUN-FIRST   PASS-FIRST")
     print("                        --------    ---------   ----------")
 
-    bal_avg_pts = sum(results["balanced"]["points"]) / len(results["balanced"]["points"])
-    run_avg_pts = sum(results["run"]["points"]) / len(results["run"]["points"])
-    pass_avg_pts = sum(results["pass"]["points"]) / len(results["pass"]["points"])
-    print(f"Points per Drive:       {bal_avg_pts:8.3f}    {run_avg_pts:9.3f}   {pass_avg_pts:10.3f}")
-
-    bal_avg_tds = sum(results["balanced"]["tds"]) / len(results["balanced"]["tds"])
-    run_avg_tds = sum(results["run"]["tds"]) / len(results["run"]["tds"])
-    pass_avg_tds = sum(results["pass"]["tds"]) / len(results["pass"]["tds"])
-    print(f"TDs per Drive:          {bal_avg_tds:8.3f}    {run_avg_tds:9.3f}   {pass_avg_tds:10.3f}")
-
-    bal_avg_fgs = sum(results["balanced"]["fgs"]) / len(results["balanced"]["fgs"])
-    run_avg_fgs = sum(results["run"]["fgs"]) / len(results["run"]["fgs"])
-    pass_avg_fgs = sum(results["pass"]["fgs"]) / len(results["pass"]["fgs"])
-    print(f"FGs per Drive:          {bal_avg_fgs:8.3f}    {run_avg_fgs:9.3f}   {pass_avg_fgs:10.3f}")
-
-    bal_avg_opp = sum(results["balanced"]["opponent_starts"]) / len(results["balanced"]["opponent_starts"]) if results["balanced"]["opponent_starts"] else 0
-    run_avg_opp = sum(results["run"]["opponent_starts"]) / len(results["run"]["opponent_starts"]) if results["run"]["opponent_starts"] else 0
-    pass_avg_opp = sum(results["pass"]["opponent_starts"]) / len(results["pass"]["opponent_starts"]) if results["pass"]["opponent_starts"] else 0
-    print(f"Opponent Start Pos:     {bal_avg_opp:8.1f}    {run_avg_opp:9.1f}   {pass_avg_opp:10.1f}")
+    bal, run, pas = summary["balanced"], summary["run"], summary["pass"]
+    print(f"Points per Drive:       {bal[0]:8.3f}    {run[0]:9.3f}   {pas[0]:10.3f}")
+    print(f"TDs per Drive:          {bal[1]:8.3f}    {run[1]:9.3f}   {pas[1]:10.3f}")
+    print(f"FGs per Drive:          {bal[2]:8.3f}    {run[2]:9.3f}   {pas[2]:10.3f}")
+    print(f"Opponent Start Pos:     {bal[3]:8.1f}    {run[3]:9.1f}   {pas[3]:10.1f}")
     print()
 
     # Field position analysis
@@ -242,19 +258,18 @@ def analyze_drive_types(num_simulations: int = 10000):
     print()
 
     for style in ["balanced", "run", "pass"]:
-        opp_starts = results[style]["opponent_starts"]
-        if opp_starts:
-            avg = sum(opp_starts) / len(opp_starts)
+        got_ball, _ = estimate(style, lambda d: d[3] is not None)
+        if got_ball:
             # Count how many times opponent starts at different zones
-            own_20 = sum(1 for x in opp_starts if (x <= 20 or x >= 80))
-            own_30 = sum(1 for x in opp_starts if ((21 <= x <= 30) or (70 <= x <= 79)))
-            midfield = sum(1 for x in opp_starts if (31 <= x <= 69))
+            own_20, _ = estimate(style, lambda d: d[3] is not None and (d[3] <= 20 or d[3] >= 80))
+            own_30, _ = estimate(style, lambda d: d[3] is not None and ((21 <= d[3] <= 30) or (70 <= d[3] <= 79)))
+            midfield, _ = estimate(style, lambda d: d[3] is not None and (31 <= d[3] <= 69))
 
             print(f"{style.upper()}:")
-            print(f"  Average: {avg:.1f} yard line")
-            print(f"  Opponent at own 20 or worse: {100*own_20/len(opp_starts):.1f}%")
-            print(f"  Opponent at own 30:          {100*own_30/len(opp_starts):.1f}%")
-            print(f"  Opponent at midfield or better: {100*midfield/len(opp_starts):.1f}%")
+            print(f"  Average: {summary[style][3]:.1f} yard line")
+            print(f"  Opponent at own 20 or worse: {100*own_20/got_ball:.1f}%")
+            print(f"  Opponent at own 30:          {100*own_30/got_ball:.1f}%")
+            print(f"  Opponent at midfield or better: {100*midfield/got_ball:.1f}%")
             print()
 
 if __name__ == "__main__":
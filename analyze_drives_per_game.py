@@ -5,6 +5,7 @@ Analyze the distribution of drives per game
 
 import random
 from gridiron_dice import simulate_game
+from bootstrap import bootstrap_ci, mean_of, quantile_of
 import statistics
 
 def analyze_drives_per_game(num_games: int = 1000):
@@ -56,6 +57,17 @@ def analyze_drives_per_game(num_games: int = 1000):
     print(f"  IQR (Q3-Q1):    {iqr:.1f} drives")
     print()
 
+    print("95% CONFIDENCE INTERVALS (bootstrap):")
+    metrics = {
+        "Mean": mean_of("drives"),
+        "Q1": quantile_of("drives", 0.25),
+        "Median": quantile_of("drives", 0.5),
+        "Q3": quantile_of("drives", 0.75),
+    }
+    for name, (estimate, low, high) in bootstrap_ci({"drives": drive_counts}, metrics).items():
+        print(f"  {name + ':':<15} {estimate:.2f} [{low:.2f}, {high:.2f}] drives")
+    print()
+
     # Frequency distribution
     print("FREQUENCY DISTRIBUTION:")
     from collections import Counter
@@ -6,9 +6,18 @@ Analyze final score distributions from many game simulations
 import random
 from collections import Counter, defaultdict
 from gridiron_dice import simulate_game
+from drive_ep import game_residuals
+from estimators import control_variate_mean, sample_mean
+from bootstrap import bootstrap_ci, mean_of, quantile_of
 
-def analyze_game_scores(num_games: int = 1000):
-    """Simulate many games and analyze score distributions"""
+def analyze_game_scores(num_games: int = 1000, control_variate: bool = False):
+    """
+    Simulate many games and analyze score distributions
+
+    With control_variate=True the averages and win rate are also reported
+    with the exact per-drive expected points subtracted out as a control
+    variate (same estimand, much tighter error bars).
+    """
 
     print(f"Simulating {num_games} games...\n")
 
@@ -18,6 +27,8 @@ def analyze_game_scores(num_games: int = 1000):
     total_scores = []
     score_diffs = []
     final_scores = []  # (bombers, gunners) tuples
+    total_residuals = []  # actual - expected points, per game (control variates)
+    margin_residuals = []
 
     bombers_wins = 0
     gunners_wins = 0
@@ -35,6 +46,11 @@ def analyze_game_scores(num_games: int = 1000):
         score_diffs.append(abs(b_score - g_score))
         final_scores.append((b_score, g_score))
 
+        if control_variate:
+            total_residual, margin_residual = game_residuals(game)
+            total_residuals.append(total_residual)
+            margin_residuals.append(margin_residual)
+
         if b_score > g_score:
             bombers_wins += 1
         elif g_score > b_score:
@@ -77,6 +93,25 @@ def analyze_game_scores(num_games: int = 1000):
     print(f"  Avg Score Differential: {avg_diff:5.1f}")
     print()
 
+    if control_variate:
+        margins = [b - g for b, g in final_scores]
+        bombers_won = [1 if b > g else 0 for b, g in final_scores]
+        rows = [
+            ("Avg Combined Score", total_scores, total_residuals, 1),
+            ("Avg Bombers Margin", margins, margin_residuals, 1),
+            ("Bombers Win %", bombers_won, margin_residuals, 100),
+        ]
+
+        print("CONTROL VARIATE ESTIMATES (95% CI):")
+        print(f"  {'Metric':<20} {'Plain':>16} {'Control variate':>18} {'Var. reduction':>15}")
+        for label, values, residuals, scale in rows:
+            plain, plain_se = sample_mean(values)
+            adjusted, adjusted_se, reduction = control_variate_mean(values, residuals)
+            plain_str = f"{plain*scale:6.2f} ± {1.96*plain_se*scale:4.2f}"
+            adjusted_str = f"{adjusted*scale:6.2f} ± {1.96*adjusted_se*scale:4.2f}"
+            print(f"  {label:<20} {plain_str:>16} {adjusted_str:>18} {reduction:>14.1f}x")
+        print()
+
     print("SCORE RANGES:")
     print(f"  Bombers: {min_bombers:3d} - {max_bombers:3d}")
     print(f"  Gunners: {min_gunners:3d} - {max_gunners:3d}")
@@ -213,6 +248,40 @@ def analyze_game_scores(num_games: int = 1000):
     print(f"Team scoring 40+: {high_scorers} ({high_scorers/len(all_scores)*100:.1f}%)")
     print()
 
+    # Confidence intervals for the headline numbers, all from one set of resamples
+    print("=" * 70)
+    print("95% CONFIDENCE INTERVALS (bootstrap over games)")
+    print("=" * 70)
+    print()
+
+    columns = {
+        "bombers": bombers_scores,
+        "gunners": gunners_scores,
+        "total": total_scores,
+        "diff": score_diffs,
+        "bombers_win": [1 if b > g else 0 for b, g in final_scores],
+        "gunners_win": [1 if g > b else 0 for b, g in final_scores],
+        "tie": [1 if b == g else 0 for b, g in final_scores],
+        "shutout": [1 if b == 0 or g == 0 else 0 for b, g in final_scores],
+        "teams_40": [(b >= 40) + (g >= 40) for b, g in final_scores],
+    }
+    metrics = {
+        "Bombers Win %": mean_of("bombers_win", scale=100),
+        "Gunners Win %": mean_of("gunners_win", scale=100),
+        "Tie %": mean_of("tie", scale=100),
+        "Avg Bombers Score": mean_of("bombers"),
+        "Avg Gunners Score": mean_of("gunners"),
+        "Avg Combined Score": mean_of("total"),
+        "Avg Score Differential": mean_of("diff"),
+        "Median Combined Score": quantile_of("total", 0.5),
+        "Shutout %": mean_of("shutout", scale=100),
+        "Team scoring 40+ %": mean_of("teams_40", scale=50),
+    }
+
+    for name, (estimate, low, high) in bootstrap_ci(columns, metrics).items():
+        print(f"  {name:<24} {estimate:6.1f}  [{low:6.1f}, {high:6.1f}]")
+    print()
+
 if __name__ == "__main__":
     random.seed()
     analyze_game_scores(1000)
@@ -4,6 +4,7 @@ Analyze distribution of game outcomes from batch simulations
 """
 
 from gridiron_dice import simulate_game
+from bootstrap import bootstrap_ci, mean_of, quantile_of
 import statistics
 
 def analyze_batch(n: int = 200):
@@ -103,6 +104,21 @@ def analyze_batch(n: int = 200):
     print(f"  30-34 drives:   {sum(1 for x in drive_counts if 30 <= x < 35):3d} games ({100*sum(1 for x in drive_counts if 30 <= x < 35)/n:.1f}%)")
     print(f"  35+ drives:     {sum(1 for x in drive_counts if x >= 35):3d} games ({100*sum(1 for x in drive_counts if x >= 35)/n:.1f}%)")
 
+    # Means and medians with 95% bootstrap intervals
+    print("\n📊 95% CONFIDENCE INTERVALS (bootstrap)")
+    print("-" * 60)
+    columns = {
+        "Total points": total_points,
+        "Point differential": point_differentials,
+        "Drives": drive_counts,
+    }
+    metrics = {}
+    for name in columns:
+        metrics[f"{name} mean"] = mean_of(name)
+        metrics[f"{name} median"] = quantile_of(name, 0.5)
+    for name, (estimate, low, high) in bootstrap_ci(columns, metrics).items():
+        print(f"  {name + ':':<27} {estimate:5.1f} [{low:5.1f}, {high:5.1f}]")
+
     print("\n" + "="*60)
 
 if __name__ == "__main__":
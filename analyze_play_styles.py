@@ -5,6 +5,9 @@ Analyze points scored by play style for drives starting at own 30-yard line
 
 from gridiron_dice import simulate_game
 from collections import defaultdict
+from bootstrap import bootstrap_ci, ratio_of
+
+STYLES = ["run", "balanced", "pass"]
 
 def analyze_play_styles_from_30(n_games=500):
     """Analyze drive outcomes by play style from the 30-yard line"""
@@ -26,11 +29,16 @@ def analyze_play_styles_from_30(n_games=500):
         "pass": {"TD": 0, "FG": 0, "Turnover": 0, "Zero": 0, "total": 0}
     }
 
+    # Per-game columns for the bootstrap (drives in one game aren't independent,
+    # so games are resampled, not drives): "<stat>_<style>" -> one value per game
+    columns = {f"{stat}_{style}": [] for stat in ("points", "drives", "TD", "Turnover") for style in STYLES}
+
     for i in range(n_games):
         if (i + 1) % 100 == 0:
             print(f"Completed {i + 1}/{n_games} games...")
 
         game = simulate_game(seed=None)
+        game_totals = defaultdict(int)
 
         for drive in game.drives:
             # Check if drive starts at own 30
@@ -47,16 +55,24 @@ def analyze_play_styles_from_30(n_games=500):
                 style_drives[style].append(points)
                 style_outcomes[style]["total"] += 1
 
+                game_totals[f"points_{style}"] += points
+                game_totals[f"drives_{style}"] += 1
+
                 # Categorize outcome
                 if "Turnover" in drive.result:
                     style_outcomes[style]["Turnover"] += 1
+                    game_totals[f"Turnover_{style}"] += 1
                 elif points == 7:
                     style_outcomes[style]["TD"] += 1
+                    game_totals[f"TD_{style}"] += 1
                 elif points == 3:
                     style_outcomes[style]["FG"] += 1
                 else:
                     style_outcomes[style]["Zero"] += 1
 
+        for name, column in columns.items():
+            column.append(game_totals[name])
+
     print(f"\nCompleted all {n_games} games!\n")
 
     # Calculate and display results
@@ -163,6 +179,31 @@ def analyze_play_styles_from_30(n_games=500):
 
     print()
     print("="*80)
+    print()
+
+    # Confidence intervals, including the style differences
+    print("95% CONFIDENCE INTERVALS (bootstrap over games)")
+    print("-" * 80)
+
+    styles = [s for s in STYLES if s in results]
+    metrics = {}
+    for style in styles:
+        metrics[f"{style} avg pts"] = ratio_of(f"points_{style}", f"drives_{style}")
+        metrics[f"{style} TD%"] = ratio_of(f"TD_{style}", f"drives_{style}", scale=100)
+        metrics[f"{style} TO%"] = ratio_of(f"Turnover_{style}", f"drives_{style}", scale=100)
+    for i, a in enumerate(styles):
+        for b in styles[i + 1:]:
+            pts_a = ratio_of(f"points_{a}", f"drives_{a}")
+            pts_b = ratio_of(f"points_{b}", f"drives_{b}")
+            metrics[f"{a} - {b} avg pts"] = lambda cols, pts_a=pts_a, pts_b=pts_b: pts_a(cols) - pts_b(cols)
+
+    for name, (estimate, low, high) in bootstrap_ci(columns, metrics).items():
+        # A difference whose interval spans zero isn't distinguishable at this sample size
+        flag = "  (not significant)" if " - " in name and low <= 0 <= high else ""
+        print(f"  {name:<24} {estimate:8.3f}  [{low:8.3f}, {high:8.3f}]{flag}")
+
+    print()
+    print("="*80)
 
 if __name__ == "__main__":
     analyze_play_styles_from_30(500)
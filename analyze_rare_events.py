@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Estimate rates of rare game events with importance sampling
+
+Safeties, untimed-down touchdowns and big comebacks show up in only a
+percent or two of games, so plain Monte Carlo needs a lot of games to pin
+them down. Each event here has a proposal that tilts the dice toward it;
+every game is weighted by its likelihood ratio so the estimate stays
+unbiased, and the error bars shrink for the same number of games.
+"""
+
+import math
+import random
+from gridiron_dice import simulate_game, use_dice
+from estimators import TiltedDice, weighted_rate
+
+
+def safety_in_game(game) -> bool:
+    return any(d.result.startswith("Safety") for d in game.drives)
+
+
+def untimed_td_in_game(game) -> bool:
+    return any(d.result.startswith("Untimed TD") for d in game.drives)
+
+
+def comeback_in_game(game, deficit: int = 17) -> bool:
+    """True if the winner trailed by `deficit` or more at some point"""
+    score = {"Bombers": 0, "Gunners": 0}
+    worst = {"Bombers": 0, "Gunners": 0}
+    for d in game.drives:
+        opponent = "Gunners" if d.team == "Bombers" else "Bombers"
+        score[d.team] += d.points
+        if d.result.startswith("Safety"):
+            score[opponent] += 2
+        worst["Bombers"] = min(worst["Bombers"], score["Bombers"] - score["Gunners"])
+        worst["Gunners"] = min(worst["Gunners"], score["Gunners"] - score["Bombers"])
+
+    b, g = game.score["Bombers"], game.score["Gunners"]
+    if b > g:
+        return worst["Bombers"] <= -deficit
+    if g > b:
+        return worst["Gunners"] <= -deficit
+    return False
+
+
+# Event -> (detector, TiltedDice keyword arguments)
+RARE_EVENTS = {
+    # Safeties need a drive starting inside the offense's own 10 and a
+    # negative-yardage row, so load the low drive rolls only there.
+    "Safety": (safety_in_game, {
+        "rolls": {"drive": lambda ctx: [6, 4] + [1] * 18 if ctx.yards_to_goal >= 90 else None},
+    }),
+    # Untimed-down TDs need the coach to go for it when time runs out and
+    # the conversion roll to reach the end zone.
+    "Untimed-down TD": (untimed_td_in_game, {
+        "picks": {"end_of_half": lambda probs, ctx: (
+            (probs[0] * 0.3, probs[1] * 0.3 + 0.7, probs[2] * 0.3) if probs[1] > 0 else probs)},
+        "rolls": {"untimed_down": lambda ctx: [1] * 16 + [3, 3, 3, 3]},
+    }),
+    # No simple tilt beats plain sampling for comebacks (the deficit and the
+    # rally are many drives apart and the weights blow up), so this one runs
+    # untilted and just reports its error bar.
+    "Comeback from 17+": (comeback_in_game, {}),
+}
+
+
+def estimate_rate(detector, dice: TiltedDice, num_games: int):
+    """Simulate games with the given dice; returns (rate, std_error, ess)"""
+    hits = []
+    weights = []
+    previous = use_dice(dice)
+    try:
+        for _ in range(num_games):
+            dice.reset()
+            game = simulate_game(seed=None)
+            hits.append(1 if detector(game) else 0)
+            weights.append(dice.weight)
+    finally:
+        use_dice(previous)
+    return weighted_rate(hits, weights)
+
+
+def analyze_rare_events(num_games: int = 5000):
+    """Compare plain Monte Carlo and importance sampling for each rare event"""
+
+    print(f"Simulating {num_games} games per estimator...\n")
+
+    print("=" * 78)
+    print("RARE EVENT RATES (per game, 95% CI)")
+    print("=" * 78)
+    print()
+    print(f"{'Event':<20} {'Plain MC':>22} {'Importance sampled':>22} {'Var. ratio':>10}")
+    print("-" * 78)
+
+    for name, (detector, proposal) in RARE_EVENTS.items():
+        plain, plain_se, _ = estimate_rate(detector, TiltedDice(), num_games)
+        tilted, tilted_se, ess = estimate_rate(detector, TiltedDice(**proposal), num_games)
+
+        # Variance ratio > 1 means importance sampling needs that many times fewer games
+        binomial_se = math.sqrt(max(tilted * (1 - tilted), 0.0) / num_games)
+        ratio = (binomial_se / tilted_se) ** 2 if tilted_se > 0 else float("nan")
+
+        plain_str = f"{plain*100:6.3f}% ± {1.96*plain_se*100:5.3f}%"
+        tilted_str = f"{tilted*100:6.3f}% ± {1.96*tilted_se*100:5.3f}%"
+        print(f"{name:<20} {plain_str:>22} {tilted_str:>22} {ratio:>9.1f}x")
+        print(f"{'':<20} {'':>22} {'(ESS ' + str(int(ess)) + ')':>22}")
+
+    print()
+
+
+if __name__ == "__main__":
+    random.seed()
+    analyze_rare_events(5000)
@@ -0,0 +1,9 @@
+"""
+Benchmarks for the engine hot paths and the bot's drive handler
+
+Run from the repository root:
+    python -m bench                  # run everything, compare to bench/baseline.json
+    python -m bench --save           # run everything and overwrite the baseline
+    python -m bench -k play_drive    # only cases whose name contains "play_drive"
+    python -m bench.loadtest         # load-test the bot's handlers with a fake Discord
+"""
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Run the benchmarks and compare them with the stored baseline
+
+Exits with status 1 if any case regressed by more than --threshold, so it
+can gate a change. Baselines are machine-specific: --save on the machine you
+compare on before trusting the regression flags.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+from bench.cases import all_cases
+from bench.harness import measure, compare
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark the engine hot paths")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="fractional slowdown / memory growth that counts as a regression (default 0.20)")
+    parser.add_argument("--quick", action="store_true", help="one timed repeat per case (noisier)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("cases", {})
+
+    print(f"{'Case':<30} {'ops/sec':>14} {'peak KB':>10} {'blocks/op':>10}  vs baseline")
+    print("-" * 90)
+
+    results = {}
+    regressions = 0
+    for case in all_cases():
+        if args.filter not in case.name:
+            continue
+        if case.skip:
+            print(f"{case.name:<30} {'skipped: ' + case.skip}")
+            continue
+
+        r = measure(case, quick=args.quick)
+        results[case.name] = r
+
+        old = baseline.get(case.name)
+        if old is None:
+            note = "(no baseline)"
+        else:
+            problems = compare(r, old, args.threshold)
+            change = r["ops_per_sec"] / old["ops_per_sec"] - 1
+            note = f"{change*100:+.1f}%"
+            if problems:
+                regressions += 1
+                note += "  REGRESSION: " + "; ".join(problems)
+
+        print(f"{case.name:<30} {r['ops_per_sec']:>14,.{1 if r['ops_per_sec'] >= 100 else 3}f} {r['peak_kb']:>10,.1f} {r['blocks_per_op']:>10.2f}  {note}")
+
+    if args.save:
+        # Keep baselines for cases that weren't run this time
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "meta": {
+                    "saved": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "processor": platform.processor(),
+                },
+                "cases": merged,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if regressions:
+        print(f"\n{regressions} case(s) regressed by more than {args.threshold*100:.0f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Benchmark cases: engine hot paths, AI decisions and the bot's drive handler
+
+Ops that take a situation cycle through a fixed list of them, so each case
+exercises a realistic mix of branches (early/late half, leading/trailing,
+own territory/red zone) instead of one path.
+"""
+
+import importlib.util
+from itertools import cycle
+from typing import List
+
+from gridiron_dice import (
+    STYLES, BLOCKS_PER_HALF, play_drive, simulate_half, simulate_game, simulate_many,
+    choose_style, should_go_for_it, end_of_half_decision, attempt_extra_point, team_id, to_relative,
+)
+from bench.harness import Case, CASE_SEED
+
+# (team, x, blocks_left, half, bombers_score, gunners_score)
+SITUATIONS = [
+    ("Bombers", 30, BLOCKS_PER_HALF, 1, 0, 0),
+    ("Gunners", 70, BLOCKS_PER_HALF, 2, 10, 7),
+    ("Bombers", 55, 120, 1, 7, 3),
+    ("Gunners", 25, 90, 2, 14, 21),
+    ("Bombers", 80, 45, 2, 17, 24),
+    ("Gunners", 60, 20, 2, 28, 21),
+    ("Bombers", 65, 8, 1, 3, 3),
+    ("Bombers", 10, 150, 1, 0, 7),
+]
+
+
+def _opponent(team: str) -> str:
+    return "Gunners" if team == "Bombers" else "Bombers"
+
+
+def _play_drive_case(style: str):
+    def setup():
+        situations = cycle(SITUATIONS)
+
+        def op():
+            team, x, blocks_left, half, b, g = next(situations)
+            return play_drive(team, _opponent(team), x, style, blocks_left, half,
+                              {"Bombers": b, "Gunners": g})
+        return op
+    return setup
+
+
+def _simulate_half():
+    def op():
+        return simulate_half("Bombers", 30, {"Bombers": 0, "Gunners": 0}, half=1)
+    return op
+
+
+def _simulate_game():
+    return lambda: simulate_game(seed=None)
+
+
+def _simulate_many():
+    return lambda: simulate_many(10_000, seed=CASE_SEED)
+
+
+def _choose_style():
+    situations = cycle(SITUATIONS)
+
+    def op():
+        team, _, blocks_left, _, b, g = next(situations)
+        lead = (b - g) if team == "Bombers" else (g - b)
+        return choose_style(team, lead, blocks_left)
+    return op
+
+
+def _should_go_for_it():
+    situations = cycle([(s, style, gained) for s in SITUATIONS for style in STYLES for gained in (4, 12)])
+
+    def op():
+        (team, x, blocks_left, half, b, g), style, gained = next(situations)
+        return should_go_for_it(team, x, {"Bombers": b, "Gunners": g}, blocks_left, half, style, gained)
+    return op
+
+
+def _end_of_half_decision():
+    situations = cycle(SITUATIONS)
+
+    def op():
+        team, x, _, half, b, g = next(situations)
+        return end_of_half_decision(team, x, {"Bombers": b, "Gunners": g}, _opponent(team), half)
+    return op
+
+
+def _attempt_extra_point():
+    situations = cycle(SITUATIONS)
+
+    def op():
+        team, _, blocks_left, half, b, g = next(situations)
+        return attempt_extra_point(team, {"Bombers": b, "Gunners": g}, blocks_left, half)
+    return op
+
+
+# -----------------------------
+# Bot: execute_drive against a stub channel
+# -----------------------------
+
+class StubMember:
+    """Just enough of a discord.Member for GameState and the embeds"""
+
+    def __init__(self, member_id: int, name: str):
+        self.id = member_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{member_id}>"
+        self.bot = False
+
+
+class StubChannel:
+    """Swallows messages; counts them so the work can't be optimised away"""
+
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.sent = 0
+
+    async def send(self, content=None, embed=None, **kwargs):
+        self.sent += 1
+
+
+class StubResponse:
+    def __init__(self, channel: StubChannel):
+        self.channel = channel
+
+    def is_done(self) -> bool:
+        return False
+
+    async def send_message(self, content=None, embed=None, **kwargs):
+        await self.channel.send(content, embed=embed)
+
+
+class StubInteraction:
+    def __init__(self, channel: StubChannel, user: StubMember):
+        self.channel = channel
+        self.channel_id = channel.id
+        self.user = user
+        self.response = StubResponse(channel)
+
+
+def run_to_completion(coro):
+    """
+    Drive a coroutine that never really suspends (the stubs return at once)
+    without an event loop, so loop overhead doesn't swamp the handler.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("benchmarked coroutine suspended; it needs a real event loop")
+
+
+def _execute_drive_case(style: str):
+    def setup():
+        import discord_bot
+
+        channel = StubChannel(1)
+        players = (StubMember(101, "Home"), StubMember(102, "Away"))
+        situations = cycle(SITUATIONS)
+
+        def op():
+            team, x, blocks_left, half, b, g = next(situations)
+            game = discord_bot.GameState(channel.id, *players)
+            engine = game.engine
+            engine.possession = team_id(team)
+            engine.pos = to_relative(engine.possession, x)
+            engine.blocks_left = game.drive_start_blocks = blocks_left
+            engine.half = half
+            engine.score = [b, g]
+            # Registered so a drive that ends the game can be cleaned up
+            discord_bot.games[channel.id] = game
+            interaction = StubInteraction(channel, game.current_player())
+            return run_to_completion(discord_bot.execute_drive(interaction, game, style))
+        return op
+    return setup
+
+
+def _bot_skip_reason():
+    if importlib.util.find_spec("discord") is None:
+        return "discord.py not installed"
+    return None
+
+
+def all_cases() -> List[Case]:
+    cases = [Case(f"play_drive[{style}]", _play_drive_case(style)) for style in STYLES]
+    cases += [
+        Case("simulate_half", _simulate_half),
+        Case("simulate_game", _simulate_game),
+        Case("simulate_many(10_000)", _simulate_many, loops=1, repeats=3),
+        Case("ai.choose_style", _choose_style),
+        Case("ai.should_go_for_it", _should_go_for_it),
+        Case("ai.end_of_half_decision", _end_of_half_decision),
+        Case("ai.attempt_extra_point", _attempt_extra_point),
+    ]
+    skip = _bot_skip_reason()
+    cases += [Case(f"bot.execute_drive[{style}]", _execute_drive_case(style), skip=skip) for style in STYLES]
+    return cases
@@ -0,0 +1,127 @@
+"""
+Timing and memory measurement for benchmark cases
+
+Each case is measured twice:
+- Speed: the op is looped until a run takes at least MIN_TIME seconds, that
+  run is repeated REPEATS times, and the fastest one gives ops/sec (the
+  fastest run is the one least disturbed by the rest of the machine).
+- Memory: the op is looped MEMORY_LOOPS times under tracemalloc, which
+  gives the peak traced memory while it runs and the number of memory
+  blocks it allocated and didn't free. Tracing slows everything down a lot,
+  so it never overlaps the timed runs.
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+MIN_TIME = 0.2
+REPEATS = 5
+MEMORY_LOOPS = 50
+
+# Every case starts from the same random state so it does the same work
+CASE_SEED = 1234
+
+
+class Case:
+    """
+    A named benchmark.
+
+    setup: function() -> op, where op is a no-argument callable doing one
+           unit of work. Setup is not timed.
+    loops: fixed loop count for slow ops (skips calibration), or None.
+    skip:  reason the case can't run here (e.g. a missing dependency), or None.
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]],
+                 loops: Optional[int] = None, repeats: int = REPEATS, skip: Optional[str] = None):
+        self.name = name
+        self.setup = setup
+        self.loops = loops
+        self.repeats = repeats
+        self.skip = skip
+
+
+def _time_loops(op, loops: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _calibrate(op) -> int:
+    """Smallest power-of-ten-ish loop count that runs for at least MIN_TIME"""
+    loops = 1
+    while True:
+        for factor in (1, 2, 5):
+            n = loops * factor
+            if _time_loops(op, n) >= MIN_TIME:
+                return n
+        loops *= 10
+
+
+def measure(case: Case, quick: bool = False) -> Dict[str, float]:
+    """
+    Run one case.
+    Returns: {"ops_per_sec", "peak_kb", "blocks_per_op", "loops"}
+    """
+    random.seed(CASE_SEED)
+    op = case.setup()
+
+    if case.loops is not None:
+        loops = case.loops
+    else:
+        loops = _calibrate(op)
+    repeats = 1 if quick else case.repeats
+    best = min(_time_loops(op, loops) for _ in range(repeats))
+
+    # Memory pass
+    memory_loops = min(loops, MEMORY_LOOPS)
+    random.seed(CASE_SEED)
+    op = case.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before_current, _ = tracemalloc.get_traced_memory()
+        before_blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.reset_peak()
+        for _ in range(memory_loops):
+            op()
+        _, peak = tracemalloc.get_traced_memory()
+        after_blocks = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": float(f"{loops / best:.4g}"),
+        "peak_kb": round((peak - before_current) / 1024, 1),
+        "blocks_per_op": round((after_blocks - before_blocks) / memory_loops, 2),
+        "loops": loops,
+    }
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float) -> list:
+    """
+    Regressions of one case against its baseline.
+    Slower by more than `threshold` (a fraction) or using that much more
+    peak memory counts; returns a list of human-readable messages.
+    """
+    problems = []
+    old_ops = baseline.get("ops_per_sec")
+    if old_ops and current["ops_per_sec"] < old_ops * (1 - threshold):
+        drop = 1 - current["ops_per_sec"] / old_ops
+        problems.append(f"{drop*100:.0f}% slower ({old_ops:,.0f} -> {current['ops_per_sec']:,.0f} ops/s)")
+
+    old_peak = baseline.get("peak_kb")
+    # Peaks of a few KB are mostly noise from the interpreter itself
+    if old_peak and old_peak > 16 and current["peak_kb"] > old_peak * (1 + threshold):
+        problems.append(f"peak memory {old_peak:,.1f} -> {current['peak_kb']:,.1f} KB")
+    return problems
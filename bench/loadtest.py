@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Headless load test for the Discord bot
+
+Plays thousands of concurrent games through discord_bot's real command
+handlers (newgame, nameteam, solitaire, handle_play_style,
+handle_fourth_down_decision, handle_extra_point) on one event loop, with
+in-process stand-ins for discord.Interaction, channels and members. The
+fake transport answers every send after --latency seconds, like Discord's
+round trip; players wait --think seconds between moves and let the AI coach
+pick what to do. Solitaire games at --speed normal pause --ai-delay
+seconds before each AI turn, so the bot plays them one at a time, as it
+does by default in production. Reports throughput, handler latency
+percentiles (overall and per handler), event-loop lag and memory per game.
+
+    python -m bench.loadtest                         # 1000 games, half solitaire
+    python -m bench.loadtest --games 5000 --think 0.2
+    python -m bench.loadtest --store                 # journal and archive to temporary SQLite files too
+
+Needs discord.py installed (discord_bot imports it); nothing connects to Discord.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from typing import Dict, List
+
+from metrics import rss_bytes
+
+# How often the loop-lag sampler wakes (seconds)
+LAG_INTERVAL = 0.05
+# Default AI pause for --speed normal: any delay above 0 makes the bot play
+# the AI turn by turn (execute_ai_turn); 0 is the instant path
+NORMAL_AI_DELAY = 0.01
+
+
+# -----------------------------
+# Fake Discord transport
+# -----------------------------
+
+class FakeMember:
+    """The parts of a discord.Member the bot uses"""
+
+    def __init__(self, member_id: int, name: str, bot: bool = False):
+        self.id = member_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{member_id}>"
+        self.bot = bot
+
+
+class FakeChannel:
+    """A text channel whose sends take `latency` seconds"""
+
+    def __init__(self, channel_id: int, run: "LoadRun"):
+        self.id = channel_id
+        self.run = run
+
+    async def send(self, content=None, embeds=None, embed=None, **kwargs):
+        await self.run.transport()
+
+
+class FakeResponse:
+    def __init__(self, run: "LoadRun"):
+        self.run = run
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+        await self.run.transport()
+
+    async def send_message(self, content=None, embeds=None, embed=None, **kwargs):
+        if self.done:
+            raise RuntimeError("interaction answered twice")
+        self.done = True
+        await self.run.transport()
+
+
+class FakeFollowup:
+    def __init__(self, run: "LoadRun"):
+        self.run = run
+
+    async def send(self, content=None, embeds=None, embed=None, **kwargs):
+        await self.run.transport()
+
+
+class FakeCommand:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeClient:
+    def __init__(self, user: FakeMember):
+        self.user = user
+
+
+class FakeInteraction:
+    """One slash command invocation"""
+
+    def __init__(self, run: "LoadRun", channel: FakeChannel, user: FakeMember, command: str):
+        self.channel = channel
+        self.channel_id = channel.id
+        self.user = user
+        self.client = run.client
+        self.command = FakeCommand(command)
+        self.response = FakeResponse(run)
+        self.followup = FakeFollowup(run)
+        self.run = run
+
+    async def delete_original_response(self):
+        await self.run.transport()
+
+
+def _callback(command):
+    """The coroutine function behind a slash command"""
+    return getattr(command, "callback", command)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# -----------------------------
+# The run
+# -----------------------------
+
+class LoadRun:
+    """Plays the games and keeps the numbers"""
+
+    def __init__(self, bot_module, args):
+        self.bot = bot_module
+        self.args = args
+        self.client = FakeClient(FakeMember(1, "4th Down Bot", bot=True))
+        self.latencies: Dict[str, List[float]] = {}
+        self.lags: List[float] = []
+        self.messages = 0
+        self.errors = 0
+        self.finished = 0
+        self.peak_games = 0
+        self.peak_rss = 0
+        self.running = True
+
+    async def transport(self):
+        """One request to 'Discord'"""
+        self.messages += 1
+        if self.args.latency > 0:
+            await asyncio.sleep(self.args.latency)
+
+    async def think(self):
+        if self.args.think > 0:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self.args.think)
+
+    async def call(self, name: str, handler, *args):
+        start = time.perf_counter()
+        await handler(*args)
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+    async def move(self, channel: FakeChannel, game):
+        """The player on the ball makes the AI coach's call"""
+        bot = self.bot
+        action = game.engine.ai_action()
+        interaction = FakeInteraction(self, channel, game.current_player(), bot.ACTION_COMMANDS[action][1:])
+        if game.awaiting_action == "play_style":
+            await self.call("handle_play_style", bot.handle_play_style, interaction, action)
+        elif game.awaiting_action == "extra_point":
+            await self.call("handle_extra_point", bot.handle_extra_point, interaction, action == bot.TWO_POINT)
+        else:
+            decision = {action: decision for decision, action in bot.DECISION_ACTIONS.items()}[action]
+            await self.call("handle_fourth_down_decision", bot.handle_fourth_down_decision, interaction, decision)
+
+    async def play_versus(self, n: int):
+        bot = self.bot
+        channel = FakeChannel(1000 + n, self)
+        home = FakeMember(10_000 + 2 * n, f"home{n}")
+        away = FakeMember(10_001 + 2 * n, f"away{n}")
+        await self.call("newgame", _callback(bot.newgame), FakeInteraction(self, channel, home, "newgame"), away, "Home")
+        await self.think()
+        await self.call("nameteam", _callback(bot.nameteam), FakeInteraction(self, channel, away, "nameteam"), "Away")
+        while bot.has_game(channel.id):
+            await self.think()
+            game = await bot.get_game(channel.id)
+            if game is not None:
+                await self.move(channel, game)
+
+    async def play_solitaire(self, n: int):
+        bot = self.bot
+        channel = FakeChannel(1000 + n, self)
+        human = FakeMember(10_000 + 2 * n, f"solo{n}")
+        await self.call("solitaire", _callback(bot.solitaire),
+                        FakeInteraction(self, channel, human, "solitaire"), "Solo", self.args.speed)
+        while bot.has_game(channel.id):
+            game = await bot.get_game(channel.id)
+            if game is None:
+                break
+            if game.ai_task is not None:
+                # The AI's on the ball; wait for it (cancelled if the game ends)
+                await asyncio.wait([game.ai_task])
+                continue
+            if bot.ai_to_move(game):
+                await asyncio.sleep(0)
+                continue
+            await self.think()
+            await self.move(channel, game)
+
+    async def play(self, n: int):
+        if self.args.ramp > 0:
+            await asyncio.sleep(random.uniform(0, self.args.ramp))
+        try:
+            if n % 100 < self.args.solitaire * 100:
+                await self.play_solitaire(n)
+            else:
+                await self.play_versus(n)
+            self.finished += 1
+        except Exception:
+            self.errors += 1
+            if self.errors <= 3:
+                traceback.print_exc()
+
+    async def sample(self):
+        """Loop lag, resident games and RSS, every LAG_INTERVAL"""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+            self.peak_games = max(self.peak_games, len(self.bot.games))
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+
+    async def run(self) -> float:
+        sampler = asyncio.create_task(self.sample())
+        start = time.perf_counter()
+        await asyncio.gather(*(self.play(n) for n in range(self.args.games)))
+        # Let the outboxes finish posting
+        for outbox in list(self.bot.outboxes.values()):
+            await outbox.drain()
+        elapsed = time.perf_counter() - start
+        self.running = False
+        await sampler
+        return elapsed
+
+
+def report(run: LoadRun, elapsed: float, baseline_rss: int):
+    args = run.args
+    every = [latency for latencies in run.latencies.values() for latency in latencies]
+    solitaire = sum(1 for n in range(args.games) if n % 100 < args.solitaire * 100)
+    print(f"Load test: {args.games} games ({args.games - solitaire} versus, {solitaire} solitaire/{args.speed}), "
+          f"think {args.think}s, transport latency {args.latency}s, AI delay {args.ai_delay}s")
+    print("-" * 78)
+    print(f"{'Wall time':<18} {elapsed:.2f} s")
+    print(f"{'Games finished':<18} {run.finished} / {args.games}  (errors: {run.errors})")
+    print(f"{'Handler calls':<18} {len(every):,}  ({len(every) / elapsed:,.0f}/s, "
+          f"{run.finished / elapsed:,.1f} games/s)")
+    print(f"{'Handler latency':<18} p50 {percentile(every, 0.5) * 1000:.2f} ms   "
+          f"p99 {percentile(every, 0.99) * 1000:.2f} ms   max {max(every, default=0) * 1000:.1f} ms")
+    print(f"{'Event-loop lag':<18} p50 {percentile(run.lags, 0.5) * 1000:.2f} ms   "
+          f"p99 {percentile(run.lags, 0.99) * 1000:.2f} ms   max {max(run.lags, default=0) * 1000:.1f} ms")
+    print(f"{'Discord requests':<18} {run.messages:,}")
+    ai_turns = run.bot.AI_TURN_SECONDS.values.get(())
+    if ai_turns:
+        count = sum(ai_turns[:-1])
+        print(f"{'AI turns':<18} {count:,}  (mean {ai_turns[-1] / count * 1000:.2f} ms)")
+    growth = max(0, run.peak_rss - baseline_rss)
+    per_game = growth / max(1, run.peak_games)
+    print(f"{'Memory':<18} peak RSS {run.peak_rss / 1e6:.1f} MB (+{growth / 1e6:.1f} MB), "
+          f"{run.peak_games} games resident at peak, ~{per_game / 1024:.1f} KB per game")
+    print()
+    print(f"{'Handler':<30} {'calls':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, latencies in sorted(run.latencies.items()):
+        print(f"{name:<30} {len(latencies):>9,} {percentile(latencies, 0.5) * 1000:>9.2f} "
+              f"{percentile(latencies, 0.99) * 1000:>9.2f} {max(latencies) * 1000:>9.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.loadtest", description="Load-test the bot's handlers")
+    parser.add_argument("--games", type=int, default=1000, help="concurrent games (default 1000)")
+    parser.add_argument("--solitaire", type=float, default=0.5, help="fraction played against the AI (default 0.5)")
+    parser.add_argument("--speed", choices=("normal", "instant"), default="normal", help="solitaire speed")
+    parser.add_argument("--think", type=float, default=0.05, help="mean seconds a player waits between moves")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds each Discord request takes")
+    parser.add_argument("--ai-delay", type=float, default=None,
+                        help=f"seconds the AI pauses before each turn (default {NORMAL_AI_DELAY} for "
+                             f"--speed normal; 0 plays its turns instantly)")
+    parser.add_argument("--ramp", type=float, default=1.0, help="spread game starts over this many seconds")
+    parser.add_argument("--store", action="store_true", help="journal and archive games to temporary SQLite files")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args(argv)
+    if args.ai_delay is None:
+        args.ai_delay = NORMAL_AI_DELAY if args.speed == "normal" else 0.0
+
+    if importlib.util.find_spec("discord") is None:
+        print("discord.py not installed: the load test drives discord_bot, which needs it")
+        return 2
+    import discord_bot
+    from game_archive import GameArchive
+    from game_store import GameStore
+
+    random.seed(args.seed)
+    discord_bot.AI_TURN_DELAY = args.ai_delay
+    workdir = None
+    if args.store:
+        workdir = tempfile.mkdtemp()
+        discord_bot.store = GameStore(os.path.join(workdir, "loadtest.db"))
+        discord_bot.archive = GameArchive(os.path.join(workdir, "archive.db"))
+
+    baseline_rss = rss_bytes()
+    run = LoadRun(discord_bot, args)
+    try:
+        elapsed = asyncio.run(run.run())
+    finally:
+        if workdir is not None:
+            discord_bot.store.close()
+            discord_bot.archive.close()
+            shutil.rmtree(workdir)
+    report(run, elapsed, baseline_rss)
+    return 0 if run.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
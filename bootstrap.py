@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence intervals for the analysis scripts
+
+The data is columnar: one list per quantity, one entry per game (or drive).
+Each resample draws a single index array and gathers every column through
+it at C speed (operator.itemgetter), then evaluates all metrics on the
+gathered columns - so one resample costs one index draw no matter how many
+metrics are reported. Large jobs are split across CPU cores.
+
+Example:
+    columns = {"total": totals, "bombers_win": wins}
+    metrics = {"Avg Combined Score": mean_of("total"),
+               "Bombers Win %": mean_of("bombers_win", scale=100)}
+    for name, (estimate, low, high) in bootstrap_ci(columns, metrics).items():
+        print(f"{name}: {estimate:.2f} [{low:.2f}, {high:.2f}]")
+"""
+
+import multiprocessing
+import os
+import random
+from operator import itemgetter
+from typing import Callable, Dict, Sequence, Tuple
+
+# Resample work (rows x resamples) above which the job is spread over cores
+PARALLEL_THRESHOLD = 2_000_000
+CHUNKS = 16
+
+# Set before forking workers so they inherit them (metric lambdas can't be pickled)
+_columns = None
+_metrics = None
+
+
+def mean_of(name: str, scale: float = 1.0) -> Callable:
+    """Metric: mean of a column (use a 0/1 column and scale=100 for a percentage)"""
+    def metric(cols):
+        col = cols[name]
+        return scale * sum(col) / len(col)
+    return metric
+
+
+def ratio_of(numerator: str, denominator: str, scale: float = 1.0) -> Callable:
+    """Metric: sum of one column over the sum of another (e.g. points per drive from per-game totals)"""
+    def metric(cols):
+        den = sum(cols[denominator])
+        return scale * sum(cols[numerator]) / den if den else 0.0
+    return metric
+
+
+def quantile_of(name: str, q: float) -> Callable:
+    """Metric: q-quantile of a column (nearest rank)"""
+    def metric(cols):
+        ordered = sorted(cols[name])
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return metric
+
+
+def _resample_chunk(args) -> Dict[str, list]:
+    """Run `count` resamples with their own seeded generator"""
+    seed, count = args
+    rng = random.Random(seed)
+    names = list(_columns)
+    data = [_columns[name] for name in names]
+    n = len(data[0])
+    population = range(n)
+    results = {name: [] for name in _metrics}
+
+    for _ in range(count):
+        gather = itemgetter(*rng.choices(population, k=n))
+        cols = dict(zip(names, (gather(col) for col in data)))
+        for name, metric in _metrics.items():
+            results[name].append(metric(cols))
+    return results
+
+
+def bootstrap_ci(columns: Dict[str, Sequence[float]], metrics: Dict[str, Callable],
+                 num_resamples: int = 1000, confidence: float = 0.95,
+                 seed: int = None, processes: int = None) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Percentile bootstrap intervals for every metric at once.
+
+    columns:   name -> per-row values, all the same length (at least 2 rows)
+    metrics:   name -> function(columns) -> float, e.g. mean_of("total")
+    processes: worker count; default uses every core for large jobs, 1 otherwise
+    Returns: metric name -> (estimate on the full data, low, high)
+    """
+    global _columns, _metrics
+    n = len(next(iter(columns.values())))
+    if n < 2:
+        raise ValueError("Bootstrap needs at least 2 rows")
+    if any(len(col) != n for col in columns.values()):
+        raise ValueError("All columns must have the same length")
+
+    _columns = {name: list(col) for name, col in columns.items()}
+    _metrics = dict(metrics)
+
+    if processes is None:
+        processes = (os.cpu_count() or 1) if n * num_resamples >= PARALLEL_THRESHOLD else 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        processes = 1  # workers must inherit the metric functions
+
+    # Fixed chunking (each chunk seeded on its own) so results don't depend on the core count
+    # (an unseeded run draws its base seed from the OS, leaving the caller's random stream alone)
+    base_seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+    chunks = min(CHUNKS, num_resamples)
+    per_chunk = [num_resamples // chunks + (1 if i < num_resamples % chunks else 0) for i in range(chunks)]
+    jobs = [(base_seed + i, count) for i, count in enumerate(per_chunk)]
+
+    try:
+        if processes > 1:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                parts = pool.map(_resample_chunk, jobs)
+        else:
+            parts = [_resample_chunk(job) for job in jobs]
+
+        full = {name: tuple(col) for name, col in _columns.items()}
+        tail = (1 - confidence) / 2
+        intervals = {}
+        for name, metric in _metrics.items():
+            values = sorted(v for part in parts for v in part[name])
+            low = values[int(tail * (len(values) - 1))]
+            high = values[int((1 - tail) * (len(values) - 1))]
+            intervals[name] = (metric(full), low, high)
+        return intervals
+    finally:
+        _columns = None
+        _metrics = None
@@ -4,17 +4,27 @@
 Play turn-based football games with slash commands
 """
 
+import asyncio
+import base64
+import functools
 import os
+import sys
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 import random
-from typing import Dict, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+import metrics
+from game_store import GameStore, StoreError, DEFAULT_PATH as DEFAULT_STORE_PATH
+from game_archive import GameArchive, GameRecord, DEFAULT_PATH as DEFAULT_ARCHIVE_PATH
+from outbox import Outbox, batches
 from gridiron_dice import (
-    simulate_half, kickoff_position, choose_style,
-    yards_to_endzone, within_fg_range, attempt_field_goal,
-    should_go_for_it, attempt_fourth_down, attempt_extra_point,
-    BLOCKS_PER_HALF
+    GameEngine, Tape, TEAMS, BOMBERS, GUNNERS, team_id, team_stats,
+    PLAY_STYLE, FOURTH_DOWN, UNTIMED_DOWN, EXTRA_POINT, GAME_OVER,
+    GO_FOR_IT, FIELD_GOAL, PUNT, END_HALF, ONE_POINT, TWO_POINT,
 )
 
 # Bot setup
@@ -24,102 +34,320 @@ intents.message_content = True
 intents.members = True  # Required to look up members by name
 bot = commands.Bot(command_prefix="!", intents=intents)
 
-# Game state storage: channel_id -> game_state
-games: Dict[int, dict] = {}
+# Game state storage: channel_id -> game_state, least recently used first
+games: "OrderedDict[int, GameState]" = OrderedDict()
+# Games spilled to the store to bound memory: channel_id -> (awaiting_action, last_active)
+spilled: Dict[int, Tuple[str, float]] = {}
+
+# Durable copy of `games` (set up in __main__; None keeps games in memory only)
+store: Optional[GameStore] = None
+# Finished games, as roll tapes (None = not archived)
+archive: Optional[GameArchive] = None
+ai_resumed = False
+
+# Channels with messages on their way out: channel_id -> Outbox
+outboxes: Dict[int, Outbox] = {}
+sweeper_task: Optional[asyncio.Task] = None
+ready = False
+
+# Metrics, served on GRIDIRON_METRICS_PORT (unset = no server; they're
+# recorded either way, it's cheap)
+METRICS_PORT = os.getenv("GRIDIRON_METRICS_PORT")
+METRICS_HOST = os.getenv("GRIDIRON_METRICS_HOST", "127.0.0.1")
+registry = metrics.Registry()
+COMMAND_SECONDS = registry.histogram("gridiron_command_seconds", "Slash command handling time", ("command",))
+AI_TURN_SECONDS = registry.histogram("gridiron_ai_turn_seconds", "Time to play and post one AI turn")
+GAMES = registry.gauge("gridiron_games", "Games by what they're waiting on", ("state",))
+MESSAGES_SENT = registry.counter("gridiron_messages_sent_total", "Messages sent (replies and channel posts)")
+RATE_LIMITED = registry.counter("gridiron_rate_limited_total", "Channel posts that hit a rate limit and were retried")
+LOOP_LAG = registry.gauge("gridiron_event_loop_lag_seconds", "How late the event loop last woke a sleeper")
+RSS = registry.gauge("process_resident_memory_bytes", "Resident memory")
+READY = registry.gauge("gridiron_ready", "1 once connected and commands are synced")
+
+# Seconds the AI "thinks" before each solitaire turn (0 = instant: its
+# whole run of turns is played at once and posted as one summary)
+AI_TURN_DELAY = float(os.getenv("GRIDIRON_AI_DELAY", "1"))
+
+# Seconds a game may sit waiting on each action before it's abandoned.
+# Override with e.g. GRIDIRON_GAME_TTLS="team2_name=600,play_style=86400"
+GAME_TTLS = {
+    "team2_name": 15 * 60,
+    "play_style": 24 * 60 * 60,
+    "4th_down": 24 * 60 * 60,
+    "final_play": 24 * 60 * 60,
+    "extra_point": 24 * 60 * 60,
+}
+# Most games kept in memory when there's a store to spill the rest to
+MAX_RESIDENT_GAMES = int(os.getenv("GRIDIRON_MAX_GAMES", "1000"))
+# Seconds between sweeps for abandoned games
+SWEEP_INTERVAL = 60
+
+# Engine phase -> the bot's name for what it's waiting on
+AWAITING_ACTIONS = {
+    PLAY_STYLE: "play_style",
+    FOURTH_DOWN: "4th_down",
+    UNTIMED_DOWN: "final_play",
+    EXTRA_POINT: "extra_point",
+    GAME_OVER: "game_over",
+}
+
+# Engine action -> the slash command that takes it
+ACTION_COMMANDS = {
+    "balanced": "/balanced", "run": "/run", "pass": "/pass",
+    GO_FOR_IT: "/goforit", FIELD_GOAL: "/fieldgoal", PUNT: "/punt", END_HALF: "/kneel",
+    ONE_POINT: "/1pt", TWO_POINT: "/2pt",
+}
+
+# handle_fourth_down_decision's decisions -> engine actions
+DECISION_ACTIONS = {"goforit": GO_FOR_IT, "fieldgoal": FIELD_GOAL, "punt": PUNT, "kneel": END_HALF}
+
+AI_TURN_TITLES = {
+    "balanced": "BALANCED OFFENSE", "run": "RUN OFFENSE", "pass": "PASS OFFENSE",
+    GO_FOR_IT: "GOFORIT", FIELD_GOAL: "FIELDGOAL", PUNT: "PUNT", END_HALF: "KNEEL",
+}
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Parse "action=seconds,..." into {action: seconds}"""
+    ttls = {}
+    for item in spec.split(","):
+        if item.strip():
+            action, seconds = item.split("=")
+            ttls[action.strip()] = float(seconds)
+    return ttls
+
+
+GAME_TTLS.update(parse_ttls(os.getenv("GRIDIRON_GAME_TTLS", "")))
+
+
+@registry.collect
+def collect_metrics():
+    GAMES.clear()
+    counts: Dict[str, int] = {}
+    for game in games.values():
+        counts[game.awaiting_action] = counts.get(game.awaiting_action, 0) + 1
+    for awaiting_action, _ in spilled.values():
+        counts[awaiting_action] = counts.get(awaiting_action, 0) + 1
+    for state, count in counts.items():
+        GAMES.set(count, state=state)
+    RSS.set(metrics.rss_bytes())
+    READY.set(1 if ready else 0)
+
+
+def timed_command(handler):
+    """Record a slash command's handling time under the command's name"""
+    @functools.wraps(handler)
+    async def timed(interaction: discord.Interaction, *args, **kwargs):
+        command = getattr(interaction.command, "name", handler.__name__)
+        with COMMAND_SECONDS.time(command=command):
+            await handler(interaction, *args, **kwargs)
+    return timed
+
+
+class PlayerRef:
+    """
+    A player as a game keeps them: the id (and whether it's the bot). That's
+    all the bot needs for turns and mentions; the discord.Member is only
+    looked up for its display name.
+    """
+
+    __slots__ = ("id", "bot")
+
+    def __init__(self, member_id: int, bot: bool = False):
+        self.id = member_id
+        self.bot = bot
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def display_name(self) -> str:
+        user = bot.get_user(self.id)
+        return user.display_name if user is not None else self.mention
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
 
 
 class GameState:
-    """Manages the state of an ongoing game"""
+    """
+    A game in a channel: the players and team names around a GameEngine.
+
+    Kept small so a worker can hold tens of thousands: slotted, players as
+    ids (PlayerRefs are made when asked for), team names indexed by team
+    id, and the lock only exists while a command holds or waits for it.
+    """
+
+    __slots__ = ("channel_id", "is_solitaire", "player_ids", "ai_team", "names", "engine", "setup_pending",
+                 "drive_start_blocks", "ai_delay", "ai_task", "last_active", "_lock", "lock_users", "tape")
 
     def __init__(self, channel_id: int, player1: discord.Member, player2: discord.Member,
                  team1_name: str = "Bombers", team2_name: str = "Gunners", is_solitaire: bool = False):
         self.channel_id = channel_id
         self.is_solitaire = is_solitaire
 
-        # Randomly assign teams
-        if random.random() < 0.5:
-            self.bombers_player = player1
-            self.gunners_player = player2
-            # Team names follow the players
-            self.team_names = {
-                "Bombers": team1_name,
-                "Gunners": team2_name
-            }
-        else:
-            self.bombers_player = player2
-            self.gunners_player = player1
-            # Team names follow the players (swapped)
-            self.team_names = {
-                "Bombers": team2_name,
-                "Gunners": team1_name
-            }
+        # Randomly assign teams; team names follow the players
+        players = [player1, player2]
+        self.names = [team1_name, team2_name]
+        if random.random() >= 0.5:
+            players.reverse()
+            self.names.reverse()
+        self.player_ids = (players[BOMBERS].id, players[GUNNERS].id)
+        # The side the bot plays in solitaire, else -1
+        self.ai_team = next((tid for tid, player in enumerate(players) if player.bot), -1)
 
         # Coin flip to determine first possession
         first_possession = "Bombers" if random.random() < 0.5 else "Gunners"
-        self.first_half_receiver = first_possession  # Track who received first
-
-        # Game state
-        self.score = {"Bombers": 0, "Gunners": 0}
-        self.half = 1
-        self.blocks_left = BLOCKS_PER_HALF
-        self.possession = first_possession  # Who has the ball (determined by coin flip)
-        self.field_position = kickoff_position(first_possession)
-        self.drive_start_blocks = BLOCKS_PER_HALF  # Track when current drive started
-
-        # Stats tracking (first receiver starts with 1 possession)
-        self.stats = {
-            "Bombers": {
-                "yards": 0,
-                "possessions": 1 if first_possession == "Bombers" else 0,
-                "time_of_possession": 0,
-                "fgs_made": 0,
-                "fgs_missed": 0,
-                "punts": 0,
-                "turnovers": 0
-            },
-            "Gunners": {
-                "yards": 0,
-                "possessions": 1 if first_possession == "Gunners" else 0,
-                "time_of_possession": 0,
-                "fgs_made": 0,
-                "fgs_missed": 0,
-                "punts": 0,
-                "turnovers": 0
-            }
-        }
 
-        # Turn state
-        self.awaiting_action = "play_style"  # play_style, 4th_down, extra_point
-        self.last_drive_result = None
-        self.yards_to_go = None
-        self.is_4th_and_goal = False
-        self.yards_gained_on_drive = None
+        # Score, clock, ball, stats and whose call it is all live in the engine;
+        # the bot only renders them
+        self.engine = GameEngine(first_receiver=team_id(first_possession), log=False)
+        # Every action and roll, so the finished game can be archived and replayed
+        self.tape = Tape()
+        self.setup_pending = False  # Waiting for /nameteam
+        self.drive_start_blocks = self.engine.blocks_left  # Start of the current possession
+        # Held while a command (or AI turn) reads and changes the game, so
+        # commands in this channel run one at a time (see game_turn)
+        self._lock: Optional[asyncio.Lock] = None
+        self.lock_users = 0
+        # Solitaire: pause before each AI turn, and the task playing them
+        self.ai_delay = AI_TURN_DELAY
+        self.ai_task: Optional[asyncio.Task] = None
+        # Wall-clock time of the last change, for the idle TTLs
+        self.last_active = time.time()
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def player(self, tid: int) -> PlayerRef:
+        return PlayerRef(self.player_ids[tid], tid == self.ai_team)
+
+    @property
+    def bombers_player(self) -> PlayerRef:
+        return self.player(BOMBERS)
+
+    @property
+    def gunners_player(self) -> PlayerRef:
+        return self.player(GUNNERS)
+
+    @property
+    def team_names(self) -> Dict[str, str]:
+        return {"Bombers": self.names[BOMBERS], "Gunners": self.names[GUNNERS]}
+
+    @property
+    def first_half_receiver(self) -> str:
+        return TEAMS[self.engine.first_receiver]
+
+    @property
+    def possession(self) -> str:
+        return self.engine.team
+
+    @property
+    def field_position(self) -> int:
+        return self.engine.field_position
+
+    @property
+    def half(self) -> int:
+        return self.engine.half
+
+    @property
+    def blocks_left(self) -> int:
+        return self.engine.blocks_left
+
+    @property
+    def score(self) -> Dict[str, int]:
+        return self.engine.score_dict()
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {team: team_stats(self.engine.stats, team) for team in TEAMS}
+
+    @property
+    def awaiting_action(self) -> str:
+        if self.setup_pending:
+            return "team2_name"
+        return AWAITING_ACTIONS[self.engine.phase]
+
+    def step(self, action: str) -> List[dict]:
+        """Advance the game by one action; returns the engine's events"""
+        if self.tape is not None:
+            events = self.tape.step(self.engine, action)
+        else:
+            events = self.engine.step(action)
+        for event in events:
+            if event["event"] == "possession" and not event["kept"]:
+                self.drive_start_blocks = self.engine.blocks_left
+        return events
+
+    def to_dict(self) -> dict:
+        """Everything needed to restore the game, as plain JSON types"""
+        return {
+            "channel_id": self.channel_id,
+            "players": list(self.player_ids),
+            "ai_team": self.ai_team,
+            "team_names": list(self.names),
+            "is_solitaire": self.is_solitaire,
+            "setup_pending": self.setup_pending,
+            "drive_start_blocks": self.drive_start_blocks,
+            "ai_delay": self.ai_delay,
+            "last_active": self.last_active,
+            "engine": self.engine.to_dict(),
+            "tape": [base64.b64encode(self.tape.decisions).decode(),
+                     base64.b64encode(self.tape.rolls).decode()] if self.tape is not None else None,
+        }
 
-    def current_player(self) -> discord.Member:
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameState":
+        """Rebuild a game from to_dict() output"""
+        game = cls.__new__(cls)
+        game.channel_id = data["channel_id"]
+        players = data["players"]
+        if isinstance(players[0], list):
+            # Stored before players were kept as ids: [id, display_name, bot]
+            game.player_ids = (players[BOMBERS][0], players[GUNNERS][0])
+            game.ai_team = next((tid for tid, player in enumerate(players) if player[2]), -1)
+        else:
+            game.player_ids = tuple(players)
+            game.ai_team = data["ai_team"]
+        names = data["team_names"]
+        if isinstance(names, dict):
+            names = [names["Bombers"], names["Gunners"]]
+        # Most games share a few team names; share the strings too
+        game.names = [sys.intern(name) for name in names]
+        game.is_solitaire = data["is_solitaire"]
+        game.setup_pending = data["setup_pending"]
+        game.drive_start_blocks = data["drive_start_blocks"]
+        game.engine = GameEngine.from_dict(data["engine"])
+        game._lock = None
+        game.lock_users = 0
+        game.ai_delay = data.get("ai_delay", AI_TURN_DELAY)
+        game.ai_task = None
+        game.last_active = data.get("last_active", time.time())
+        # Games saved before tapes were kept play on, but can't be archived
+        tape = data.get("tape")
+        game.tape = Tape(*map(base64.b64decode, tape)) if tape is not None else None
+        return game
+
+    def current_player(self) -> PlayerRef:
         """Get the player whose turn it is"""
-        return self.bombers_player if self.possession == "Bombers" else self.gunners_player
+        return self.player(self.engine.possession)
 
-    def opponent_player(self) -> discord.Member:
+    def opponent_player(self) -> PlayerRef:
         """Get the opponent player"""
-        return self.gunners_player if self.possession == "Bombers" else self.bombers_player
+        return self.player(1 - self.engine.possession)
 
     def current_player_with_team(self) -> str:
         """Get formatted string with player and their team"""
         team_display_name = self.team_names[self.possession]
         return f"{self.current_player().mention} ({team_display_name})"
 
-    def switch_possession(self, new_team: str, new_position: int):
-        """Switch possession to the other team"""
-        self.possession = new_team
-        self.field_position = new_position
-        self.drive_start_blocks = self.blocks_left  # Record start of new drive
-        self.stats[new_team]["possessions"] += 1  # Track new possession
-        self.awaiting_action = "play_style"
-        self.last_drive_result = None
-        self.yards_to_go = None
-        self.is_4th_and_goal = False
-        self.yards_gained_on_drive = None
-
     def format_score(self) -> str:
         """Format current score with team names"""
         bombers_name = self.team_names["Bombers"]
@@ -179,9 +407,240 @@ class GameState:
         return embed
 
 
-def get_game(channel_id: int) -> Optional[GameState]:
-    """Get game state for a channel"""
-    return games.get(channel_id)
+async def get_game(channel_id: int) -> Optional[GameState]:
+    """Get game state for a channel (reading it back from the store if it was spilled)"""
+    game = games.get(channel_id)
+    if game is not None:
+        games.move_to_end(channel_id)
+        return game
+    entry = spilled.get(channel_id)
+    if entry is None:
+        return None
+    try:
+        # The load waits on the store's writer, so it runs off the event loop
+        data = await asyncio.get_running_loop().run_in_executor(None, store.load, channel_id)
+    except StoreError as e:
+        # Still spilled; the next command in the channel tries again
+        print(f"Error loading game: {e}")
+        return None
+    if channel_id in games:
+        # Another command loaded it while this one waited
+        games.move_to_end(channel_id)
+        return games[channel_id]
+    if spilled.get(channel_id) is not entry:
+        # Abandoned while loading
+        return None
+    del spilled[channel_id]
+    if data is None:
+        return None
+    game = GameState.from_dict(data)
+    add_game(game)
+    return game
+
+
+def has_game(channel_id: int) -> bool:
+    """Is there a game in the channel (in memory or spilled)?"""
+    return channel_id in games or channel_id in spilled
+
+
+def add_game(game: GameState):
+    """Make a game the channel's current one, spilling cold games if that's too many"""
+    games[game.channel_id] = game
+    games.move_to_end(game.channel_id)
+    # It isn't busy yet, but its command is about to use it
+    spill_cold_games(keep=game.channel_id)
+
+
+def is_busy(game: GameState) -> bool:
+    """Is something playing the game right now (a command, an AI turn or the AI's task)?"""
+    return game.lock_users > 0 or game.ai_task is not None or ai_to_move(game)
+
+
+def spill_cold_games(keep: Optional[int] = None):
+    """
+    Keep at most MAX_RESIDENT_GAMES games in memory: the least recently used
+    idle ones are dropped, to be read back from the store (which already has
+    their latest state) when their channel is next used. The game in
+    channel `keep` never is. Without a store nothing is spilled.
+    """
+    excess = len(games) - MAX_RESIDENT_GAMES
+    if store is None or excess <= 0:
+        return
+    cold = []
+    for channel_id, game in games.items():
+        if channel_id != keep and not is_busy(game):
+            cold.append(game)
+            if len(cold) == excess:
+                break
+    for game in cold:
+        del games[game.channel_id]
+        spilled[game.channel_id] = (game.awaiting_action, game.last_active)
+
+
+def idle_expired(awaiting_action: str, last_active: float, now: float) -> bool:
+    ttl = GAME_TTLS.get(awaiting_action)
+    return ttl is not None and now - last_active > ttl
+
+
+def sweep_games(now: Optional[float] = None) -> int:
+    """Abandon games idle past their action's TTL (telling the channel); returns how many"""
+    now = time.time() if now is None else now
+    expired = [channel_id for channel_id, game in games.items()
+               if not is_busy(game) and idle_expired(game.awaiting_action, game.last_active, now)]
+    expired += [channel_id for channel_id, (awaiting_action, last_active) in spilled.items()
+                if idle_expired(awaiting_action, last_active, now)]
+    for channel_id in expired:
+        forget_game(channel_id)
+        channel = bot.get_channel(channel_id)
+        if channel is not None:
+            post(channel, [discord.Embed(
+                title="⌛ GAME ABANDONED",
+                description="No moves for too long, so this game has been ended. Start a new one with `/newgame`",
+                color=discord.Color.dark_grey()
+            )])
+    spill_cold_games()
+    return len(expired)
+
+
+async def run_sweeper():
+    """Sweep for abandoned games every SWEEP_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            swept = sweep_games()
+            if swept:
+                print(f"Abandoned {swept} idle game(s)")
+        except Exception as e:
+            print(f"Error sweeping games: {e}")
+
+
+@asynccontextmanager
+async def game_turn(channel_id: int, interaction: Optional[discord.Interaction] = None,
+                    refusal: Optional[Callable[[discord.Interaction, Optional[GameState]], Optional[str]]] = None):
+    """
+    Hold a channel's game lock for one command.
+    Yields the game, or None if there is none (or it ended while we waited).
+    If the lock is busy the interaction is deferred first, so Discord gets
+    its acknowledgement in time however long the wait; replies then go out
+    as followups (see respond).
+
+    refusal(interaction, game) is why the command can't be played (game is
+    None if there's no game), or None. A refused command is answered here,
+    ephemerally, and gets None. It's asked before deferring, since a defer
+    is public and so is every followup to it, and again under the lock.
+    """
+    game = await get_game(channel_id)
+    reason = refusal(interaction, game) if refusal is not None else None
+    if reason is not None:
+        await respond(interaction, reason, ephemeral=True)
+    if game is None or reason is not None:
+        yield None
+        return
+    deferred = False
+    if interaction is not None and game.lock_users > 0 and not interaction.response.is_done():
+        await interaction.response.defer()
+        deferred = True
+    game.lock_users += 1
+    try:
+        async with game.lock:
+            current = game if games.get(channel_id) is game else None
+            reason = refusal(interaction, current) if refusal is not None else None
+            if reason is not None:
+                # The game moved on while we waited. Drop the public "thinking..." so the reply can be private
+                if deferred:
+                    await interaction.delete_original_response()
+                await respond(interaction, reason, ephemeral=True)
+                current = None
+            yield current
+    finally:
+        game.lock_users -= 1
+        if game.lock_users == 0:
+            # Idle games don't keep a lock around
+            game._lock = None
+
+
+def save_game(game: GameState):
+    """Journal the game's state after a change"""
+    game.last_active = time.time()
+    if store is not None:
+        try:
+            store.save(game.channel_id, game.to_dict())
+        except StoreError as e:
+            # Queued anyway; the store retries the commit
+            print(f"Error saving game: {e}")
+
+
+def forget_game(channel_id: int):
+    """Drop a finished or abandoned game (stopping its AI task)"""
+    game = games.pop(channel_id, None)
+    if game is None:
+        if spilled.pop(channel_id, None) is not None:
+            unsave_game(channel_id)
+        return
+    if game.ai_task is not None and game.ai_task is not asyncio.current_task():
+        game.ai_task.cancel()
+    unsave_game(channel_id)
+
+
+def unsave_game(channel_id: int):
+    """Journal that the channel's game is gone"""
+    if store is not None:
+        try:
+            store.delete(channel_id)
+        except StoreError as e:
+            print(f"Error deleting game: {e}")
+
+
+def archive_game(game: GameState) -> Optional[int]:
+    """Archive a finished game's tape; returns its id (None if not archived)"""
+    if archive is None or game.tape is None:
+        return None
+    record = GameRecord(game.channel_id, game.player_ids, (game.names[BOMBERS], game.names[GUNNERS]),
+                        game.engine.first_receiver, tuple(game.engine.score), game.tape, game.ai_team)
+    return archive.add(record)
+
+
+async def respond(interaction: discord.Interaction, content: Optional[str] = None, *,
+                  embed: Optional[discord.Embed] = None, embeds: Optional[List[discord.Embed]] = None,
+                  ephemeral: bool = False):
+    """
+    Reply to a command: the interaction's response, or followups once it
+    has been deferred. Embeds are packed as few to a message as Discord allows.
+    """
+    if embed is not None:
+        embeds = [embed]
+    for i, message in enumerate(batches(embeds) if embeds else [[]]):
+        kwargs = {"ephemeral": ephemeral}
+        if message:
+            kwargs["embeds"] = message
+        text = content if i == 0 else None
+        if interaction.response.is_done():
+            await interaction.followup.send(text, **kwargs)
+        else:
+            await interaction.response.send_message(text, **kwargs)
+        MESSAGES_SENT.inc()
+
+
+def post(channel, embeds: List[discord.Embed]):
+    """Queue embeds for a channel; they go out in order, coalesced, at the rate Discord allows"""
+    outbox = outboxes.get(channel.id)
+    if outbox is None:
+        async def send(message):
+            await channel.send(embeds=message)
+            MESSAGES_SENT.inc()
+
+        outbox = outboxes[channel.id] = Outbox(
+            send, on_idle=lambda: outboxes.pop(channel.id, None), on_rate_limited=RATE_LIMITED.inc)
+    outbox.post(embeds)
+
+
+def restore_games(game_store: GameStore) -> int:
+    """Load every stored game (spilling the coldest past the cap); returns how many"""
+    restored = [GameState.from_dict(data) for data in game_store.load_all().values()]
+    for game in sorted(restored, key=lambda game: game.last_active):
+        games[game.channel_id] = game
+    spill_cold_games()
+    return len(restored)
 
 
 def relative_position(possession: str, field_position: int) -> str:
@@ -227,45 +686,42 @@ def format_field_position(game: GameState) -> str:
     return f"**Field Position:** {marker} {rel_pos} ({goal_info})"
 
 
-def should_offer_final_play(game: GameState, team: str, position: int) -> bool:
-    """
-    Determine if a final play should be offered when time expires.
-
-    Rules:
-    - 1st half: Offer if within 50 yards of goal (at midfield or better)
-    - 2nd half: Offer if losing/tied AND within 50 yards of goal
-    - Position check: Bombers need x >= 50, Gunners need x <= 50
-    """
-    # Check if position is within 50 yards of goal (at midfield or better)
-    if team == "Bombers":
-        in_range = position >= 50
-    else:  # Gunners
-        in_range = position <= 50
-
-    if not in_range:
-        return False
-
-    # First half: always offer (if in range)
-    if game.half == 1:
-        return True
+async def setup_hook():
+    """Before connecting: start the metrics/health server if one was asked for"""
+    if METRICS_PORT:
+        asyncio.create_task(metrics.monitor_loop_lag(LOOP_LAG))
+        await metrics.serve(registry, int(METRICS_PORT), METRICS_HOST, ready=lambda: ready)
+        print(f"Metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
 
-    # Second half: only if losing or tied
-    opponent = "Gunners" if team == "Bombers" else "Bombers"
-    team_score = game.score[team]
-    opponent_score = game.score[opponent]
 
-    return team_score <= opponent_score  # Losing or tied
+bot.setup_hook = setup_hook
 
 
 @bot.event
 async def on_ready():
     """Bot startup"""
+    global ready
     print(f'{bot.user} is now online!')
     try:
         synced = await bot.tree.sync()
         print(f"Synced {len(synced)} command(s)")
     except Exception as e:
         print(f"Error syncing commands: {e}")
+    ready = True
+
+    global sweeper_task
+    if sweeper_task is None:
+        sweeper_task = asyncio.create_task(run_sweeper())
+
+    # Restored solitaire games that stopped on the AI's turn carry on (once,
+    # not on every reconnect)
+    global ai_resumed
+    if not ai_resumed:
+        ai_resumed = True
+        for game in list(games.values()):
+            channel = bot.get_channel(game.channel_id)
+            if channel is not None:
+                check_ai_turn(channel, game)
 
 
 @bot.tree.command(name="newgame", description="Start a new game of 4th Down")
@@ -274,14 +730,16 @@ async def on_ready():
     team_name="Your team name (optional, default: Bombers)"
 )
 @app_commands.guild_only()  # Ensure this command only works in servers
+@timed_command
 async def newgame(interaction: discord.Interaction, opponent: discord.User,
                   team_name: str = "Bombers"):
     """Start a new game"""
     channel_id = interaction.channel_id
 
     # Check if game already exists
-    if channel_id in games:
-        await interaction.response.send_message(
+    if has_game(channel_id):
+        await respond(
+            interaction,
             "⚠️ A game is already in progress in this channel! Finish it first.",
             ephemeral=True
         )
@@ -289,7 +747,8 @@ async def newgame(interaction: discord.Interaction, opponent: discord.User,
 
     # Can't play against bots
     if opponent.bot:
-        await interaction.response.send_message(
+        await respond(
+            interaction,
             "⚠️ You can't play against a bot!",
             ephemeral=True
         )
@@ -298,8 +757,9 @@ async def newgame(interaction: discord.Interaction, opponent: discord.User,
     # Create new game with placeholder for team2 name
     # Game will be in "team2_name" awaiting state
     game = GameState(channel_id, interaction.user, opponent, team_name, "???")
-    game.awaiting_action = "team2_name"
-    games[channel_id] = game
+    game.setup_pending = True
+    add_game(game)
+    save_game(game)
 
     # Ask second player to name their team
     embed = discord.Embed(
@@ -314,82 +774,93 @@ async def newgame(interaction: discord.Interaction, opponent: discord.User,
         inline=False
     )
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
-@bot.tree.command(name="nameteam", description="Name your team to join a game")
-@app_commands.describe(team_name="Your team name")
-@app_commands.guild_only()
-async def nameteam(interaction: discord.Interaction, team_name: str):
-    """Second player names their team to start the game"""
-    channel_id = interaction.channel_id
-    game = get_game(channel_id)
-
+def nameteam_refusal(interaction: discord.Interaction, game: Optional[GameState]) -> Optional[str]:
+    """Why /nameteam can't be used now, if it can't"""
     if not game:
-        await interaction.response.send_message("⚠️ No game waiting for team names.", ephemeral=True)
-        return
+        return "⚠️ No game waiting for team names."
 
     # Check if game is waiting for team2 name
     if game.awaiting_action != "team2_name":
-        await interaction.response.send_message("⚠️ Game already started!", ephemeral=True)
-        return
+        return "⚠️ Game already started!"
 
     # Check if this is the second player
     if interaction.user.id != game.gunners_player.id and interaction.user.id != game.bombers_player.id:
-        await interaction.response.send_message("⚠️ You're not in this game!", ephemeral=True)
-        return
+        return "⚠️ You're not in this game!"
 
     # Check if this is the first player trying to name both teams
     player1_id = game.bombers_player.id if game.team_names["Bombers"] != "???" else game.gunners_player.id
     if interaction.user.id == player1_id:
-        await interaction.response.send_message("⚠️ Wait for your opponent to name their team!", ephemeral=True)
-        return
+        return "⚠️ Wait for your opponent to name their team!"
+    return None
 
-    # Set the team2 name based on which slot needs it
-    if game.team_names["Bombers"] == "???":
-        game.team_names["Bombers"] = team_name
-    else:
-        game.team_names["Gunners"] = team_name
 
-    # Now do coin flip and start the game
-    game.awaiting_action = "play_style"
+@bot.tree.command(name="nameteam", description="Name your team to join a game")
+@app_commands.describe(team_name="Your team name")
+@app_commands.guild_only()
+@timed_command
+async def nameteam(interaction: discord.Interaction, team_name: str):
+    """Second player names their team to start the game"""
+    channel_id = interaction.channel_id
+    async with game_turn(channel_id, interaction, nameteam_refusal) as game:
+        if not game:
+            return
 
-    bombers_name = game.team_names["Bombers"]
-    gunners_name = game.team_names["Gunners"]
-    receiving_team = game.team_names[game.possession]
+        # Set the team2 name based on which slot needs it
+        unnamed = BOMBERS if game.names[BOMBERS] == "???" else GUNNERS
+        game.names[unnamed] = team_name
 
-    embed = discord.Embed(
-        title="🏈 NEW GAME STARTED! 🏈",
-        description=f"**{game.bombers_player.mention}** ({bombers_name}) vs **{game.gunners_player.mention}** ({gunners_name})",
-        color=discord.Color.green()
-    )
-    embed.add_field(name="Coin Flip", value=f"🪙 **{receiving_team}** wins the toss!", inline=False)
-    embed.add_field(name="Score", value=game.format_score(), inline=True)
-    embed.add_field(name="Time", value=game.format_time(), inline=True)
-    embed.add_field(
-        name="Kickoff",
-        value=f"{receiving_team} receives at -30",
-        inline=False
-    )
-    embed.add_field(
-        name="First Possession",
-        value=f"{game.current_player_with_team()}, choose your play style:\n`/balanced` | `/run` | `/pass`",
-        inline=False
-    )
+        # Now do coin flip and start the game
+        game.setup_pending = False
+        save_game(game)
 
-    await interaction.response.send_message(embed=embed)
+        bombers_name = game.team_names["Bombers"]
+        gunners_name = game.team_names["Gunners"]
+        receiving_team = game.team_names[game.possession]
+
+        embed = discord.Embed(
+            title="🏈 NEW GAME STARTED! 🏈",
+            description=f"**{game.bombers_player.mention}** ({bombers_name}) vs **{game.gunners_player.mention}** ({gunners_name})",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Coin Flip", value=f"🪙 **{receiving_team}** wins the toss!", inline=False)
+        embed.add_field(name="Score", value=game.format_score(), inline=True)
+        embed.add_field(name="Time", value=game.format_time(), inline=True)
+        embed.add_field(
+            name="Kickoff",
+            value=f"{receiving_team} receives at -30",
+            inline=False
+        )
+        embed.add_field(
+            name="First Possession",
+            value=f"{game.current_player_with_team()}, choose your play style:\n`/balanced` | `/run` | `/pass`",
+            inline=False
+        )
+
+        await respond(interaction, embed=embed)
 
 
 @bot.tree.command(name="solitaire", description="Play against the AI bot")
-@app_commands.describe(team_name="Your team name (optional, default: Bombers)")
+@app_commands.describe(
+    team_name="Your team name (optional, default: Bombers)",
+    speed="normal: the AI plays turn by turn; instant: its turns are summed up in one message"
+)
+@app_commands.choices(speed=[
+    app_commands.Choice(name="normal", value="normal"),
+    app_commands.Choice(name="instant", value="instant"),
+])
 @app_commands.guild_only()
-async def solitaire(interaction: discord.Interaction, team_name: str = "Bombers"):
+@timed_command
+async def solitaire(interaction: discord.Interaction, team_name: str = "Bombers", speed: str = "normal"):
     """Start a solitaire game against AI"""
     channel_id = interaction.channel_id
 
     # Check if game already exists
-    if channel_id in games:
-        await interaction.response.send_message(
+    if has_game(channel_id):
+        await respond(
+            interaction,
             "⚠️ A game is already in progress in this channel! Finish it first.",
             ephemeral=True
         )
@@ -397,8 +868,10 @@ async def solitaire(interaction: discord.Interaction, team_name: str = "Bombers"
 
     # Create solitaire game with bot as opponent
     game = GameState(channel_id, interaction.user, interaction.client.user, team_name, "Agents", is_solitaire=True)
-    game.awaiting_action = "play_style"
-    games[channel_id] = game
+    if speed == "instant":
+        game.ai_delay = 0
+    add_game(game)
+    save_game(game)
 
     # Announce game start with coin flip result
     bombers_name = game.team_names["Bombers"]
@@ -435,9 +908,9 @@ async def solitaire(interaction: discord.Interaction, team_name: str = "Bombers"
             value="AI is choosing play style...",
             inline=False
         )
-        await interaction.response.send_message(embed=embed)
+        await respond(interaction, embed=embed)
         # Execute AI turn
-        await execute_ai_turn(interaction.channel, game)
+        check_ai_turn(interaction.channel, game)
     else:
         # Player has first possession
         embed.add_field(
@@ -445,906 +918,464 @@ async def solitaire(interaction: discord.Interaction, team_name: str = "Bombers"
             value=f"{game.current_player_with_team()}, choose your play style:\n`/balanced` | `/run` | `/pass`",
             inline=False
         )
-        await interaction.response.send_message(embed=embed)
-
-
-async def execute_ai_turn(channel, game: GameState):
-    """Execute AI turn automatically"""
-    from gridiron_dice import choose_style, should_go_for_it, attempt_extra_point, end_of_half_decision
-    import asyncio
-
-    # Small delay for realism
-    await asyncio.sleep(1)
-
-    opponent = "Gunners" if game.possession == "Bombers" else "Bombers"
-    lead = game.score[game.possession] - game.score[opponent]
-
-    if game.awaiting_action == "play_style":
-        # AI chooses play style
-        style = choose_style(game.possession, lead, game.blocks_left)
-
-        embed = discord.Embed(
-            title=f"🤖 AI TURN - {style.upper()} OFFENSE",
-            color=discord.Color.gold()
-        )
-        await channel.send(embed=embed)
-
-        # Create a mock interaction-like object
-        class MockResponse:
-            def __init__(self, channel_obj):
-                self.channel = channel_obj
-
-            async def send_message(self, embed):
-                await self.channel.send(embed=embed)
-
-        class MockInteraction:
-            def __init__(self, channel_obj, game_state):
-                self.channel = channel_obj
-                self.channel_id = game_state.channel_id
-                self.user = game_state.current_player()
-                self.response = MockResponse(channel_obj)
-
-        mock_int = MockInteraction(channel, game)
-        await execute_drive(mock_int, game, style)
-
-        # Check if AI needs to go again (after kickoff, etc.)
-        await check_ai_turn(channel, game)
+        await respond(interaction, embed=embed)
 
-    elif game.awaiting_action == "4th_down" or game.awaiting_action == "final_play":
-        # AI decides 4th down action
-        from gridiron_dice import within_fg_range, attempt_fourth_down, punt_spot, missed_fg_spot, kickoff_position
 
-        go_for_it_decision, yards_to_go, is_4th_and_goal = should_go_for_it(
-            game.possession, game.field_position, game.score, game.blocks_left,
-            game.half, "balanced", game.yards_gained_on_drive or 0
-        )
-
-        if go_for_it_decision:
-            decision = "goforit"
-        elif within_fg_range(game.possession, game.field_position):
-            decision = "fieldgoal"
-        else:
-            decision = "punt"
+class ChannelResponse:
+    """interaction.response for turns nobody typed: embeds go to the channel's outbox"""
 
-        embed = discord.Embed(
-            title=f"🤖 AI TURN - {decision.upper()}",
-            color=discord.Color.gold()
-        )
-        await channel.send(embed=embed)
+    def __init__(self, channel):
+        self.channel = channel
 
-        # Execute the decision
-        class MockResponse:
-            def __init__(self, channel_obj):
-                self.channel = channel_obj
+    def is_done(self) -> bool:
+        return False
 
-            async def send_message(self, embed):
-                await self.channel.send(embed=embed)
+    async def send_message(self, content=None, embeds=None, **kwargs):
+        post(self.channel, embeds or [])
 
-        class MockInteraction:
-            def __init__(self, channel_obj, game_state):
-                self.channel = channel_obj
-                self.channel_id = game_state.channel_id
-                self.user = game_state.current_player()
-                self.response = MockResponse(channel_obj)
 
-        mock_int = MockInteraction(channel, game)
-        await handle_fourth_down_decision(mock_int, decision)
+class ChannelInteraction:
+    """Just enough of a discord.Interaction to play an AI turn through the handlers"""
 
-        await check_ai_turn(channel, game)
+    def __init__(self, channel, channel_id: int, user):
+        self.channel = channel
+        self.channel_id = channel_id
+        self.user = user
+        self.response = ChannelResponse(channel)
 
-    elif game.awaiting_action == "extra_point":
-        # AI decides extra point
-        opponent = "Gunners" if game.possession == "Bombers" else "Bombers"
-        points, conv_type = attempt_extra_point(game.possession, game.score, game.blocks_left, game.half)
-        go_for_two = (conv_type == "2pt")
 
-        embed = discord.Embed(
-            title=f"🤖 AI TURN - {conv_type.upper()}",
-            color=discord.Color.gold()
-        )
-        await channel.send(embed=embed)
+def ai_to_move(game: GameState) -> bool:
+    """Is it the AI's call in a solitaire game?"""
+    return game.is_solitaire and game.current_player().bot and bool(game.engine.legal_actions())
 
-        class MockResponse:
-            def __init__(self, channel_obj):
-                self.channel = channel_obj
 
-            async def send_message(self, embed):
-                await self.channel.send(embed=embed)
+async def execute_ai_turn(channel, game: GameState):
+    """Play one AI turn (the caller holds the game's lock)"""
+    # The engine's AI coach makes the call, then it plays out like a human's
+    action = game.engine.ai_action()
 
-        class MockInteraction:
-            def __init__(self, channel_obj, game_state):
-                self.channel = channel_obj
-                self.channel_id = game_state.channel_id
-                self.user = game_state.current_player()
-                self.response = MockResponse(channel_obj)
+    banner = discord.Embed(
+        title=f"🤖 AI TURN - {AI_TURN_TITLES.get(action, action.upper())}",
+        color=discord.Color.gold()
+    )
+    interaction = ChannelInteraction(channel, game.channel_id, game.current_player())
+    with AI_TURN_SECONDS.time():
+        await play_turn(interaction, game, action, banner=banner)
 
-        mock_int = MockInteraction(channel, game)
-        await handle_extra_point(mock_int, go_for_two)
 
-        await check_ai_turn(channel, game)
+def execute_ai_run(channel, game: GameState):
+    """Play all the AI's turns until it's the human's call, posting one summary (the caller holds the lock)"""
+    with AI_TURN_SECONDS.time():
+        half = game.half
+        events = fast_forward(game, lambda: not ai_to_move(game))
+        save_game(game)
+        post(channel, summary_embeds(game, events, half, "🤖 AI POSSESSIONS"))
 
 
-async def check_ai_turn(channel, game: GameState):
-    """Check if it's AI's turn and execute if so"""
-    if not game.is_solitaire:
-        return
+async def run_ai_turns(channel, game: GameState):
+    """
+    The game's AI task: play AI turns one after another until it's the
+    human's call or the game is over. Each turn is paced by game.ai_delay;
+    with 0 the whole run is played at once. Cancelling the task stops it
+    between or during turns.
+    """
+    try:
+        while True:
+            if game.ai_delay > 0:
+                await asyncio.sleep(game.ai_delay)
+            async with game_turn(game.channel_id) as current:
+                if current is not game or not ai_to_move(game):
+                    return
+                if game.ai_delay > 0:
+                    await execute_ai_turn(channel, game)
+                else:
+                    execute_ai_run(channel, game)
+    finally:
+        if game.ai_task is asyncio.current_task():
+            game.ai_task = None
 
-    ai_player = game.bombers_player if game.bombers_player.bot else game.gunners_player
 
-    if game.current_player() == ai_player and game.awaiting_action in ["play_style", "4th_down", "extra_point", "final_play"]:
-        await execute_ai_turn(channel, game)
+def check_ai_turn(channel, game: GameState):
+    """Start the game's AI task if it's the AI's turn and the task isn't already running"""
+    if game.ai_task is None and ai_to_move(game):
+        game.ai_task = asyncio.create_task(run_ai_turns(channel, game))
 
 
 @bot.tree.command(name="balanced", description="Choose Balanced offense (10% turnover, moderate yards)")
+@timed_command
 async def balanced(interaction: discord.Interaction):
     """Choose balanced play style"""
     await handle_play_style(interaction, "balanced")
 
 
 @bot.tree.command(name="run", description="Choose Run-First offense (5% turnover, grinds clock)")
+@timed_command
 async def run(interaction: discord.Interaction):
     """Choose run-first play style"""
     await handle_play_style(interaction, "run")
 
 
 @bot.tree.command(name="pass", description="Choose Pass-First offense (20% turnover, big plays)")
+@timed_command
 async def pass_play(interaction: discord.Interaction):
     """Choose pass-first play style"""
     await handle_play_style(interaction, "pass")
 
 
-async def handle_play_style(interaction: discord.Interaction, style: str):
-    """Handle play style selection"""
-    game = get_game(interaction.channel_id)
-
+def play_style_refusal(interaction: discord.Interaction, game: Optional[GameState]) -> Optional[str]:
+    """Why a play style can't be called now, if it can't"""
     if not game:
-        await interaction.response.send_message(
-            "⚠️ No game in progress. Start one with `/newgame`",
-            ephemeral=True
-        )
-        return
+        return "⚠️ No game in progress. Start one with `/newgame`"
 
     # Check if it's this player's turn
     if interaction.user.id != game.current_player().id:
-        await interaction.response.send_message(
-            f"⚠️ It's {game.current_player_with_team()}'s turn!",
-            ephemeral=True
-        )
-        return
+        return f"⚠️ It's {game.current_player_with_team()}'s turn!"
 
     # Check if we're awaiting play style
     if game.awaiting_action != "play_style":
-        await interaction.response.send_message(
-            f"⚠️ Not the right time for this command. Current action needed: {game.awaiting_action}",
-            ephemeral=True
-        )
-        return
+        return f"⚠️ Not the right time for this command. Current action needed: {game.awaiting_action}"
+    return None
 
-    # Execute the drive
-    await execute_drive(interaction, game, style)
-
-    # Check if AI needs to go next (solitaire mode)
-    await check_ai_turn(interaction.channel, game)
 
+async def handle_play_style(interaction: discord.Interaction, style: str):
+    """Handle play style selection"""
+    async with game_turn(interaction.channel_id, interaction, play_style_refusal) as game:
+        if not game:
+            return
 
-async def execute_drive(interaction: discord.Interaction, game: GameState, style: str):
-    """Execute a drive with the chosen style"""
-    from gridiron_dice import (
-        TABLES, TURNOVER_THRESHOLDS, advance, is_safety, is_td_yardage,
-        roll_time_for_td, time_for_required_yards, FIELD_GOAL_DISTANCE
-    )
+        # Execute the drive
+        await execute_drive(interaction, game, style)
 
-    # Roll for drive outcome
-    roll = random.randint(1, 20)
-    y, t = TABLES[style][roll - 1]
-
-    # For TD rows, need to roll time to check if it expires
-    if y == "TD":
-        yards_needed = yards_to_endzone(game.possession, game.field_position)
-        t = roll_time_for_td(style, yards_needed)
-
-    # Check if time expires during this drive
-    time_expired = False
-    if game.blocks_left - t <= 0:
-        # Find the minimum time row that still expires the clock
-        time_expired = True
-        min_time_row = None
-        for yds, time in TABLES[style]:
-            if yds != "TD" and game.blocks_left - time <= 0:
-                if min_time_row is None or time < min_time_row[1]:
-                    min_time_row = (yds, time)
-
-        # If we found a valid row, use it; otherwise keep the rolled result
-        if min_time_row:
-            y, t = min_time_row
-
-    # Roll for turnover (do the roll here so we can show the actual roll used)
-    turnover_roll = random.randint(1, 20)
-    turnover_occurred = turnover_roll in TURNOVER_THRESHOLDS[style]
-
-    # Build response
-    embed = discord.Embed(
-        title=f"🎲 {style.upper()} OFFENSE",
-        color=discord.Color.blue()
-    )
+        # Check if AI needs to go next (solitaire mode)
+        check_ai_turn(interaction.channel, game)
 
-    opponent = "Gunners" if game.possession == "Bombers" else "Bombers"
 
-    # Handle TD row
-    if y == "TD":
-        # Time was already rolled earlier to check for expiration
-        time_spent = t
+async def execute_drive(interaction: discord.Interaction, game: GameState, style: str):
+    """Execute a drive with the chosen style"""
+    await play_turn(interaction, game, style)
 
-        embed.add_field(name="Drive Roll", value=f"🎲 Rolled **{roll}**", inline=True)
-        embed.add_field(name="Turnover Check", value=f"🎲 Rolled **{turnover_roll}**", inline=True)
 
-        if turnover_occurred:
-            # Touchback - turnover on would-be TD
-            embed.add_field(name="Result", value="❌ **TOUCHBACK!**", inline=False)
-            embed.add_field(
-                name="Outcome",
-                value=f"{game.team_names[opponent]} gets ball at -20.",
-                inline=False
-            )
+async def play_turn(interaction: discord.Interaction, game: GameState, action: str,
+                    banner: Optional[discord.Embed] = None):
+    """
+    Play one action on the engine and render what happened: the turn's
+    embeds (AI banner, the play, end of half and stats) go out together.
+    """
+    title, color = turn_title(game, action)
+    events = game.step(action)
+    save_game(game)
 
-            game.blocks_left -= time_spent
-            game.stats[game.possession]["time_of_possession"] += time_spent
-            game.stats[game.possession]["turnovers"] += 1
-            opponent_20 = 20 if opponent == "Bombers" else 80
-            game.switch_possession(opponent, opponent_20)
+    embed = discord.Embed(title=title, color=color)
+    render_events(game, events, embed)
 
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
+    half_ended = None
+    for event in events:
+        if event["event"] == "end_of_half":
+            half_ended = event["half"]
 
-            # Check if time expired and opponent should get final play
-            if game.blocks_left <= 0 and should_offer_final_play(game, opponent, opponent_20):
-                game.blocks_left = 0
-                game.yards_to_go = 20  # Distance to goal from their 20
-                game.is_4th_and_goal = False
-                game.awaiting_action = "final_play"
+    embed.add_field(name="Score", value=game.format_score(), inline=True)
+    if game.engine.phase == UNTIMED_DOWN:
+        embed.add_field(name="Time", value="⏰ **TIME EXPIRED - 1 Second Remaining**", inline=True)
+    elif half_ended is None:
+        embed.add_field(name="Time", value=game.format_time(), inline=True)
+    if game.engine.phase in (FOURTH_DOWN, UNTIMED_DOWN):
+        embed.add_field(name="Drive Elapsed", value=game.format_drive_elapsed(), inline=True)
+    if half_ended is None:
+        name, value = next_action_field(game)
+        embed.add_field(name=name, value=value, inline=False)
 
-                options = []
-                if within_fg_range(opponent, opponent_20):
-                    options.append("`/fieldgoal`")
-                options.append("`/goforit`")
+    embeds = [embed] if banner is None else [banner, embed]
+    if half_ended is not None:
+        embeds += end_half(game, half_ended)
+    await respond(interaction, embeds=embeds)
 
-                embed.add_field(
-                    name="Final Play",
-                    value=f"Time expired! One final play available.\n{game.current_player_with_team()}: {' | '.join(options)}",
-                    inline=False
-                )
+    # Check if AI needs to go next (solitaire mode)
+    check_ai_turn(interaction.channel, game)
+
+
+def turn_title(game: GameState, action: str):
+    """Embed title and colour for an action taken in the current phase"""
+    phase = game.engine.phase
+    if phase == PLAY_STYLE:
+        return f"🎲 {action.upper()} OFFENSE", discord.Color.blue()
+    if phase == FOURTH_DOWN:
+        return "🏈 4TH DOWN", discord.Color.orange()
+    if phase == UNTIMED_DOWN:
+        return "⏰ FINAL PLAY", discord.Color.orange()
+    return "🏈 EXTRA POINT", discord.Color.gold()
+
+
+def next_action_field(game: GameState):
+    """(name, value) of the field telling the next player what they can do"""
+    engine = game.engine
+    options = " | ".join(f"`{ACTION_COMMANDS[action]}`" for action in engine.legal_actions())
+    if engine.phase == FOURTH_DOWN:
+        return "Choose", f"{game.current_player_with_team()}: {options}"
+    if engine.phase == UNTIMED_DOWN:
+        return "Final Play", f"Time expired! One final play available.\n{game.current_player_with_team()}: {options}"
+    if engine.phase == EXTRA_POINT:
+        return "Extra Point", f"{game.current_player_with_team()}, choose conversion:\n{options}"
+    return "Next", f"{game.current_player_with_team()}, choose:\n{options}"
+
+
+def fast_forward(game: GameState, stop) -> List[dict]:
+    """Let the AI coach make every call until stop() or the game is over; returns the events"""
+    events = []
+    while game.engine.phase != GAME_OVER and not stop():
+        events.extend(game.step(game.engine.ai_action()))
+    return events
+
+
+def drive_chart(names: Dict[str, str], events: List[dict], half: int) -> List[str]:
+    """One line per possession in events (which start in the given half); names maps team to display name"""
+    lines = []
+    drive = None
+    for event in events:
+        kind = event["event"]
+        if kind == "drive":
+            if drive is None:
+                drive = event
+            end = event
+        elif kind == "result":
+            team = event["team"]
+            if drive is None:
+                # The possession's drive was played before these events
+                play = f"{'':<8} {'':>8}   {'':<8}"
             else:
-                embed.add_field(
-                    name="Next",
-                    value=f"{game.current_player_with_team()}'s turn at -20.\nChoose: `/balanced` | `/run` | `/pass`",
-                    inline=False
-                )
-        else:
-            # Touchdown!
-            yards_gained = yards_to_endzone(game.possession, game.field_position)
-            embed.add_field(name="Result", value=f"✅ **TD!** {yards_gained} yards, {time_spent} blocks", inline=False)
-            embed.add_field(
-                name="Outcome",
-                value=f"🎉 **TOUCHDOWN!** {game.team_names[game.possession]} +6",
-                inline=False
-            )
+                end_at = "End zone" if event["result"].startswith("TD") else relative_position(team, end["x"])
+                play = f"{drive['style']:<8} {relative_position(team, drive['start_x']):>8} → {end_at:<8}"
+            lines.append(f"H{half} {names[team][:10]:<10} {play} {event['result']}")
+            drive = None
+        elif kind == "end_of_half":
+            score = event["score"]
+            lines.append(f"-- End of half {event['half']}: {names['Bombers']} {score['Bombers']}, "
+                         f"{names['Gunners']} {score['Gunners']} --")
+            half += 1
+    return lines
+
+
+def summary_embeds(game: GameState, events: List[dict], half: int, title: str) -> List[discord.Embed]:
+    """A run of turns played at once: a drive chart, then where things stand (or the end of half/game)"""
+    embed = discord.Embed(title=title, color=discord.Color.gold())
+    embed.description = "```\n" + "\n".join(drive_chart(game.team_names, events, half) or ["(no completed drives)"]) + "\n```"
+    embed.add_field(name="Score", value=game.format_score(), inline=True)
 
-            game.score[game.possession] += 6
-            game.blocks_left -= time_spent
-            game.stats[game.possession]["yards"] += yards_gained
-            game.stats[game.possession]["time_of_possession"] += time_spent
-            game.awaiting_action = "extra_point"
+    # Stopped right at the end of a half: that's the news
+    half_ended = None
+    for event in events:
+        if event["event"] == "end_of_half":
+            half_ended = event["half"]
+        elif event["event"] == "drive":
+            half_ended = None
+    if half_ended is not None:
+        return [embed] + end_half(game, half_ended)
 
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
+    embed.add_field(name="Time", value=game.format_time(), inline=True)
+    name, value = next_action_field(game)
+    embed.add_field(name=name, value=value, inline=False)
+    return [embed]
+
+
+def render_events(game: GameState, events: List[dict], embed: discord.Embed):
+    """Add a field to the embed for each engine event worth showing"""
+    names = game.team_names
+    for event in events:
+        kind = event["event"]
+        if kind == "drive":
+            embed.add_field(name="Drive Roll", value=f"🎲 Rolled **{event['roll']}**", inline=True)
+            embed.add_field(name="Turnover Check", value=f"🎲 Rolled **{event['turnover_roll']}**", inline=True)
+            result = f"**{event['yards']:+d}** yards, **{event['time_blocks']}** blocks"
+            if event["late_half"]:
+                result += " (the clock runs out: longest play that fits)"
+            embed.add_field(name="Result", value=result, inline=False)
+        elif kind == "touchdown":
+            embed.add_field(name="Outcome", value=f"🎉 **TOUCHDOWN!** {names[event['team']]} +6", inline=False)
+        elif kind == "fourth_down":
+            embed.add_field(name="Field Position", value=format_field_position(game), inline=False)
+            situation = "goal" if event["goal"] else f"{event['yards_to_go']}"
+            embed.add_field(name="4th Down", value=f"**4th and {situation}**", inline=False)
+        elif kind == "untimed_down":
+            embed.add_field(name="Field Position", value=format_field_position(game), inline=False)
+        elif kind == "conversion":
+            embed.add_field(name="Attempt", value=f"🎲 Rolled **{event['roll']}** on conversion table", inline=False)
+            embed.add_field(name="Gain", value=f"**{event['yards']:+d}** yards gained", inline=False)
+            if event["outcome"] == "first_down":
+                embed.add_field(name="Outcome", value=f"✅ **FIRST DOWN!** {names[event['team']]} keeps the ball", inline=False)
+        elif kind == "field_goal":
+            embed.add_field(name="Attempt", value=f"FG from **{event['distance']}** yards", inline=False)
             embed.add_field(
-                name="Extra Point",
-                value=f"{game.current_player_with_team()}, choose conversion:\n`/1pt` (95% success) | `/2pt` (40% success)",
+                name="Roll",
+                value=f"🎲 Rolled **{event['roll']}** → Make distance: **{event['make_distance']}** yards",
                 inline=False
             )
-    else:
-        # Non-TD row
-        time_spent = t
-        yards = y
-
-        embed.add_field(name="Drive Roll", value=f"🎲 Rolled **{roll}**", inline=True)
-        embed.add_field(name="Turnover Check", value=f"🎲 Rolled **{turnover_roll}**", inline=True)
-
-        # Calculate end position
-        end_x = advance(game.possession, game.field_position, yards)
-
-        # Check for safety
-        if is_safety(game.possession, end_x):
-            embed.add_field(name="Result", value=f"**{yards:+d}** yards, **{time_spent}** blocks", inline=False)
-            embed.add_field(name="Outcome", value=f"⚠️ **SAFETY!** {opponent} +2", inline=False)
-
-            game.score[opponent] += 2
-            game.blocks_left -= time_spent
-            game.stats[game.possession]["yards"] += yards
-            game.stats[game.possession]["time_of_possession"] += time_spent
-            game.stats[game.possession]["turnovers"] += 1  # Safety counts as turnover
-            opponent_30 = kickoff_position(opponent)
-            game.switch_possession(opponent, opponent_30)
-
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-
-            # Check if time expired and opponent should get final play
-            if game.blocks_left <= 0 and should_offer_final_play(game, opponent, opponent_30):
-                game.blocks_left = 0
-                game.yards_to_go = 30  # Distance to goal from their 30
-                game.is_4th_and_goal = False
-                game.awaiting_action = "final_play"
-
-                options = []
-                if within_fg_range(opponent, opponent_30):
-                    options.append("`/fieldgoal`")
-                options.append("`/goforit`")
-
-                embed.add_field(
-                    name="Final Play",
-                    value=f"Time expired! One final play available.\n{game.current_player_with_team()}: {' | '.join(options)}",
-                    inline=False
-                )
+            if event["good"]:
+                embed.add_field(name="Result", value="✅ **FIELD GOAL GOOD!** +3", inline=False)
             else:
+                embed.add_field(name="Result", value="❌ **FIELD GOAL MISS**", inline=False)
+        elif kind == "punt":
+            embed.add_field(name="Result", value="📤 **PUNT**", inline=False)
+        elif kind == "extra_point":
+            if event["conversion"] == TWO_POINT:
+                embed.add_field(name="Attempt", value="2-Point Conversion", inline=False)
+                embed.add_field(name="Roll", value=f"🎲 Rolled **{event['roll']}** on d10 (need 7+)", inline=False)
+            else:
+                embed.add_field(name="Attempt", value="1-Point Conversion", inline=False)
                 embed.add_field(
-                    name="Next",
-                    value=f"{game.current_player_with_team()}'s turn at -30.\nChoose: `/balanced` | `/run` | `/pass`",
+                    name="Roll",
+                    value=f"🎲 Rolled **{event['roll']}** → Make distance: **{event['make_distance']}** (need 15+)",
                     inline=False
                 )
-        else:
-            # Check for turnover
-            if turnover_occurred:
-                # Check if would have been TD
-                if is_td_yardage(game.possession, end_x):
-                    yards_needed = yards_to_endzone(game.possession, game.field_position)
-                    embed.add_field(name="Result", value=f"❌ **TOUCHBACK!** ({yards_needed} yards, {time_spent} blocks)", inline=False)
-                    embed.add_field(
-                        name="Outcome",
-                        value=f"{game.team_names[opponent]} gets ball at -20.",
-                        inline=False
-                    )
-
-                    # For non-TD rows that reach endzone, use time from minimum yardage row
-                    yards_needed = yards_to_endzone(game.possession, game.field_position)
-                    time_spent = time_for_required_yards(style, yards_needed)
-
-                    game.blocks_left -= time_spent
-                    game.stats[game.possession]["yards"] += yards_needed
-                    game.stats[game.possession]["time_of_possession"] += time_spent
-                    game.stats[game.possession]["turnovers"] += 1
-                    opponent_20 = 20 if opponent == "Bombers" else 80
-                    game.switch_possession(opponent, opponent_20)
-
-                    embed.add_field(name="Score", value=game.format_score(), inline=True)
-                    embed.add_field(name="Time", value=game.format_time(), inline=True)
-
-                    # Check if time expired and opponent should get final play
-                    if game.blocks_left <= 0 and should_offer_final_play(game, opponent, opponent_20):
-                        game.blocks_left = 0
-                        game.yards_to_go = 20  # Distance to goal from their 20
-                        game.is_4th_and_goal = False
-                        game.awaiting_action = "final_play"
-
-                        options = []
-                        if within_fg_range(opponent, opponent_20):
-                            options.append("`/fieldgoal`")
-                        options.append("`/goforit`")
-
-                        embed.add_field(
-                            name="Final Play",
-                            value=f"Time expired! One final play available.\n{game.current_player_with_team()}: {' | '.join(options)}",
-                            inline=False
-                        )
-                    else:
-                        embed.add_field(
-                            name="Next",
-                            value=f"{game.current_player_with_team()}'s turn at -20.\nChoose: `/balanced` | `/run` | `/pass`",
-                            inline=False
-                        )
-                else:
-                    embed.add_field(name="Result", value=f"❌ **TURNOVER!** ({yards:+d} yards, {time_spent} blocks)", inline=False)
-                    embed.add_field(
-                        name="Outcome",
-                        value=f"{game.team_names[opponent]} gets ball at {relative_position(opponent, end_x)}.",
-                        inline=False
-                    )
-
-                    game.blocks_left -= time_spent
-                    game.stats[game.possession]["yards"] += yards
-                    game.stats[game.possession]["time_of_possession"] += time_spent
-                    game.stats[game.possession]["turnovers"] += 1
-                    game.switch_possession(opponent, end_x)
-
-                    embed.add_field(name="Score", value=game.format_score(), inline=True)
-                    embed.add_field(name="Time", value=game.format_time(), inline=True)
-
-                    # Check if time expired and opponent should get final play
-                    if game.blocks_left <= 0 and should_offer_final_play(game, opponent, end_x):
-                        game.blocks_left = 0
-                        distance_to_goal = yards_to_endzone(opponent, end_x)
-                        game.yards_to_go = distance_to_goal
-                        game.is_4th_and_goal = False
-                        game.awaiting_action = "final_play"
-
-                        options = []
-                        if within_fg_range(opponent, end_x):
-                            options.append("`/fieldgoal`")
-                        options.append("`/goforit`")
-
-                        embed.add_field(
-                            name="Final Play",
-                            value=f"Time expired! One final play available.\n{game.current_player_with_team()}: {' | '.join(options)}",
-                            inline=False
-                        )
-                    else:
-                        embed.add_field(
-                            name="Next",
-                            value=f"{game.current_player_with_team()}'s turn.\nChoose: `/balanced` | `/run` | `/pass`",
-                            inline=False
-                        )
+            if event["good"]:
+                embed.add_field(name="Result", value=f"✅ **GOOD!** +{event['points']}", inline=False)
             else:
-                # No turnover - check for TD
-                if is_td_yardage(game.possession, end_x):
-                    # TD by yardage - use time from minimum yardage row needed for TD
-                    yards_needed = yards_to_endzone(game.possession, game.field_position)
-                    time_spent = time_for_required_yards(style, yards_needed)
-
-                    embed.add_field(name="Result", value=f"✅ **TD!** {yards_needed} yards, {time_spent} blocks", inline=False)
-                    embed.add_field(
-                        name="Outcome",
-                        value=f"🎉 **TOUCHDOWN!** {game.team_names[game.possession]} +6",
-                        inline=False
-                    )
-
-                    game.score[game.possession] += 6
-                    game.blocks_left -= time_spent
-                    game.stats[game.possession]["yards"] += yards_needed
-                    game.stats[game.possession]["time_of_possession"] += time_spent
-                    game.field_position = end_x
-                    game.awaiting_action = "extra_point"
-
-                    embed.add_field(name="Score", value=game.format_score(), inline=True)
-                    embed.add_field(name="Time", value=game.format_time(), inline=True)
-                    embed.add_field(
-                        name="Extra Point",
-                        value=f"{game.current_player_with_team()}, choose conversion:\n`/1pt` (95% success) | `/2pt` (40% success)",
-                        inline=False
-                    )
-                else:
-                    # No TD - check if time expired
-                    embed.add_field(name="Result", value=f"✅ Safe! **{yards:+d}** yards, **{time_spent}** blocks", inline=False)
-
-                    game.field_position = end_x
-                    game.blocks_left -= time_spent
-                    game.stats[game.possession]["yards"] += yards
-                    game.stats[game.possession]["time_of_possession"] += time_spent
-                    game.yards_gained_on_drive = yards
-
-                    if time_expired and game.blocks_left <= 0:
-                        # Time expired - check if final play should be offered
-                        game.blocks_left = 0
-
-                        if should_offer_final_play(game, game.possession, end_x):
-                            # Offer final play
-                            distance_to_goal = yards_to_endzone(game.possession, end_x)
-
-                            # Calculate yards to go for the final play
-                            if yards < 10:
-                                ytg = 10 - yards
-                            else:
-                                if style == "run":
-                                    ytg = random.randint(1, 8)
-                                elif style == "balanced":
-                                    ytg = random.randint(1, 10)
-                                else:  # pass
-                                    ytg = random.randint(1, 20)
-
-                            if ytg >= distance_to_goal:
-                                ytg = distance_to_goal
-                                game.is_4th_and_goal = True
-                            else:
-                                game.is_4th_and_goal = False
-
-                            game.yards_to_go = ytg
-                            game.awaiting_action = "final_play"
-
-                            embed.add_field(
-                                name="Field Position",
-                                value=format_field_position(game),
-                                inline=False
-                            )
-                            embed.add_field(name="Score", value=game.format_score(), inline=True)
-                            embed.add_field(name="Time", value="⏰ **TIME EXPIRED - 1 Second Remaining**", inline=True)
-                            embed.add_field(name="Drive Elapsed", value=game.format_drive_elapsed(), inline=True)
-
-                            # Final play options: field goal or go for it (no punt)
-                            options = []
-                            if within_fg_range(game.possession, end_x):
-                                options.append("`/fieldgoal`")
-                            options.append("`/goforit`")
-
-                            embed.add_field(
-                                name="Final Play",
-                                value=f"Time expired! One final play available.\n{game.current_player_with_team()}: {' | '.join(options)}",
-                                inline=False
-                            )
-                        else:
-                            # Don't offer final play - just show field position and end half
-                            embed.add_field(
-                                name="Field Position",
-                                value=format_field_position(game),
-                                inline=False
-                            )
-                            embed.add_field(name="Score", value=game.format_score(), inline=True)
-                            embed.add_field(name="Time", value="⏰ **TIME EXPIRED**", inline=True)
-                    else:
-                        # Normal 4th down situation
-                        distance_to_goal = yards_to_endzone(game.possession, end_x)
-
-                        if yards < 10:
-                            ytg = 10 - yards
-                        else:
-                            if style == "run":
-                                ytg = random.randint(1, 8)
-                            elif style == "balanced":
-                                ytg = random.randint(1, 10)
-                            else:  # pass
-                                ytg = random.randint(1, 20)
-
-                        if ytg >= distance_to_goal:
-                            ytg = distance_to_goal
-                            game.is_4th_and_goal = True
-                        else:
-                            game.is_4th_and_goal = False
-
-                        game.yards_to_go = ytg
-                        game.awaiting_action = "4th_down"
-
-                        embed.add_field(
-                            name="Field Position",
-                            value=format_field_position(game),
-                            inline=False
-                        )
-
-                        situation = "goal" if game.is_4th_and_goal else f"{ytg}"
-                        embed.add_field(
-                            name="4th Down",
-                            value=f"**4th and {situation}**",
-                            inline=False
-                        )
-
-                        # Determine available options
-                        options = ["`/goforit`"]
-                        if within_fg_range(game.possession, end_x):
-                            options.append("`/fieldgoal`")
-                        options.append("`/punt`")
-
-                        embed.add_field(name="Score", value=game.format_score(), inline=True)
-                        embed.add_field(name="Time", value=game.format_time(), inline=True)
-                        embed.add_field(name="Drive Elapsed", value=game.format_drive_elapsed(), inline=True)
-                        embed.add_field(
-                            name="Choose",
-                            value=f"{game.current_player_with_team()}: {' | '.join(options)}",
-                            inline=False
-                        )
-
-    await interaction.response.send_message(embed=embed)
-
-    # Check for half/game end - but NOT if we're awaiting a final play
-    if game.blocks_left <= 0 and game.awaiting_action != "final_play":
-        await end_half(interaction.channel, game)
-
-    # Check if AI needs to go next (solitaire mode)
-    await check_ai_turn(interaction.channel, game)
+                embed.add_field(name="Result", value="❌ **NO GOOD**", inline=False)
+        elif kind == "kneel":
+            embed.add_field(name="Outcome", value=f"🧎 {names[event['team']]} lets the clock run out", inline=False)
+        elif kind == "result":
+            result = event["result"]
+            opponent = "Gunners" if event["team"] == "Bombers" else "Bombers"
+            if result.startswith("Safety"):
+                embed.add_field(name="Outcome", value=f"⚠️ **SAFETY!** {names[opponent]} +2", inline=False)
+            elif "would be TD" in result:
+                embed.add_field(name="Outcome", value="❌ **TOUCHBACK!**", inline=False)
+            elif result.startswith("Turnover"):
+                embed.add_field(name="Outcome", value="❌ **TURNOVER!**", inline=False)
+            elif result.startswith("4th down failed"):
+                embed.add_field(name="Outcome", value="❌ **TURNOVER ON DOWNS**", inline=False)
+            elif result == "Untimed down failed":
+                embed.add_field(name="Outcome", value="❌ **STOPPED SHORT**", inline=False)
+        elif kind == "end_of_half":
+            # The rest (second-half kickoff, game over) is end_half's to show
+            break
+        elif kind == "possession" and not event["kept"]:
+            embed.add_field(
+                name="Ball Placement",
+                value=f"{names[event['team']]} gets ball at {relative_position(event['team'], event['x'])}",
+                inline=False
+            )
+        elif kind == "possession":
+            embed.add_field(name="Field Position", value=format_field_position(game), inline=False)
 
 
 @bot.tree.command(name="goforit", description="Attempt to convert on 4th down")
+@timed_command
 async def goforit(interaction: discord.Interaction):
     """Go for it on 4th down"""
     await handle_fourth_down_decision(interaction, "goforit")
 
 
 @bot.tree.command(name="fieldgoal", description="Attempt a field goal")
+@timed_command
 async def fieldgoal(interaction: discord.Interaction):
     """Attempt field goal"""
     await handle_fourth_down_decision(interaction, "fieldgoal")
 
 
 @bot.tree.command(name="punt", description="Punt the ball away")
+@timed_command
 async def punt(interaction: discord.Interaction):
     """Punt"""
     await handle_fourth_down_decision(interaction, "punt")
 
 
-async def handle_fourth_down_decision(interaction: discord.Interaction, decision: str):
-    """Handle 4th down decision"""
-    game = get_game(interaction.channel_id)
+@bot.tree.command(name="kneel", description="Let the half end instead of running the final play")
+@timed_command
+async def kneel(interaction: discord.Interaction):
+    """Decline the untimed down"""
+    await handle_fourth_down_decision(interaction, "kneel")
 
+
+def fourth_down_refusal(decision: str, interaction: discord.Interaction,
+                        game: Optional[GameState]) -> Optional[str]:
+    """Why a 4th down decision can't be made now, if it can't"""
     if not game:
-        await interaction.response.send_message("⚠️ No game in progress.", ephemeral=True)
-        return
+        return "⚠️ No game in progress."
 
     if interaction.user.id != game.current_player().id:
-        await interaction.response.send_message(
-            f"⚠️ It's {game.current_player_with_team()}'s turn!",
-            ephemeral=True
-        )
-        return
+        return f"⚠️ It's {game.current_player_with_team()}'s turn!"
 
     if game.awaiting_action not in ["4th_down", "final_play"]:
-        await interaction.response.send_message(
-            f"⚠️ Not the right time for this command.",
-            ephemeral=True
-        )
-        return
-
-    is_final_play = (game.awaiting_action == "final_play")
-
-    from gridiron_dice import punt_spot, missed_fg_spot, kickoff_position
-
-    opponent = "Gunners" if game.possession == "Bombers" else "Bombers"
-    embed = discord.Embed(title=f"🏈 4TH DOWN", color=discord.Color.orange())
-
-    if decision == "goforit":
-        # Attempt 4th down conversion - roll here so we can show the actual roll
-        roll = random.randint(1, 20)
-        from gridiron_dice import FOURTH_DOWN_CONVERSION
-
-        success, yards_gained, is_td, new_x, is_first_down = attempt_fourth_down(
-            game.possession, game.field_position, game.yards_to_go, roll
-        )
-
-        embed.add_field(name="Attempt", value=f"🎲 Rolled **{roll}** on conversion table", inline=False)
-        embed.add_field(name="Result", value=f"**{yards_gained:+d}** yards gained", inline=False)
-
-        if is_td:
-            embed.add_field(name="Outcome", value=f"🎉 **TOUCHDOWN!** {game.team_names[game.possession]} +6", inline=False)
-            game.score[game.possession] += 6
-            game.field_position = new_x
-            game.awaiting_action = "extra_point"
-
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-            embed.add_field(
-                name="Extra Point",
-                value=f"{game.current_player_with_team()}, choose:\n`/1pt` | `/2pt`",
-                inline=False
-            )
-        elif is_first_down:
-            embed.add_field(name="Outcome", value=f"✅ **FIRST DOWN!** {game.possession} keeps the ball", inline=False)
-            game.field_position = new_x
-            game.awaiting_action = "play_style"
+        return "⚠️ Not the right time for this command."
 
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-            embed.add_field(
-                name="Field Position",
-                value=format_field_position(game),
-                inline=False
-            )
-            embed.add_field(
-                name="Next",
-                value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-                inline=False
-            )
-        else:
-            embed.add_field(name="Outcome", value=f"❌ **TURNOVER ON DOWNS**", inline=False)
-            embed.add_field(name="Result", value=f"{game.team_names[opponent]} gets ball at {relative_position(opponent, new_x)}", inline=False)
+    action = DECISION_ACTIONS[decision]
+    if action not in game.engine.legal_actions():
+        if action == FIELD_GOAL:
+            return "⚠️ Not in field goal range!"
+        elif action == PUNT:
+            return "⚠️ Cannot punt on final play of half!"
+        return "⚠️ Not the right time for this command."
+    return None
 
-            game.switch_possession(opponent, new_x)
 
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-            embed.add_field(
-                name="Next",
-                value=f"{game.current_player_with_team()}'s turn.\n Choose: `/balanced` | `/run` | `/pass`",
-                inline=False
-            )
-
-    elif decision == "fieldgoal":
-        if not within_fg_range(game.possession, game.field_position):
-            await interaction.response.send_message("⚠️ Not in field goal range!", ephemeral=True)
-            return
-
-        distance = yards_to_endzone(game.possession, game.field_position)
-
-        # Roll for field goal attempt
-        roll = random.randint(1, 20)
-        from gridiron_dice import FIELD_GOAL_DISTANCE
-        make_distance = FIELD_GOAL_DISTANCE[roll - 1]
-        fg_good = make_distance >= distance
-
-        embed.add_field(name="Attempt", value=f"FG from **{distance}** yards", inline=False)
-        embed.add_field(name="Roll", value=f"🎲 Rolled **{roll}** → Make distance: **{make_distance}** yards", inline=False)
-
-        if fg_good:
-            embed.add_field(name="Result", value="✅ **FIELD GOAL GOOD!** +3", inline=False)
-            game.score[game.possession] += 3
-            game.stats[game.possession]["fgs_made"] += 1
-
-            game.switch_possession(opponent, kickoff_position(opponent))
-
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-            embed.add_field(
-                name="Kickoff",
-                value=f"{game.team_names[opponent]} receives at -30.",
-                inline=False
-            )
-            embed.add_field(
-                name="Next",
-                value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-                inline=False
-            )
-        else:
-            miss_spot = missed_fg_spot(game.possession, game.field_position)
-            embed.add_field(name="Result", value="❌ **FIELD GOAL MISS**", inline=False)
-            embed.add_field(name="Ball Placement", value=f"{game.team_names[opponent]} gets ball at {relative_position(opponent, miss_spot)}", inline=False)
-
-            game.stats[game.possession]["fgs_missed"] += 1
-            game.switch_possession(opponent, miss_spot)
-
-            embed.add_field(name="Score", value=game.format_score(), inline=True)
-            embed.add_field(name="Time", value=game.format_time(), inline=True)
-            embed.add_field(
-                name="Next",
-                value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-                inline=False
-            )
-
-    else:  # punt
-        if is_final_play:
-            await interaction.response.send_message("⚠️ Cannot punt on final play of half!", ephemeral=True)
+async def handle_fourth_down_decision(interaction: discord.Interaction, decision: str):
+    """Handle 4th down decision"""
+    refusal = functools.partial(fourth_down_refusal, decision)
+    async with game_turn(interaction.channel_id, interaction, refusal) as game:
+        if not game:
             return
 
-        spot = punt_spot(game.possession, game.field_position)
-        embed.add_field(name="Result", value="📤 **PUNT**", inline=False)
-        embed.add_field(name="Ball Placement", value=f"{opponent} gets ball at {relative_position(opponent, spot)}", inline=False)
-
-        game.stats[game.possession]["punts"] += 1
-        game.switch_possession(opponent, spot)
-
-        embed.add_field(name="Score", value=game.format_score(), inline=True)
-        embed.add_field(name="Time", value=game.format_time(), inline=True)
-        embed.add_field(
-            name="Next",
-            value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-            inline=False
-        )
-
-    await interaction.response.send_message(embed=embed)
-
-    # Check if this was the final play and end the half
-    if is_final_play and game.blocks_left <= 0:
-        await end_half(interaction.channel, game)
-
-    # Check if AI needs to go next (solitaire mode)
-    await check_ai_turn(interaction.channel, game)
+        await play_turn(interaction, game, DECISION_ACTIONS[decision])
 
 
 @bot.tree.command(name="1pt", description="Attempt 1-point conversion (95% success)")
+@timed_command
 async def one_point(interaction: discord.Interaction):
     """Attempt 1-point conversion"""
     await handle_extra_point(interaction, False)
 
 
 @bot.tree.command(name="2pt", description="Attempt 2-point conversion (40% success)")
+@timed_command
 async def two_point(interaction: discord.Interaction):
     """Attempt 2-point conversion"""
     await handle_extra_point(interaction, True)
 
 
-async def handle_extra_point(interaction: discord.Interaction, go_for_two: bool):
-    """Handle extra point attempt"""
-    game = get_game(interaction.channel_id)
-
+def extra_point_refusal(interaction: discord.Interaction, game: Optional[GameState]) -> Optional[str]:
+    """Why a conversion can't be tried now, if it can't"""
     if not game:
-        await interaction.response.send_message("⚠️ No game in progress.", ephemeral=True)
-        return
+        return "⚠️ No game in progress."
 
     if interaction.user.id != game.current_player().id:
-        await interaction.response.send_message(
-            f"⚠️ It's {game.current_player_with_team()}'s turn!",
-            ephemeral=True
-        )
-        return
+        return f"⚠️ It's {game.current_player_with_team()}'s turn!"
 
     if game.awaiting_action != "extra_point":
-        await interaction.response.send_message("⚠️ Not the right time for this command.", ephemeral=True)
-        return
+        return "⚠️ Not the right time for this command."
+    return None
 
-    opponent = "Gunners" if game.possession == "Bombers" else "Bombers"
 
-    embed = discord.Embed(title="🏈 EXTRA POINT", color=discord.Color.gold())
-
-    if go_for_two:
-        # 2-point conversion
-        roll = random.randint(1, 10)
-        success = roll >= 7
-
-        embed.add_field(name="Attempt", value="2-Point Conversion", inline=False)
-        embed.add_field(name="Roll", value=f"🎲 Rolled **{roll}** on d10 (need 7+)", inline=False)
-
-        if success:
-            embed.add_field(name="Result", value="✅ **GOOD!** +2", inline=False)
-            game.score[game.possession] += 2
-        else:
-            embed.add_field(name="Result", value="❌ **NO GOOD**", inline=False)
-    else:
-        # 1-point conversion
-        from gridiron_dice import FIELD_GOAL_DISTANCE
-        roll = random.randint(1, 20)
-        make_distance = FIELD_GOAL_DISTANCE[roll - 1]
-        success = make_distance >= 15
-
-        embed.add_field(name="Attempt", value="1-Point Conversion", inline=False)
-        embed.add_field(name="Roll", value=f"🎲 Rolled **{roll}** → Make distance: **{make_distance}** (need 15+)", inline=False)
-
-        if success:
-            embed.add_field(name="Result", value="✅ **GOOD!** +1", inline=False)
-            game.score[game.possession] += 1
-        else:
-            embed.add_field(name="Result", value="❌ **NO GOOD**", inline=False)
-
-    # Kickoff to opponent
-    game.switch_possession(opponent, kickoff_position(opponent))
-
-    embed.add_field(name="Score", value=game.format_score(), inline=True)
-    embed.add_field(name="Time", value=game.format_time(), inline=True)
-    embed.add_field(
-        name="Kickoff",
-        value=f"{game.team_names[opponent]} receives at the 30.",
-        inline=False
-    )
-    embed.add_field(
-        name="Next",
-        value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-        inline=False
-    )
-
-    await interaction.response.send_message(embed=embed)
-
-    # Check for half/game end
-    if game.blocks_left <= 0:
-        await end_half(interaction.channel, game)
-
-    # Check if AI needs to go next (solitaire mode)
-    await check_ai_turn(interaction.channel, game)
+async def handle_extra_point(interaction: discord.Interaction, go_for_two: bool):
+    """Handle extra point attempt"""
+    async with game_turn(interaction.channel_id, interaction, extra_point_refusal) as game:
+        if not game:
+            return
 
+        await play_turn(interaction, game, TWO_POINT if go_for_two else ONE_POINT)
 
-async def end_half(channel, game: GameState):
-    """End the current half"""
-    original_half = game.half  # Save before we modify it
 
+def end_half(game: GameState, half: int) -> List[discord.Embed]:
+    """
+    The end-of-half (or game over) and stats embeds; the engine has already
+    moved on, and a finished game is forgotten here.
+    """
     embed = discord.Embed(
-        title="⏰ END OF HALF" if game.half == 1 else "🏁 GAME OVER",
+        title="⏰ END OF HALF" if half == 1 else "🏁 GAME OVER",
         color=discord.Color.red()
     )
 
     embed.add_field(name="Final Score", value=game.format_score(), inline=False)
 
-    if game.half == 1:
-        # Start second half
-        game.half = 2
-        game.blocks_left = BLOCKS_PER_HALF
-        game.drive_start_blocks = BLOCKS_PER_HALF  # Reset drive start for new half
-
-        # Switch possession (team that didn't receive in H1 receives in H2)
-        second_half_receiver = "Gunners" if game.first_half_receiver == "Bombers" else "Bombers"
-        second_half_receiver_name = game.team_names[second_half_receiver]
-        game.switch_possession(second_half_receiver, kickoff_position(second_half_receiver))
+    if half == 1:
+        # The team that didn't receive in H1 receives in H2
+        second_half_receiver_name = game.team_names[game.possession]
 
         embed.add_field(
             name="Second Half Kickoff",
             value=f"{second_half_receiver_name} receives at -30.",
             inline=False
         )
-        embed.add_field(
-            name="Next",
-            value=f"{game.current_player_with_team()}, choose:\n`/balanced` | `/run` | `/pass`",
-            inline=False
-        )
+        name, value = next_action_field(game)
+        embed.add_field(name=name, value=value, inline=False)
     else:
         # Game over
         bombers_score = game.score["Bombers"]
@@ -1363,24 +1394,104 @@ async def end_half(channel, game: GameState):
 
         embed.add_field(name="Result", value=result, inline=False)
 
-    await channel.send(embed=embed)
+    # Archive the finished game and remove it from active games (not at halftime)
+    if half == 2:
+        game_id = archive_game(game)
+        if game_id is not None:
+            embed.set_footer(text=f"Archived as game #{game_id}: /replay game_id:{game_id}")
+        forget_game(game.channel_id)
 
-    # Send stats after end of half/game
-    stats_embed = game.format_stats()
-    await channel.send(embed=stats_embed)
+    # Stats follow the end of half/game
+    return [embed, game.format_stats()]
 
-    # Remove game from active games after game over (not at halftime)
-    if original_half == 2:
-        del games[game.channel_id]
+
+def simulate_refusal(interaction: discord.Interaction, game: Optional[GameState]) -> Optional[str]:
+    """Why /simulate can't be used now, if it can't"""
+    if not game:
+        return "⚠️ No game in progress."
+
+    if interaction.user.id not in [game.bombers_player.id, game.gunners_player.id]:
+        return "⚠️ You're not in this game!"
+
+    # It would make the opponent's calls too; only the bot can agree to that
+    if not game.is_solitaire:
+        return "⚠️ `/simulate` is for solitaire games; your opponent makes their own calls."
+
+    if game.awaiting_action == "team2_name":
+        return "⚠️ The game hasn't started yet!"
+    return None
+
+
+@bot.tree.command(name="simulate", description="Let the AI play out the rest of a solitaire game")
+@timed_command
+async def simulate(interaction: discord.Interaction):
+    """Fast-forward a solitaire game to the final whistle with the AI calling every play"""
+    async with game_turn(interaction.channel_id, interaction, simulate_refusal) as game:
+        if not game:
+            return
+
+        half = game.half
+        events = fast_forward(game, lambda: False)
+        save_game(game)
+        await respond(interaction, embeds=summary_embeds(game, events, half, "⏩ SIMULATED TO THE END"))
+
+
+def replay_embeds(record: GameRecord, events: List[dict]) -> List[discord.Embed]:
+    """An archived game replayed: its drive chart and final score"""
+    names = {"Bombers": record.names[BOMBERS], "Gunners": record.names[GUNNERS]}
+    embed = discord.Embed(title=f"📼 REPLAY: GAME #{record.game_id}", color=discord.Color.gold())
+    embed.description = "```\n" + "\n".join(drive_chart(names, events, 1) or ["(no completed drives)"]) + "\n```"
+    embed.add_field(name="Final Score", value=f"**{names['Bombers']} {record.score[BOMBERS]} - "
+                                              f"{record.score[GUNNERS]} {names['Gunners']}**", inline=False)
+    players = " vs ".join(PlayerRef(player_id, tid == record.ai_team).mention
+                          for tid, player_id in enumerate(record.player_ids))
+    embed.add_field(name="Played", value=f"{players}, <t:{int(record.finished_at)}:f>", inline=False)
+    return [embed]
+
+
+@bot.tree.command(name="replay", description="Replay a finished game from the archive")
+@app_commands.describe(game_id="The archived game's number (leave out to list this channel's recent games)")
+@timed_command
+async def replay(interaction: discord.Interaction, game_id: Optional[int] = None):
+    """Rebuild an archived game from its roll tape"""
+    if archive is None:
+        await respond(interaction, "⚠️ Finished games aren't being archived.", ephemeral=True)
+        return
+
+    if game_id is None:
+        records = archive.recent(channel_id=interaction.channel_id)
+        if not records:
+            await respond(interaction, "📼 No finished games archived in this channel yet.", ephemeral=True)
+            return
+        embed = discord.Embed(title="📼 Recent Games", color=discord.Color.gold())
+        embed.description = "\n".join(
+            f"**#{record.game_id}** <t:{int(record.finished_at)}:d> {record.names[BOMBERS]} "
+            f"{record.score[BOMBERS]} - {record.score[GUNNERS]} {record.names[GUNNERS]}"
+            for record in records)
+        embed.set_footer(text="/replay game_id:<number> to see one")
+        await respond(interaction, embed=embed, ephemeral=True)
+        return
+
+    record = archive.get(game_id)
+    if record is None:
+        await respond(interaction, f"⚠️ No archived game #{game_id}.", ephemeral=True)
+        return
+    try:
+        _, events = record.replay()
+    except ValueError:
+        await respond(interaction, f"⚠️ Game #{game_id} doesn't replay under the current rules.", ephemeral=True)
+        return
+    await respond(interaction, embeds=replay_embeds(record, events))
 
 
 @bot.tree.command(name="status", description="Check current game status")
+@timed_command
 async def status(interaction: discord.Interaction):
     """Show current game status"""
-    game = get_game(interaction.channel_id)
+    game = await get_game(interaction.channel_id)
 
     if not game:
-        await interaction.response.send_message("⚠️ No game in progress.", ephemeral=True)
+        await respond(interaction, "⚠️ No game in progress.", ephemeral=True)
         return
 
     embed = discord.Embed(
@@ -1414,23 +1525,25 @@ async def status(interaction: discord.Interaction):
         inline=False
     )
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
 @bot.tree.command(name="stats", description="View game statistics")
+@timed_command
 async def stats_command(interaction: discord.Interaction):
     """Show game statistics"""
-    game = get_game(interaction.channel_id)
+    game = await get_game(interaction.channel_id)
 
     if not game:
-        await interaction.response.send_message("⚠️ No game in progress.", ephemeral=True)
+        await respond(interaction, "⚠️ No game in progress.", ephemeral=True)
         return
 
     embed = game.format_stats()
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
 @bot.tree.command(name="help", description="Show how to play 4th Down")
+@timed_command
 async def help_command(interaction: discord.Interaction):
     """Show game help and commands"""
     embed = discord.Embed(
@@ -1446,7 +1559,8 @@ async def help_command(interaction: discord.Interaction):
             "**`/newgame @opponent`** - Challenge someone to a game\n"
             "**`/newgame @opponent team_name:\"YourTeam\"`** - Name your team\n"
             "**`/nameteam team_name:\"YourTeam\"`** - Second player names their team\n"
-            "**`/solitaire`** - Play against the AI bot"
+            "**`/solitaire`** - Play against the AI bot\n"
+            "**`/solitaire speed:instant`** - ...and get the AI's turns in one message"
         ),
         inline=False
     )
@@ -1468,7 +1582,8 @@ async def help_command(interaction: discord.Interaction):
         value=(
             "**`/goforit`** - Attempt conversion (or TD!)\n"
             "**`/fieldgoal`** - Try for 3 points\n"
-            "**`/punt`** - Kick it away (40 yards)"
+            "**`/punt`** - Kick it away (40 yards)\n"
+            "**`/kneel`** - Let the half end (untimed final play only)"
         ),
         inline=False
     )
@@ -1489,6 +1604,8 @@ async def help_command(interaction: discord.Interaction):
         value=(
             "**`/status`** - Check current game state\n"
             "**`/stats`** - View game statistics\n"
+            "**`/simulate`** - Let the AI play out the rest of a solitaire game\n"
+            "**`/replay`** - List finished games here, or replay one by number\n"
             "**`/endgame`** - End current game\n"
             "**`/help`** - Show this message"
         ),
@@ -1510,27 +1627,32 @@ async def help_command(interaction: discord.Interaction):
 
     embed.set_footer(text="Good luck! 🏈")
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await respond(interaction, embed=embed, ephemeral=True)
 
 
-@bot.tree.command(name="endgame", description="End the current game (both players must agree)")
-async def endgame(interaction: discord.Interaction):
-    """End the current game"""
-    game = get_game(interaction.channel_id)
-
+def endgame_refusal(interaction: discord.Interaction, game: Optional[GameState]) -> Optional[str]:
+    """Why /endgame can't be used now, if it can't"""
     if not game:
-        await interaction.response.send_message("⚠️ No game in progress.", ephemeral=True)
-        return
+        return "⚠️ No game in progress."
 
     # Check if user is one of the players
     if interaction.user.id not in [game.bombers_player.id, game.gunners_player.id]:
-        await interaction.response.send_message("⚠️ You're not in this game!", ephemeral=True)
-        return
+        return "⚠️ You're not in this game!"
+    return None
+
+
+@bot.tree.command(name="endgame", description="End the current game (both players must agree)")
+@timed_command
+async def endgame(interaction: discord.Interaction):
+    """End the current game"""
+    async with game_turn(interaction.channel_id, interaction, endgame_refusal) as game:
+        if not game:
+            return
 
-    # Remove game
-    del games[game.channel_id]
+        # Remove game
+        forget_game(game.channel_id)
 
-    await interaction.response.send_message("🛑 Game ended. Start a new one with `/newgame`")
+        await respond(interaction, "🛑 Game ended. Start a new one with `/newgame`")
 
 
 # Run the bot
@@ -1541,4 +1663,13 @@ if __name__ == "__main__":
         print("Please set your bot token in the environment.")
         exit(1)
 
-    bot.run(TOKEN)
+    # Games survive restarts: restore them, then journal every change
+    store = GameStore(os.getenv("GRIDIRON_DB", DEFAULT_STORE_PATH))
+    print(f"Restored {restore_games(store)} game(s) from {store.path}")
+    # Finished games are archived as roll tapes for /replay
+    archive = GameArchive(os.getenv("GRIDIRON_ARCHIVE", DEFAULT_ARCHIVE_PATH))
+    try:
+        bot.run(TOKEN)
+    finally:
+        store.close()
+        archive.close()
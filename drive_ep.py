@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Exact expected points for a single drive
+
+Works through every branch of play_drive with its exact probabilities
+(drive roll, turnover, TD time, yards to go, AI decisions, kicks) instead of
+sampling. The result for a drive is the expected points for the offense and
+for the defense (safeties), given the situation the drive starts in.
+
+Most drives start with more than 60 blocks left, where the clock, the half
+and the score cannot change what happens. Those are precomputed once per
+(style, yards to goal) in EP_TABLE; late-half situations are computed on
+demand and cached.
+
+Because each drive's expected points are exact, a game's actual points
+minus the sum of its drives' expected points has mean zero. That makes it
+a control variate for game-level statistics (see game_residuals).
+"""
+
+from functools import lru_cache
+from typing import Tuple
+from gridiron_dice import (
+    TABLES, TURNOVER_THRESHOLDS, FIELD_GOAL_DISTANCE, FOURTH_DOWN_CONVERSION,
+    BLOCKS_PER_HALF, STYLES, advance, is_safety, is_td_yardage, yards_to_endzone,
+    within_fg_range, largest_fitting_row, time_for_required_yards,
+    two_point_probability, go_for_it_probability, end_of_half_probabilities,
+)
+
+# Work in the Bombers' frame: x = 100 - yards_to_goal
+OFFENSE = "Bombers"
+
+# Above this many blocks left no drive can run out the clock, and the AI
+# ignores the score and the half (late-game rules start at 60)
+LATE_BLOCKS = 60
+
+YARDS_TO_GO_DIE = {"run": 8, "balanced": 10, "pass": 20}
+
+
+def fg_make_probability(distance: int) -> float:
+    return sum(1 for d in FIELD_GOAL_DISTANCE if d >= distance) / 20
+
+
+def conversion_td_probability(x: int) -> float:
+    """Chance a 4th down attempt from x reaches the end zone"""
+    return sum(1 for y in FOURTH_DOWN_CONVERSION if is_td_yardage(OFFENSE, advance(OFFENSE, x, y))) / 20
+
+
+def touchdown_value(lead: int, blocks_left: int) -> float:
+    """6 plus the expected extra point"""
+    p_two = two_point_probability(lead, blocks_left)
+    two = 2 * sum(1 for r in range(1, 11) if r >= 7) / 10
+    one = fg_make_probability(15)
+    return 6 + p_two * two + (1 - p_two) * one
+
+
+def _late_half(style, x, blocks_left, half, lead, p_turnover, td_value):
+    """Expected (offense, defense) points when the drive row overflows the clock"""
+    adj_y, _ = largest_fitting_row(style, blocks_left)
+    end_x = advance(OFFENSE, x, adj_y)
+    if is_safety(OFFENSE, end_x):
+        return 0.0, 2.0
+    if is_td_yardage(OFFENSE, end_x):
+        return (1 - p_turnover) * td_value, 0.0
+
+    distance = yards_to_endzone(OFFENSE, end_x)
+    in_range = within_fg_range(OFFENSE, end_x)
+    p_fg, p_go, _ = end_of_half_probabilities(distance, in_range, lead, half)
+    points = p_go * conversion_td_probability(end_x) * td_value
+    if in_range:
+        points += p_fg * 3 * fg_make_probability(distance)
+    return (1 - p_turnover) * points, 0.0
+
+
+def _fourth_down(style, end_x, yards, blocks_left, half, lead, td_value):
+    """Expected offense points from the 4th down decision at end_x"""
+    distance = yards_to_endzone(OFFENSE, end_x)
+    if yards < 10:
+        yards_to_go_dist = [(10 - yards, 1.0)]
+    else:
+        sides = YARDS_TO_GO_DIE[style]
+        yards_to_go_dist = [(r, 1 / sides) for r in range(1, sides + 1)]
+
+    go_points = conversion_td_probability(end_x) * td_value
+    kick_points = 3 * fg_make_probability(distance) if within_fg_range(OFFENSE, end_x) else 0.0
+
+    points = 0.0
+    for yards_to_go, p in yards_to_go_dist:
+        fourth_and_goal = yards_to_go >= distance
+        if fourth_and_goal:
+            yards_to_go = distance
+        p_go = min(1.0, go_for_it_probability(distance, yards_to_go, fourth_and_goal, lead, blocks_left, half))
+        points += p * (p_go * go_points + (1 - p_go) * kick_points)
+    return points
+
+
+@lru_cache(maxsize=None)
+def _expected_points(style: str, yards_to_goal: int, blocks_left: int, half: int, lead: int) -> Tuple[float, float]:
+    x = 100 - yards_to_goal
+    p_turnover = len(TURNOVER_THRESHOLDS[style]) / 20
+    td_value = touchdown_value(lead, blocks_left)
+
+    offense = 0.0
+    defense = 0.0
+    for y, t in TABLES[style]:
+        if y == "TD":
+            # TD time is min(d20, cap); the late-half rules kick in if it overflows
+            cap = time_for_required_yards(style, yards_to_goal)
+            p_over = sum(1 for raw in range(1, 21) if min(raw, cap) > blocks_left) / 20
+            if p_over:
+                late_off, late_def = _late_half(style, x, blocks_left, half, lead, p_turnover, td_value)
+                offense += p_over * late_off
+                defense += p_over * late_def
+            offense += (1 - p_over) * (1 - p_turnover) * td_value
+            continue
+
+        if t > blocks_left:
+            late_off, late_def = _late_half(style, x, blocks_left, half, lead, p_turnover, td_value)
+            offense += late_off
+            defense += late_def
+            continue
+
+        end_x = advance(OFFENSE, x, y)
+        if is_safety(OFFENSE, end_x):
+            defense += 2
+        elif is_td_yardage(OFFENSE, end_x):
+            offense += (1 - p_turnover) * td_value
+        else:
+            offense += (1 - p_turnover) * _fourth_down(style, end_x, y, blocks_left, half, lead, td_value)
+
+    return offense / 20, defense / 20
+
+
+# (style, yards_to_goal) -> (offense EP, defense EP) with more than LATE_BLOCKS left
+EP_TABLE = {
+    style: [_expected_points(style, ytg, LATE_BLOCKS + 1, 1, 0) for ytg in range(101)]
+    for style in STYLES
+}
+
+
+def expected_drive_points(style: str, yards_to_goal: int, blocks_left: int, half: int, lead: int) -> Tuple[float, float]:
+    """
+    Exact expected points of a play_drive call.
+    lead is the offense's lead before the drive.
+    Returns: (expected offense points, expected defense points)
+    """
+    if blocks_left > LATE_BLOCKS:
+        return EP_TABLE[style][yards_to_goal]
+    # Beyond +/-8 the AI treats every lead the same
+    return _expected_points(style, yards_to_goal, blocks_left, half, max(-8, min(8, lead)))
+
+
+def game_residuals(game) -> Tuple[float, float]:
+    """
+    Actual minus expected points, summed over a game's drives.
+    Returns: (combined-score residual, Bombers-margin residual); both have mean zero.
+    """
+    score = {"Bombers": 0, "Gunners": 0}
+    blocks_left = BLOCKS_PER_HALF
+    half = 1
+    total_residual = 0.0
+    margin_residual = 0.0
+
+    for d in game.drives:
+        if d.half != half:
+            half = d.half
+            blocks_left = BLOCKS_PER_HALF
+        opponent = "Gunners" if d.team == "Bombers" else "Bombers"
+
+        ep_off, ep_def = expected_drive_points(
+            d.style, yards_to_endzone(d.team, d.start_x), blocks_left, d.half,
+            score[d.team] - score[opponent])
+        def_points = 2 if d.result.startswith("Safety") else 0
+
+        total_residual += (d.points + def_points) - (ep_off + ep_def)
+        sign = 1 if d.team == "Bombers" else -1
+        margin_residual += sign * ((d.points - def_points) - (ep_off - ep_def))
+
+        score[d.team] += d.points
+        score[opponent] += def_points
+        blocks_left -= d.time_blocks
+
+    return total_residual, margin_residual
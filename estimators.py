@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Variance-reduced estimators for the simulation analyses
+
+Importance sampling: TiltedDice rolls the engine's dice from a proposal
+distribution that makes a rare event more likely and keeps the likelihood
+ratio (true probability / proposal probability) of every draw it makes.
+Weighting each simulated game by that ratio gives an unbiased estimate of
+the event's true rate.
+
+Stratified sampling: the d20 drive roll explains most of a drive's outcome,
+so drive-level analyses can force each face a fixed number of times and
+recombine the per-face means with their exact 1/20 weights.
+
+Control variates: a game's actual points minus the exact expected points of
+its drives (drive_ep.game_residuals) has mean zero and soaks up most of the
+noise in game-level averages.
+"""
+
+import math
+import random
+from collections import namedtuple
+from gridiron_dice import Dice, yards_to_endzone
+
+# Situation at the start of the current drive, handed to every tilt function
+DriveContext = namedtuple("DriveContext", "team yards_to_goal blocks_left half lead")
+
+
+class TiltedDice(Dice):
+    """
+    Dice that draw from a proposal distribution and track the likelihood ratio.
+
+    rolls:   tag -> function(ctx) returning relative face weights for the die
+             (one per side), or None to roll fair.
+    chances: tag -> function(p, ctx) returning the proposal probability q.
+    picks:   tag -> function(probs, ctx) returning proposal probabilities.
+
+    ctx is the DriveContext of the drive being played. Draws with no tilt for
+    their tag are fair and leave the weight alone. Call reset() before each
+    simulated game and read .weight afterwards.
+    """
+
+    def __init__(self, rolls=None, chances=None, picks=None):
+        self.rolls = rolls or {}
+        self.chances = chances or {}
+        self.picks = picks or {}
+        self.ctx = None
+        self.weight = 1.0
+
+    def reset(self):
+        """Start a new sample path"""
+        self.ctx = None
+        self.weight = 1.0
+
+    def start_drive(self, team, x, blocks_left, half, score):
+        opponent = "Gunners" if team == "Bombers" else "Bombers"
+        self.ctx = DriveContext(team, yards_to_endzone(team, x), blocks_left, half,
+                                score[team] - score[opponent])
+
+    def roll(self, sides: int, tag: str) -> int:
+        tilt = self.rolls.get(tag)
+        weights = tilt(self.ctx) if tilt is not None and self.ctx is not None else None
+        if weights is None or len(weights) != sides:
+            return random.randint(1, sides)
+        total = float(sum(weights))
+        r = random.random() * total
+        cum = 0.0
+        for i, w in enumerate(weights):
+            cum += w
+            if r < cum:
+                break
+        self.weight *= total / (sides * weights[i])
+        return i + 1
+
+    def chance(self, p: float, tag: str) -> bool:
+        tilt = self.chances.get(tag)
+        if tilt is None or self.ctx is None or p <= 0.0 or p >= 1.0:
+            return random.random() < p
+        q = tilt(p, self.ctx)
+        if random.random() < q:
+            self.weight *= p / q
+            return True
+        self.weight *= (1.0 - p) / (1.0 - q)
+        return False
+
+    def pick(self, probs, tag: str) -> int:
+        tilt = self.picks.get(tag)
+        if tilt is None or self.ctx is None:
+            return super().pick(probs, tag)
+        proposal = tilt(probs, self.ctx)
+        i = super().pick(proposal, tag)
+        self.weight *= probs[i] / proposal[i]
+        return i
+
+    def choose(self, choice, tag: str):
+        if self.picks.get(tag) is None or self.ctx is None:
+            return super().choose(choice, tag)
+        return choice.outcomes[self.pick(choice.probs, tag)]
+
+
+def weighted_rate(hits, weights):
+    """
+    Importance-sampling estimate of an event rate.
+
+    hits: 0/1 (or any value) per sample, weights: likelihood ratio per sample.
+    Returns: (estimate, standard_error, effective_sample_size)
+    """
+    n = len(hits)
+    terms = [h * w for h, w in zip(hits, weights)]
+    mean = sum(terms) / n
+    var = sum((t - mean) ** 2 for t in terms) / (n - 1) if n > 1 else 0.0
+    sum_w = sum(weights)
+    sum_w2 = sum(w * w for w in weights)
+    ess = (sum_w * sum_w) / sum_w2 if sum_w2 > 0 else 0.0
+    return mean, math.sqrt(var / n), ess
+
+
+def allocate_strata(num_samples: int, stratum_stdevs=None, minimum: int = 2):
+    """
+    Split num_samples across strata.
+
+    Without stratum_stdevs the split is even. With them it is the optimal
+    (Neyman) split: each stratum gets samples in proportion to its standard
+    deviation, with at least `minimum` so no stratum goes unsampled.
+    Returns a list of sample counts, one per stratum. Every stratum needs at
+    least `minimum` (and at least 2, for its variance), so fewer samples than
+    that in total is a ValueError.
+    """
+    num_strata = len(stratum_stdevs) if stratum_stdevs else 20
+    minimum = max(2, minimum)
+    if num_samples < minimum * num_strata:
+        raise ValueError(f"{num_samples} samples can't give {num_strata} strata {minimum} each")
+    if stratum_stdevs is None or sum(stratum_stdevs) == 0:
+        base, extra = divmod(num_samples, num_strata)
+        return [base + (1 if i < extra else 0) for i in range(num_strata)]
+
+    total_sd = sum(stratum_stdevs)
+    counts = [max(minimum, int(num_samples * sd / total_sd)) for sd in stratum_stdevs]
+    # Hand out what rounding left over to the noisiest strata
+    order = sorted(range(len(counts)), key=lambda i: -stratum_stdevs[i])
+    i = 0
+    while sum(counts) < num_samples:
+        counts[order[i % len(order)]] += 1
+        i += 1
+    return counts
+
+
+def stratified_mean(values_by_stratum):
+    """
+    Combine per-stratum samples with equal stratum weights (1/20 each for a d20).
+    Every stratum needs at least 2 samples for its variance (ValueError if not).
+    Returns: (mean, standard_error)
+    """
+    k = len(values_by_stratum)
+    if any(len(values) < 2 for values in values_by_stratum):
+        raise ValueError("stratified_mean needs at least 2 samples in every stratum")
+    mean = 0.0
+    var = 0.0
+    for values in values_by_stratum:
+        n = len(values)
+        m = sum(values) / n
+        mean += m / k
+        s2 = sum((v - m) ** 2 for v in values) / (n - 1)
+        var += s2 / n / (k * k)
+    return mean, math.sqrt(var)
+
+
+def sample_mean(values):
+    """Plain sample mean and its standard error"""
+    n = len(values)
+    m = sum(values) / n
+    s2 = sum((v - m) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return m, math.sqrt(s2 / n)
+
+
+def control_variate_mean(values, controls):
+    """
+    Control-variate estimate of E[value], given per-sample controls with known mean zero.
+    Uses the variance-minimising coefficient beta = cov(value, control) / var(control).
+    Returns: (estimate, standard_error, variance_reduction_factor)
+    """
+    n = len(values)
+    mv = sum(values) / n
+    mc = sum(controls) / n
+    cov = sum((v - mv) * (c - mc) for v, c in zip(values, controls)) / (n - 1)
+    var_c = sum((c - mc) ** 2 for c in controls) / (n - 1)
+    var_v = sum((v - mv) ** 2 for v in values) / (n - 1)
+    beta = cov / var_c if var_c > 0 else 0.0
+
+    adjusted = [v - beta * c for v, c in zip(values, controls)]
+    estimate = sum(adjusted) / n
+    var_adj = sum((a - estimate) ** 2 for a in adjusted) / (n - 1)
+    reduction = var_v / var_adj if var_adj > 0 else float("inf")
+    return estimate, math.sqrt(var_adj / n), reduction
@@ -0,0 +1,148 @@
+"""
+Archive of finished games, as roll tapes
+
+A finished game is kept as one packed record: a small header (who played,
+team names, who received first, the final score, when it ended), then its
+tape (gridiron_dice.Tape: every decision and every roll, a byte each). That
+is a few hundred bytes a game, and enough to rebuild all of it, drive log,
+events and stats included, by replaying the tape on the engine.
+
+Records go in a SQLite table indexed by channel and by player, so "recent
+games here" and "my games" are index scans. There is one insert per
+finished game, so add() commits on the caller's thread (WAL + NORMAL
+doesn't wait for the disk).
+"""
+
+import sqlite3
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from gridiron_dice import DEFAULT_RULES, GameEngine, RuleSet, Tape
+
+DEFAULT_PATH = "gridiron_archive.db"
+
+RECORD_VERSION = 1
+
+# version, first_receiver, ai_team, channel_id, Bombers player, Gunners player,
+# finished_at, Bombers score, Gunners score, number of decisions; then each
+# team name (length byte + UTF-8), the decisions and the rolls
+_HEADER = struct.Struct("<BBbqqqdHHH")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    bombers_id INTEGER NOT NULL,
+    gunners_id INTEGER NOT NULL,
+    finished_at REAL NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_channel ON games (channel_id, id);
+CREATE INDEX IF NOT EXISTS games_by_bombers ON games (bombers_id, id);
+CREATE INDEX IF NOT EXISTS games_by_gunners ON games (gunners_id, id);
+"""
+
+
+def _pack_name(name: str) -> bytes:
+    data = name.encode()[:255]
+    return bytes([len(data)]) + data
+
+
+@dataclass
+class GameRecord:
+    """A finished game: the header plus its tape"""
+    channel_id: int
+    player_ids: Tuple[int, int]
+    names: Tuple[str, str]
+    first_receiver: int
+    score: Tuple[int, int]
+    tape: Tape
+    ai_team: int = -1
+    finished_at: float = field(default_factory=time.time)
+    # The archive's id for it, once stored
+    game_id: Optional[int] = None
+
+    def pack(self) -> bytes:
+        header = _HEADER.pack(RECORD_VERSION, self.first_receiver, self.ai_team, self.channel_id,
+                              self.player_ids[0], self.player_ids[1], self.finished_at,
+                              self.score[0], self.score[1], len(self.tape.decisions))
+        return b"".join((header, _pack_name(self.names[0]), _pack_name(self.names[1]),
+                         self.tape.decisions, self.tape.rolls))
+
+    @classmethod
+    def unpack(cls, data: bytes, game_id: Optional[int] = None) -> "GameRecord":
+        if not data or data[0] != RECORD_VERSION:
+            raise ValueError(f"unsupported game record version {data[:1]!r}")
+        (_, first_receiver, ai_team, channel_id, bombers_id, gunners_id,
+         finished_at, bombers_score, gunners_score, num_decisions) = _HEADER.unpack_from(data)
+        at = _HEADER.size
+        names = []
+        for _ in range(2):
+            length = data[at]
+            names.append(data[at + 1:at + 1 + length].decode(errors="ignore"))
+            at += 1 + length
+        tape = Tape(data[at:at + num_decisions], data[at + num_decisions:])
+        return cls(channel_id, (bombers_id, gunners_id), (names[0], names[1]), first_receiver,
+                   (bombers_score, gunners_score), tape, ai_team, finished_at, game_id)
+
+    def replay(self, rules: RuleSet = DEFAULT_RULES) -> Tuple[GameEngine, List[dict]]:
+        """
+        Rebuild the game (with its drive log) and every event it produced.
+        Raises ValueError if the tape no longer plays out to the recorded
+        score, e.g. because the rules have changed since.
+        """
+        engine, events = self.tape.replay(self.first_receiver, rules)
+        if tuple(engine.score) != self.score:
+            raise ValueError(f"tape replays to {tuple(engine.score)}, not the recorded {self.score}")
+        return engine, events
+
+
+class GameArchive:
+    """Finished games by id, with lookups by channel and player"""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, record: GameRecord) -> int:
+        """Archive a finished game; returns (and sets) its id"""
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO games (channel_id, bombers_id, gunners_id, finished_at, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (record.channel_id, record.player_ids[0], record.player_ids[1],
+                 record.finished_at, record.pack()))
+        record.game_id = cursor.lastrowid
+        return record.game_id
+
+    def get(self, game_id: int) -> Optional[GameRecord]:
+        row = self._conn.execute("SELECT id, record FROM games WHERE id = ?", (game_id,)).fetchone()
+        return GameRecord.unpack(row[1], row[0]) if row is not None else None
+
+    def recent(self, channel_id: Optional[int] = None, player_id: Optional[int] = None,
+               limit: int = 10) -> List[GameRecord]:
+        """The latest games, newest first: in a channel, with a player, or anywhere"""
+        if channel_id is not None:
+            rows = self._conn.execute(
+                "SELECT id, record FROM games WHERE channel_id = ? ORDER BY id DESC LIMIT ?",
+                (channel_id, limit))
+        elif player_id is not None:
+            # Each side has its own index; merge the two scans
+            rows = self._conn.execute(
+                "SELECT id, record FROM games WHERE bombers_id = ? UNION "
+                "SELECT id, record FROM games WHERE gunners_id = ? ORDER BY id DESC LIMIT ?",
+                (player_id, player_id, limit))
+        else:
+            rows = self._conn.execute("SELECT id, record FROM games ORDER BY id DESC LIMIT ?", (limit,))
+        return [GameRecord.unpack(record, game_id) for game_id, record in rows]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,230 @@
+"""
+Durable storage for the Discord bot's games
+
+Every state transition of a game is appended to a journal table in a
+SQLite database in WAL mode, as the game's compact state (GameState.to_dict
+as JSON; None once the game is over). Periodically the journal is folded
+into a snapshot table holding only the latest state of each live game, and
+emptied, so restoring is one read of the snapshots plus whatever the
+journal gained since.
+
+Writes never touch the event loop: save() and delete() only queue the row,
+and a writer thread commits whatever has queued up in one transaction. If
+a commit fails (disk full, database locked) the writer keeps the rows and
+retries them; the next save() or delete() raises StoreError to report it.
+
+Reads have a connection of their own, so they never share the writer's.
+load() waits for the writer to catch up first, so it blocks; the bot runs
+it in an executor.
+"""
+
+import json
+import queue
+import sqlite3
+import sys
+import threading
+from typing import Dict, Optional
+
+DEFAULT_PATH = "gridiron_games.db"
+
+# Journal rows between snapshots
+SNAPSHOT_EVERY = 2000
+# Most rows committed in one transaction
+BATCH_SIZE = 512
+# Seconds between retries of a failed commit
+RETRY_INTERVAL = 1.0
+# Longest load() waits for queued rows to be committed (seconds)
+LOAD_TIMEOUT = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id INTEGER NOT NULL,
+    state TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    channel_id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL
+);
+"""
+
+# Queue markers for the writer thread
+_FLUSH = object()
+_STOP = object()
+
+
+class StoreError(Exception):
+    """The writer couldn't commit, or a load couldn't see the latest state"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL survives a process crash; only an OS crash can lose the last commits
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class GameStore:
+    """
+    Journal + snapshots of game states, keyed by channel id.
+
+    save(channel_id, state) and delete(channel_id) are cheap enough to call
+    from the event loop after every transition; load_all() reads every live
+    game back (call it before the writer has anything queued, i.e. at
+    startup) and load() one game (it blocks, so not on the event loop).
+    close() flushes and stops the writer.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, snapshot_every: int = SNAPSHOT_EVERY,
+                 batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+        self._conn = _connect(path)
+        self._conn.executescript(_SCHEMA)
+        # Fold whatever the last run left in the journal, so loads start from snapshots
+        self._snapshot()
+        # Reads (from any thread, one at a time) go through their own connection
+        self._read_conn = _connect(path)
+        self._read_lock = threading.Lock()
+        # The writer's last failure, until save() or delete() reports it
+        self._error: Optional[BaseException] = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="game-store", daemon=True)
+        self._thread.start()
+
+    # -- event-loop side ------------------------------------------------------
+
+    def save(self, channel_id: int, state: dict):
+        """Journal a game's state after a transition (StoreError: the writer has been failing)"""
+        self._queue.put((channel_id, json.dumps(state, separators=(",", ":"))))
+        self._raise_error()
+
+    def delete(self, channel_id: int):
+        """Journal that a game is over (StoreError: the writer has been failing)"""
+        self._queue.put((channel_id, None))
+        self._raise_error()
+
+    def _raise_error(self):
+        # The row is queued either way; the writer retries until it commits
+        error, self._error = self._error, None
+        if error is not None:
+            raise StoreError(f"game store commit failed (retrying): {error!r}") from error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed (for shutdown and tests)"""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what's queued, snapshot, and stop the writer"""
+        if self._thread.is_alive():
+            self._queue.put((_STOP, None))
+            self._thread.join()
+        self._snapshot()
+        self._conn.close()
+        self._read_conn.close()
+
+    def load_all(self) -> Dict[int, dict]:
+        """Every live game's latest state: {channel_id: state}"""
+        with self._read_lock:
+            games = {channel_id: state for channel_id, state in
+                     self._read_conn.execute("SELECT channel_id, state FROM snapshots")}
+            for channel_id, state in self._read_conn.execute("SELECT channel_id, state FROM journal ORDER BY seq"):
+                if state is None:
+                    games.pop(channel_id, None)
+                else:
+                    games[channel_id] = state
+        return {channel_id: json.loads(state) for channel_id, state in games.items()}
+
+    def load(self, channel_id: int, timeout: float = LOAD_TIMEOUT) -> Optional[dict]:
+        """
+        One game's latest state, or None if it's over or unknown. Commits
+        whatever is queued first (blocking up to timeout) so the state is
+        current; raises StoreError if that doesn't happen in time. Safe to
+        call from any thread.
+        """
+        if not self.flush(timeout):
+            raise StoreError(f"game store writer is behind; can't load channel {channel_id}")
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT state FROM journal WHERE channel_id = ? ORDER BY seq DESC LIMIT 1", (channel_id,)).fetchone()
+            if row is None:
+                row = self._read_conn.execute(
+                    "SELECT state FROM snapshots WHERE channel_id = ?", (channel_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    # -- writer thread --------------------------------------------------------
+
+    def _run(self):
+        pending = 0
+        # Rows and markers carry over to the next pass while a commit keeps failing
+        rows = []
+        markers = []
+        while True:
+            try:
+                item = self._queue.get(timeout=RETRY_INTERVAL if rows else None)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item[0] is _FLUSH or item[0] is _STOP:
+                    markers.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = any(marker is _STOP for marker, _ in markers)
+
+            if rows:
+                try:
+                    with self._conn:
+                        self._conn.executemany("INSERT INTO journal (channel_id, state) VALUES (?, ?)", rows)
+                except Exception as exc:
+                    self._failed(exc)
+                    if not stopping:
+                        # Flushes wait for the retry to commit their rows
+                        continue
+                    print(f"Game store: {len(rows)} row(s) not saved at shutdown", file=sys.stderr)
+                else:
+                    pending += len(rows)
+                    if pending >= self.snapshot_every:
+                        try:
+                            self._snapshot()
+                            pending = 0
+                        except Exception as exc:
+                            # The rows are in the journal; the fold is tried again later
+                            self._failed(exc)
+                rows = []
+
+            for marker, done in markers:
+                if marker is _STOP:
+                    return
+                done.set()
+            markers = []
+
+    def _failed(self, exc: BaseException):
+        self._error = exc
+        print(f"Game store: commit failed, will retry: {exc!r}", file=sys.stderr)
+
+    def _snapshot(self):
+        """Fold the journal into the snapshots (latest state per channel) and empty it"""
+        with self._conn:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO snapshots (channel_id, state)
+                SELECT channel_id, state FROM journal
+                WHERE seq IN (SELECT MAX(seq) FROM journal GROUP BY channel_id) AND state IS NOT NULL
+            """)
+            self._conn.execute("""
+                DELETE FROM snapshots WHERE channel_id IN (
+                    SELECT channel_id FROM journal
+                    WHERE seq IN (SELECT MAX(seq) FROM journal GROUP BY channel_id) AND state IS NULL)
+            """)
+            self._conn.execute("DELETE FROM journal")
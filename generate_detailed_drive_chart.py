@@ -301,6 +301,107 @@ def simulate_detailed_game(output_file="DRIVE_CHART.md"):
 
     print(f"Detailed drive chart saved to: {output_file}")
 
+def replay_detailed_game(record, output_file="DRIVE_CHART.md"):
+    """Write the detailed chart of an archived game, replayed from its roll tape"""
+    _, events = record.replay()
+    names = {"Bombers": record.names[0], "Gunners": record.names[1]}
+    score = {"Bombers": 0, "Gunners": 0}
+    drive_num = 0
+    in_drive = False
+
+    with open(output_file, 'w') as f:
+        f.write("# Detailed Game Drive Chart\n\n")
+        f.write(f"**Replayed:** game #{record.game_id}, finished "
+                f"{datetime.fromtimestamp(record.finished_at).strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(f"**Bombers:** {names['Bombers']} | **Gunners:** {names['Gunners']}\n\n")
+        f.write("## Half 1\n\n")
+
+        for event in events:
+            kind = event["event"]
+            if kind == "drive":
+                if not in_drive:
+                    drive_num += 1
+                    in_drive = True
+                    f.write(f"### Drive {drive_num}: {names[event['team']]}\n\n")
+                    f.write(f"**Starting Position:** {event['start_x']} yard line\n")
+                    f.write(f"**Score:** Bombers {score['Bombers']} - Gunners {score['Gunners']}\n")
+                f.write(f"**Play Style Selected:** {event['style'].upper()}\n\n")
+                late = " (largest row that fits the clock)" if event["late_half"] else ""
+                f.write(f"**Drive Roll (d20):** {event['roll']} → Result: {event['yards']} yards, "
+                        f"{event['time_blocks']} time blocks{late}\n")
+                f.write(f"**Turnover Check (d20):** {event['turnover_roll']} → "
+                        f"{'TURNOVER' if event['turnover'] else 'No turnover'}\n")
+            elif kind == "fourth_down":
+                what = "goal" if event["goal"] else event["yards_to_go"]
+                f.write(f"\n**4th and {what}** at the {event['x']} yard line\n")
+            elif kind == "untimed_down":
+                f.write(f"\n**Untimed down** at the {event['x']} yard line\n")
+            elif kind == "conversion":
+                f.write(f"**4th Down Attempt Roll (d20):** {event['roll']} → {event['yards']} yards → "
+                        f"{event['outcome'].replace('_', ' ').upper()}\n")
+            elif kind == "field_goal":
+                f.write(f"**Field Goal Attempt from {event['distance']} yards**\n")
+                f.write(f"**FG Roll (d20):** {event['roll']} → Make distance: {event['make_distance']} yards → "
+                        f"{'GOOD' if event['good'] else 'MISS'}\n")
+            elif kind == "punt":
+                f.write(f"**PUNT** → ball at the {event['x']} yard line\n")
+            elif kind == "kneel":
+                f.write("**Untimed down declined**\n")
+            elif kind == "touchdown":
+                f.write("\n**TOUCHDOWN!** 6 points\n")
+            elif kind == "extra_point":
+                die = "d10" if event["conversion"] == "2pt" else "d20"
+                f.write(f"**{event['conversion']} Attempt Roll ({die}):** {event['roll']} → "
+                        f"{'GOOD' if event['good'] else 'FAILED'}\n")
+            elif kind == "result":
+                team = event["team"]
+                opponent = "Gunners" if team == "Bombers" else "Bombers"
+                score[team] += event["points"]
+                score[opponent] += event["safety"]
+                in_drive = False
+                f.write(f"**Drive Result:** {event['result']} | **Points:** {event['points']}\n")
+                f.write(f"**Final Score:** Bombers {score['Bombers']} - Gunners {score['Gunners']}\n\n")
+            elif kind == "end_of_half" and event["half"] == 1:
+                f.write("\n---\n\n## Half 2\n\n")
+
+        f.write("\n---\n\n")
+        f.write("## Final Score\n\n")
+        f.write(f"**{names['Bombers']} {score['Bombers']} - {names['Gunners']} {score['Gunners']}**\n\n")
+        if score['Bombers'] > score['Gunners']:
+            f.write(f"**Winner: {names['Bombers']}**\n")
+        elif score['Gunners'] > score['Bombers']:
+            f.write(f"**Winner: {names['Gunners']}**\n")
+        else:
+            f.write("**TIE GAME**\n")
+
+    print(f"Detailed drive chart of game #{record.game_id} saved to: {output_file}")
+
 if __name__ == "__main__":
+    import argparse
+    import os
+    import sys
     from datetime import datetime
-    simulate_detailed_game()
+    from game_archive import GameArchive, DEFAULT_PATH as DEFAULT_ARCHIVE_PATH
+
+    parser = argparse.ArgumentParser(description="Write a detailed drive chart of a simulated or archived game")
+    parser.add_argument("--replay", type=int, metavar="GAME_ID",
+                        help="chart an archived game (as numbered by the bot's /replay) instead of simulating one")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, help="the bot's game archive")
+    parser.add_argument("--output", default="DRIVE_CHART.md", help="markdown file to write")
+    args = parser.parse_args()
+
+    if args.replay is None:
+        simulate_detailed_game(args.output)
+    else:
+        # GameArchive would create a missing file
+        if not os.path.exists(args.archive):
+            sys.exit(f"No game archive at {args.archive}")
+        archive = GameArchive(args.archive)
+        record = archive.get(args.replay)
+        archive.close()
+        if record is None:
+            sys.exit(f"No game #{args.replay} in {args.archive}")
+        try:
+            replay_detailed_game(record, args.output)
+        except ValueError as e:
+            sys.exit(f"Game #{args.replay} doesn't replay under the current rules ({e})")
@@ -137,8 +137,36 @@ def format_drive_chart(game, output_file="DRIVE_CHART.md"):
     print(f"Drive chart saved to: {output_file}")
 
 if __name__ == "__main__":
-    print("Simulating game...")
-    game = simulate_game()
+    import argparse
+    import os
+    import sys
+    from game_archive import GameArchive, DEFAULT_PATH as DEFAULT_ARCHIVE_PATH
+
+    parser = argparse.ArgumentParser(description="Write a drive chart of a simulated or archived game")
+    parser.add_argument("--replay", type=int, metavar="GAME_ID",
+                        help="chart an archived game (as numbered by the bot's /replay) instead of simulating one")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, help="the bot's game archive")
+    parser.add_argument("--output", default="DRIVE_CHART.md", help="markdown file to write")
+    args = parser.parse_args()
+
+    if args.replay is None:
+        print("Simulating game...")
+        game = simulate_game()
+    else:
+        # GameArchive would create a missing file
+        if not os.path.exists(args.archive):
+            sys.exit(f"No game archive at {args.archive}")
+        archive = GameArchive(args.archive)
+        record = archive.get(args.replay)
+        archive.close()
+        if record is None:
+            sys.exit(f"No game #{args.replay} in {args.archive}")
+        # The drive log isn't stored; the tape rebuilds it
+        print(f"Replaying game #{record.game_id}: {record.names[0]} (Bombers) vs {record.names[1]} (Gunners)")
+        try:
+            game = record.replay()[0].result()
+        except ValueError as e:
+            sys.exit(f"Game #{args.replay} doesn't replay under the current rules ({e})")
     print(f"Final Score: Bombers {game.score['Bombers']} - Gunners {game.score['Gunners']}")
     print()
-    format_drive_chart(game)
+    format_drive_chart(game, args.output)
@@ -2,15 +2,25 @@
 # Distance-based field goals + Turnovers + 4th Down Conversions
 # Author: Synthia + You
 
+import json
+import os
 import random
-from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Dict
+import sys
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, field, replace
+from itertools import accumulate, repeat, starmap
+from types import MappingProxyType
+from typing import List, Tuple, Optional, Dict, Mapping
 
 # -----------------------------
 # Config
 # -----------------------------
 BLOCKS_PER_HALF = 180  # 30 minutes, 10 sec per block
 PUNT_YARDS = 40
+MISSED_FG_BACKUP = 7  # yards a missed FG moves the ball back
 SEED = None  # set to an int for reproducible runs
 
 # Turnover Rules (roll d20 1-20 for each drive)
@@ -72,6 +82,222 @@ FIELD_GOAL_DISTANCE = [
 
 STYLES = ("balanced", "run", "pass")
 
+# -----------------------------
+# Rule sets
+# The constants above are the stock rules. A RuleSet bundles a full set of
+# rules, immutable, with the lookups the engine needs precompiled, and is
+# passed to play_drive / simulate_half / simulate_game (default: the stock
+# DEFAULT_RULES). Variants are made with rules.replace(punt_yards=35, ...),
+# so several can run side by side in one process without touching globals.
+# -----------------------------
+
+def _td_time_cap(rows, yards_needed: int) -> int:
+    """Time of the first non-TD row gaining yards_needed, else the last non-TD time"""
+    candidates = [t for (y, t) in rows if y != "TD"]
+    for y, t in rows:
+        if y == "TD":
+            continue
+        if y >= yards_needed:
+            return t
+    return candidates[-1]
+
+def _fitting_row(rows, blocks_left: int) -> Tuple[int, int]:
+    """Non-TD row with the largest time <= blocks_left-1, else (0, 0)"""
+    limit = max(0, blocks_left - 1)
+    best = (0, 0)
+    for (y, t) in rows:
+        if y == "TD":
+            continue
+        if t <= limit and t >= best[1]:
+            best = (y, t)
+    return best
+
+@dataclass(frozen=True, eq=False)
+class RuleSet:
+    blocks_per_half: int = BLOCKS_PER_HALF
+    punt_yards: int = PUNT_YARDS
+    missed_fg_backup: int = MISSED_FG_BACKUP
+    turnover_thresholds: Mapping[str, Tuple[int, ...]] = None  # None = stock
+    tables: Mapping[str, Tuple[tuple, ...]] = None
+    fourth_down_conversion: Tuple[int, ...] = tuple(FOURTH_DOWN_CONVERSION)
+    field_goal_distance: Tuple[int, ...] = tuple(FIELD_GOAL_DISTANCE)
+
+    def __post_init__(self):
+        # Freeze everything, then compile the lookups
+        set_ = object.__setattr__
+        thresholds = self.turnover_thresholds if self.turnover_thresholds is not None else TURNOVER_THRESHOLDS
+        tables = self.tables if self.tables is not None else TABLES
+        set_(self, "turnover_thresholds", MappingProxyType({s: tuple(v) for s, v in thresholds.items()}))
+        set_(self, "tables", MappingProxyType({s: tuple(tuple(row) for row in v) for s, v in tables.items()}))
+        set_(self, "fourth_down_conversion", tuple(self.fourth_down_conversion))
+        set_(self, "field_goal_distance", tuple(self.field_goal_distance))
+
+        # style -> rolls that turn the ball over
+        set_(self, "turnover_rolls", MappingProxyType(
+            {s: frozenset(v) for s, v in self.turnover_thresholds.items()}))
+        # style -> TD time cap for yards needed 0..100
+        set_(self, "td_time_caps", MappingProxyType(
+            {s: tuple(_td_time_cap(rows, y) for y in range(101)) for s, rows in self.tables.items()}))
+        # style -> largest fitting row for blocks left 0..(longest row + 1); constant beyond
+        set_(self, "fitting_rows", MappingProxyType(
+            {s: tuple(_fitting_row(rows, b) for b in range(max(t for y, t in rows if y != "TD") + 2))
+             for s, rows in self.tables.items()}))
+
+    def key(self) -> tuple:
+        """Everything that defines the rules, as a hashable tuple"""
+        return (self.blocks_per_half, self.punt_yards, self.missed_fg_backup,
+                tuple(sorted(self.turnover_thresholds.items())),
+                tuple(sorted(self.tables.items())),
+                self.fourth_down_conversion, self.field_goal_distance)
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def replace(self, **changes) -> "RuleSet":
+        """A copy with some rules changed"""
+        return replace(self, **changes)
+
+DEFAULT_RULES = RuleSet()
+
+# -----------------------------
+# Dice
+# Every random draw the engine makes goes through DICE. The default source
+# rolls fair dice from the module-level `random` generator, so seeding with
+# random.seed() (or simulate_game(seed=...)) stays reproducible. Analyses can
+# swap in another source (e.g. a tilted one for importance sampling) with
+# use_dice(); simulate_many rolls from a BufferedDice for speed. Each draw
+# carries a tag naming what it is for:
+#   rolls:   "drive", "turnover", "td_time", "yards_to_go", "fourth_down",
+#            "untimed_down", "field_goal", "one_point", "two_point"
+#   choices: "style", "go_for_it", "go_for_two", "end_of_half"
+# Multi-way AI choices are compiled into Choice tables at import and drawn
+# with choose(): one uniform and a bisect of the running totals.
+# -----------------------------
+
+# A weighted AI choice compiled once: the outcomes, their probabilities (for
+# dice that tilt them) and the running totals a single uniform is looked up
+# in. The last total is infinite so float round-off can never fall off the
+# end, matching the cumulative walk in Dice.pick.
+Choice = namedtuple("Choice", "outcomes probs cumulative")
+
+def make_choice(weights: Dict[str, float]) -> Choice:
+    """Compile {outcome: probability} (in draw order) into a Choice"""
+    probs = tuple(weights.values())
+    cumulative = list(accumulate(probs))
+    cumulative[-1] = float("inf")
+    return Choice(tuple(weights), probs, tuple(cumulative))
+
+class Dice:
+    """Fair dice backed by the module-level random generator"""
+
+    def start_drive(self, team: str, x: int, blocks_left: int, half: int, score: Dict[str, int]):
+        """Called by play_drive before its first roll. Fair dice ignore it."""
+        pass
+
+    def roll(self, sides: int, tag: str) -> int:
+        """Roll a die with faces 1..sides"""
+        return random.randint(1, sides)
+
+    def chance(self, p: float, tag: str) -> bool:
+        """Return True with probability p"""
+        return random.random() < p
+
+    def pick(self, probs, tag: str) -> int:
+        """Pick an index from a sequence of probabilities summing to 1"""
+        r = random.random()
+        cum = 0.0
+        for i, p in enumerate(probs):
+            cum += p
+            if r < cum:
+                return i
+        return len(probs) - 1
+
+    def choose(self, choice: Choice, tag: str):
+        """Pick an outcome of a compiled Choice"""
+        return choice.outcomes[bisect_right(choice.cumulative, random.random())]
+
+class BufferedDice(Dice):
+    """
+    Fair dice that generate their rolls in bulk.
+
+    Faces for each die size are made a block at a time from random bytes:
+    bytes at or above the largest multiple of `sides` are dropped (so every
+    face stays exactly equally likely) and the rest are mapped to faces with
+    one bytes.translate call. Uniforms for chance/pick/choose are generated a block
+    at a time too. Each draw is then just a next() on a buffer instead of a
+    randint call.
+
+    Uses its own generator, so seeding it replays the same draws and leaves
+    the module-level random state alone.
+    """
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024):
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None):
+        """Restart the generator and drop anything already buffered"""
+        self._rng = random.Random(seed)
+        self._faces = {}
+        self._uniforms = iter(())
+
+    def _refill_faces(self, sides: int) -> int:
+        if sides > 255:
+            return self._rng.randint(1, sides)
+        keep = 256 - 256 % sides
+        table = bytes(b % sides + 1 if b < keep else 0 for b in range(256))
+        rejected = bytes(range(keep, 256))
+        raw = self._rng.getrandbits(8 * self.block_size).to_bytes(self.block_size, "little")
+        faces = iter(raw.translate(table, rejected))
+        self._faces[sides] = faces
+        return next(faces)
+
+    def _refill_uniforms(self) -> float:
+        # starmap keeps the whole block's generator calls in C
+        self._uniforms = iter(list(starmap(self._rng.random, repeat((), self.block_size))))
+        return next(self._uniforms)
+
+    def roll(self, sides: int, tag: str) -> int:
+        face = next(self._faces.get(sides, _EMPTY), 0)
+        return face if face else self._refill_faces(sides)
+
+    def chance(self, p: float, tag: str) -> bool:
+        u = next(self._uniforms, None)
+        if u is None:
+            u = self._refill_uniforms()
+        return u < p
+
+    def pick(self, probs, tag: str) -> int:
+        r = next(self._uniforms, None)
+        if r is None:
+            r = self._refill_uniforms()
+        cum = 0.0
+        for i, p in enumerate(probs):
+            cum += p
+            if r < cum:
+                return i
+        return len(probs) - 1
+
+    def choose(self, choice: Choice, tag: str):
+        r = next(self._uniforms, None)
+        if r is None:
+            r = self._refill_uniforms()
+        return choice.outcomes[bisect_right(choice.cumulative, r)]
+
+_EMPTY = iter(())
+
+DICE = Dice()
+
+def use_dice(dice: Dice) -> Dice:
+    """Install a dice source for the engine. Returns the previous one."""
+    global DICE
+    previous = DICE
+    DICE = dice
+    return previous
+
 # -----------------------------
 # Coordinate system:
 # Absolute field coordinate 0..100:
@@ -83,8 +309,32 @@ STYLES = ("balanced", "run", "pass")
 # Kickoffs:
 #   Bombers start @ 30  -> x=30
 #   Gunners start @ 30 -> relative => x = 100-30 = 70
+#
+# The drive kernel (resolve_drive and the helpers it calls) works in the
+# offense's frame instead: pos = yards from the offense's own goal line,
+# 0 = own goal, 100 = opponent's goal, so it never needs to know which team
+# has the ball. Teams are int ids there; the team-name / absolute-x
+# functions below are the API boundary and convert on the way in and out.
 # -----------------------------
 
+BOMBERS, GUNNERS = 0, 1
+TEAMS = ("Bombers", "Gunners")
+
+# Where the other team takes over, in the offense's frame
+OPP_KICKOFF_POS = 70  # their own 30
+OPP_20_POS = 80       # their own 20 (touchbacks, turnovers in the end zone)
+
+def team_id(team: str) -> int:
+    return BOMBERS if team == "Bombers" else GUNNERS
+
+def to_relative(tid: int, x: int) -> int:
+    """Absolute x -> yards from team tid's own goal line"""
+    return x if tid == BOMBERS else 100 - x
+
+def to_absolute(tid: int, pos: int) -> int:
+    """Yards from team tid's own goal line -> absolute x"""
+    return pos if tid == BOMBERS else 100 - pos
+
 def kickoff_position(next_team: str) -> int:
     return 30 if next_team == "Bombers" else 70
 
@@ -107,184 +357,236 @@ def is_safety(team: str, x: int) -> bool:
 def within_fg_range(team: str, x: int) -> bool:
     return yards_to_endzone(team, x) <= 50
 
-def attempt_field_goal(team: str, x: int) -> bool:
+def attempt_field_goal(team: str, x: int, rules: RuleSet = DEFAULT_RULES) -> bool:
     """
     Attempt a field goal using d20 make distance table.
     Returns True if successful, False if missed.
     Roll d20 (1-20), if result >= yards to goal line, FG is good.
     """
-    distance = yards_to_endzone(team, x)
+    return field_goal_good(yards_to_endzone(team, x), rules)
 
+def field_goal_good(distance: int, rules: RuleSet = DEFAULT_RULES) -> bool:
+    """attempt_field_goal from distance yards out"""
     # Roll d20 (1-20) and look up make distance
-    roll = random.randint(1, 20)
-    make_distance = FIELD_GOAL_DISTANCE[roll - 1]
+    roll = DICE.roll(20, "field_goal")
+    make_distance = rules.field_goal_distance[roll - 1]
 
     # FG is good if make distance >= actual distance
     return make_distance >= distance
 
-def attempt_extra_point(team: str, score: Dict[str, int], blocks_left: int, half: int) -> tuple:
+# -----------------------------
+# AI coach tables
+# The coach's probabilities live in coach_tables.json (versioned; edit it to
+# retune the AI). load_coach_tables() compiles the file into flat lookups
+# indexed by bucketed state - half, lead bucket, distance, blocks left,
+# yards to go - so each AI decision is a table lookup plus one draw. Leads
+# are clipped to the range the buckets distinguish. use_coach() installs a
+# set of tables, the same way use_dice() installs dice.
+# -----------------------------
+
+COACH_TABLES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coach_tables.json")
+COACH_TABLES_VERSION = 1
+
+def _bucket_value(buckets, value, default=0.0):
+    """Value of the first [upper_bound, value] bucket containing value (None = no bound)"""
+    for bound, result in buckets:
+        if bound is None or value <= bound:
+            return result
+    return default
+
+def _lead_range(*bucket_lists) -> Tuple[int, int]:
+    """Lead range outside which every lead lands in the same bucket as an end"""
+    bounds = [bound for buckets in bucket_lists for bound, _ in buckets if bound is not None]
+    return (min(bounds), max(bounds) + 1) if bounds else (0, 0)
+
+class CoachTables:
+    """AI coach probabilities compiled from a coach tables file"""
+
+    __slots__ = (
+        "version", "style_late_blocks", "style",
+        "go_for_it_goal", "go_for_it_yards_to_go", "yards_to_go_cap",
+        "late_game_half", "late_game_blocks", "late_game_leads", "late_game_bonus",
+        "two_point_blocks", "two_point_leads", "two_point",
+        "end_of_half_leads", "end_of_half",
+    )
+
+    def __init__(self, data: dict):
+        if data.get("version") != COACH_TABLES_VERSION:
+            raise ValueError(f"Unsupported coach tables version {data.get('version')!r} "
+                             f"(expected {COACH_TABLES_VERSION})")
+        self.version = data["version"]
+        distances = range(101)
+
+        # Style: early, then late trailing / tied / leading
+        style = data["style"]
+        self.style_late_blocks = style["late_blocks"]
+        self.style = tuple(make_choice(style[key]) for key in ("early", "late_trailing", "late_tied", "late_leading"))
+
+        # Go for it: base rate + field position bonus, by distance (and yards to go)
+        go = data["go_for_it"]
+        field_bonus = go["field_position_bonus_by_distance"]
+        by_ytg = go["by_yards_to_go"]
+        self.go_for_it_goal = [_bucket_value(go["fourth_and_goal_by_distance"], d) + _bucket_value(field_bonus, d)
+                               for d in distances]
+        self.yards_to_go_cap = max([bound for bound, _ in by_ytg if bound is not None] or [0]) + 1
+        self.go_for_it_yards_to_go = [0.0] * ((self.yards_to_go_cap + 1) * 101)
+        for ytg in range(self.yards_to_go_cap + 1):
+            for d in distances:
+                self.go_for_it_yards_to_go[ytg * 101 + d] = _bucket_value(by_ytg, ytg) + _bucket_value(field_bonus, d)
+
+        late = go["late_game_bonus"]
+        self.late_game_half = late["half"]
+        self.late_game_blocks = late["max_blocks"]
+        self.late_game_leads = _lead_range(late["by_lead"])
+        lo, hi = self.late_game_leads
+        self.late_game_bonus = [_bucket_value(late["by_lead"], lead) for lead in range(lo, hi + 1)]
+
+        # Two-point try
+        two = data["two_point"]
+        self.two_point_blocks = two["max_blocks"]
+        self.two_point_leads = _lead_range(two["by_lead"])
+        lo, hi = self.two_point_leads
+        self.two_point = [_bucket_value(two["by_lead"], lead) for lead in range(lo, hi + 1)]
+
+        # End of half: [half][lead][distance] -> Choice of fg / go_for_it / end,
+        # from the in_range table within fg_range yards of the end zone
+        eoh = data["end_of_half"]
+        fg_range = eoh["fg_range"]
+        halves = [eoh[str(half)] for half in (1, 2)]
+        self.end_of_half_leads = _lead_range(*(h[key] for h in halves for key in ("in_range", "out_of_range")))
+        lo, hi = self.end_of_half_leads
+        self.end_of_half = []
+        for table in halves:
+            for lead in range(lo, hi + 1):
+                for d in distances:
+                    key = "in_range" if d <= fg_range else "out_of_range"
+                    probs = _bucket_value(_bucket_value(table[key], lead), d)
+                    self.end_of_half.append(make_choice({o: probs[o] for o in ("fg", "go_for_it", "end")}))
+
+    def end_of_half_index(self, distance: int, lead: int, half: int) -> int:
+        lo, hi = self.end_of_half_leads
+        lead = max(lo, min(hi, lead))
+        return ((half - 1) * (hi - lo + 1) + lead - lo) * 101 + distance
+
+def load_coach_tables(path: str = COACH_TABLES_FILE) -> CoachTables:
+    """Read and compile a coach tables file"""
+    with open(path) as f:
+        return CoachTables(json.load(f))
+
+def use_coach(coach: CoachTables) -> CoachTables:
+    """Install AI coach tables for the engine. Returns the previous ones."""
+    global COACH
+    previous = COACH
+    COACH = coach
+    return previous
+
+COACH = load_coach_tables()
+
+def two_point_probability(lead: int, blocks_left: int) -> float:
     """
-    Attempt extra point conversion after touchdown.
-    Returns: (points_scored, conversion_type) where conversion_type is "1pt" or "2pt"
+    Probability the AI goes for two after a touchdown.
+    lead is the score difference BEFORE the TD (TD not added yet).
 
-    AI Decision (late game, last 60 blocks):
+    Stock tables, late game (last 60 blocks):
     - Down by 8+: Go for 2 (70%) - to tie or get closer
     - Down by 7: Go for 2 (80%) - 2pt takes lead, 1pt only ties
     - Down by 6: Go for 1 (80%) - 1pt takes lead (safer than 2pt)
     - Otherwise: Go for 1 (safer, ~85% success)
     """
+    coach = COACH
+    if blocks_left <= coach.two_point_blocks:
+        lo, hi = coach.two_point_leads
+        return coach.two_point[(lo if lead < lo else hi if lead > hi else lead) - lo]
+    return 0.0
+
+def attempt_extra_point(team: str, score: Dict[str, int], blocks_left: int, half: int,
+                        rules: RuleSet = DEFAULT_RULES) -> tuple:
+    """
+    Attempt extra point conversion after touchdown.
+    Returns: (points_scored, conversion_type) where conversion_type is "1pt" or "2pt"
+
+    The AI decides between 1 and 2 using two_point_probability().
+    """
     opponent = "Gunners" if team == "Bombers" else "Bombers"
     lead = score[team] - score[opponent]  # Lead BEFORE the TD (TD not added yet)
+    return extra_point(lead, blocks_left, rules)
 
+def extra_point(lead: int, blocks_left: int, rules: RuleSet = DEFAULT_RULES) -> tuple:
+    """attempt_extra_point given the lead before the TD"""
     # Decide whether to go for 1 or 2
-    # After 6pt TD: lead_after = lead + 6
-    go_for_two = False
-
-    # Late in game (last 60 blocks) and strategic situations
-    if blocks_left <= 60:
-        if lead <= -8:  # Down by 8+: After TD down by 2+, 2pt ties or gets closer
-            go_for_two = random.random() < 0.70  # 70% chance to go for 2
-        elif lead == -7:  # Down by 7: After TD down by 1, 2pt TAKES LEAD (1pt only ties)
-            go_for_two = random.random() < 0.80  # 80% chance to go for 2
-        elif lead == -6:  # Down by 6: After TD tied, 1pt takes lead (safer)
-            go_for_two = random.random() < 0.20  # 20% chance, prefer safer 1pt
+    p_two = two_point_probability(lead, blocks_left)
+    go_for_two = DICE.chance(p_two, "go_for_two") if p_two > 0 else False
 
     if go_for_two:
         # Two-point conversion: d10 (1-10), success on 7+
-        roll = random.randint(1, 10)
+        roll = DICE.roll(10, "two_point")
         success = roll >= 7
         return (2 if success else 0), "2pt"
     else:
         # One-point conversion: use FG table, success if make distance >= 15
-        roll = random.randint(1, 20)
-        make_distance = FIELD_GOAL_DISTANCE[roll - 1]
+        roll = DICE.roll(20, "one_point")
+        make_distance = rules.field_goal_distance[roll - 1]
         success = make_distance >= 15
         return (1 if success else 0), "1pt"
 
-def check_turnover(style: str) -> bool:
+def check_turnover(style: str, rules: RuleSet = DEFAULT_RULES) -> bool:
     """
     Roll d20 (1-20) to check for turnover based on play style.
     Returns True if turnover occurs.
     """
-    turnover_roll = random.randint(1, 20)
-    return turnover_roll in TURNOVER_THRESHOLDS[style]
+    turnover_roll = DICE.roll(20, "turnover")
+    return turnover_roll in rules.turnover_rolls[style]
 
-def end_of_half_decision(team: str, x: int, score: Dict[str, int], opponent: str, half: int) -> str:
+def end_of_half_probabilities(distance: int, in_fg_range: bool, lead: int, half: int) -> Tuple[float, float, float]:
     """
-    AI decision for end-of-half untimed down.
-    Returns: "end", "fg", or "go_for_it"
+    AI probabilities for the end-of-half untimed down.
+    Returns: (prob_fg, prob_go_for_it, prob_end)
+    in_fg_range is implied by the distance; it's kept for existing callers.
 
-    Strategic considerations:
+    Strategic considerations (stock tables):
     - If in FG range with good distance: probably attempt FG
     - If trailing late in 2nd half: more aggressive (go for it)
     - If leading: let it end
     - First half: less aggressive overall
     """
-    lead = score[team] - score[opponent]
-    distance = yards_to_endzone(team, x)
-    in_fg_range = within_fg_range(team, x)
-
-    # Base probabilities
-    prob_fg = 0.0
-    prob_go_for_it = 0.0
-    prob_end = 1.0
-
-    if half == 1:
-        # First half - less aggressive
-        if in_fg_range:
-            if distance <= 25:
-                prob_fg = 0.70
-                prob_end = 0.25
-                prob_go_for_it = 0.05
-            elif distance <= 35:
-                prob_fg = 0.50
-                prob_end = 0.45
-                prob_go_for_it = 0.05
-            else:  # 36-50 yards
-                prob_fg = 0.30
-                prob_end = 0.65
-                prob_go_for_it = 0.05
-        else:
-            # Not in FG range
-            if distance <= 10:
-                prob_go_for_it = 0.20
-                prob_end = 0.80
-            else:
-                prob_end = 1.0
-    else:
-        # Second half - more aggressive based on score
-        if in_fg_range:
-            if lead < -2:  # Trailing by more than a FG
-                # More aggressive
-                if distance <= 25:
-                    prob_fg = 0.60
-                    prob_go_for_it = 0.30
-                    prob_end = 0.10
-                elif distance <= 35:
-                    prob_fg = 0.50
-                    prob_go_for_it = 0.30
-                    prob_end = 0.20
-                else:
-                    prob_fg = 0.30
-                    prob_go_for_it = 0.40
-                    prob_end = 0.30
-            elif lead < 0:  # Trailing by 1-3
-                if distance <= 25:
-                    prob_fg = 0.80
-                    prob_go_for_it = 0.10
-                    prob_end = 0.10
-                elif distance <= 35:
-                    prob_fg = 0.70
-                    prob_go_for_it = 0.15
-                    prob_end = 0.15
-                else:
-                    prob_fg = 0.50
-                    prob_go_for_it = 0.25
-                    prob_end = 0.25
-            else:  # Tied or leading
-                if distance <= 25:
-                    prob_fg = 0.85
-                    prob_end = 0.10
-                    prob_go_for_it = 0.05
-                elif distance <= 35:
-                    prob_fg = 0.70
-                    prob_end = 0.25
-                    prob_go_for_it = 0.05
-                else:
-                    prob_fg = 0.40
-                    prob_end = 0.55
-                    prob_go_for_it = 0.05
-        else:
-            # Not in FG range
-            if lead < -6:  # Trailing by more than a TD
-                if distance <= 15:
-                    prob_go_for_it = 0.60
-                    prob_end = 0.40
-                elif distance <= 25:
-                    prob_go_for_it = 0.35
-                    prob_end = 0.65
-                else:
-                    prob_go_for_it = 0.15
-                    prob_end = 0.85
-            elif lead < 0:  # Trailing
-                if distance <= 15:
-                    prob_go_for_it = 0.40
-                    prob_end = 0.60
-                else:
-                    prob_go_for_it = 0.15
-                    prob_end = 0.85
-            else:
-                # Leading or tied - let it end
-                prob_end = 1.0
-
-    # Make decision based on probabilities
-    r = random.random()
-    if r < prob_fg:
-        return "fg"
-    elif r < prob_fg + prob_go_for_it:
-        return "go_for_it"
+    return COACH.end_of_half[COACH.end_of_half_index(distance, lead, half)].probs
+
+def end_of_half_decision(team: str, x: int, score: Dict[str, int], opponent: str, half: int) -> str:
+    """
+    AI decision for end-of-half untimed down.
+    Returns: "end", "fg", or "go_for_it"
+    """
+    distance = (100 - x) if team == "Bombers" else x
+    return end_of_half_choice(distance, score[team] - score[opponent], half)
+
+def end_of_half_choice(distance: int, lead: int, half: int) -> str:
+    """end_of_half_decision from distance yards out"""
+    coach = COACH
+    # CoachTables.end_of_half_index, inlined for the hot path
+    lo, hi = coach.end_of_half_leads
+    lead = lo if lead < lo else hi if lead > hi else lead
+    index = ((half - 1) * (hi - lo + 1) + lead - lo) * 101 + distance
+    return DICE.choose(coach.end_of_half[index], "end_of_half")
+
+def go_for_it_probability(distance_to_goal: int, yards_to_go: int, fourth_and_goal: bool,
+                          lead: int, blocks_left: int, half: int) -> float:
+    """
+    AI probability of going for it on 4th down (yards_to_go already capped at the goal line).
+    A base rate for the distance (4th and goal) or yards to go, plus a
+    field-position bonus, plus a late-game bonus that depends on the lead.
+    """
+    coach = COACH
+    if fourth_and_goal:
+        go_for_it_prob = coach.go_for_it_goal[distance_to_goal]
     else:
-        return "end"
+        ytg = yards_to_go if yards_to_go < coach.yards_to_go_cap else coach.yards_to_go_cap
+        go_for_it_prob = coach.go_for_it_yards_to_go[ytg * 101 + distance_to_goal]
+
+    if half == coach.late_game_half and blocks_left <= coach.late_game_blocks:
+        lo, hi = coach.late_game_leads
+        go_for_it_prob += coach.late_game_bonus[(lo if lead < lo else hi if lead > hi else lead) - lo]
+
+    return go_for_it_prob
 
 def should_go_for_it(team: str, x: int, score: Dict[str, int], blocks_left: int, half: int, style: str, yards_gained: int) -> bool:
     """
@@ -296,9 +598,12 @@ def should_go_for_it(team: str, x: int, score: Dict[str, int], blocks_left: int,
     - Otherwise: roll based on style (d8 for run, d10 for balanced, d20 for pass)
     """
     opponent = "Gunners" if team == "Bombers" else "Bombers"
-    lead = score[team] - score[opponent]
-    distance_to_goal = yards_to_endzone(team, x)
+    return go_for_it_choice(yards_to_endzone(team, x), score[team] - score[opponent],
+                            blocks_left, half, style, yards_gained)
 
+def go_for_it_choice(distance_to_goal: int, lead: int, blocks_left: int, half: int, style: str,
+                     yards_gained: int) -> tuple:
+    """should_go_for_it from distance_to_goal yards out"""
     # Calculate yards to go based on yards gained
     if yards_gained < 10:
         # Short gain: need 10 yards total for first down
@@ -307,11 +612,11 @@ def should_go_for_it(team: str, x: int, score: Dict[str, int], blocks_left: int,
         # Gained 10+ yards: roll for distance based on play style
         # Run-first: d8 (1-8), Balanced: d10 (1-10), Pass-first: d20 (1-20)
         if style == "run":
-            yards_to_go = random.randint(1, 8)
+            yards_to_go = DICE.roll(8, "yards_to_go")
         elif style == "balanced":
-            yards_to_go = random.randint(1, 10)
+            yards_to_go = DICE.roll(10, "yards_to_go")
         else:  # pass
-            yards_to_go = random.randint(1, 20)
+            yards_to_go = DICE.roll(20, "yards_to_go")
 
     # If yards to go >= distance to goal, it's 4th and goal
     if yards_to_go >= distance_to_goal:
@@ -320,139 +625,117 @@ def should_go_for_it(team: str, x: int, score: Dict[str, int], blocks_left: int,
     else:
         fourth_and_goal = False
 
-    # Base probability to go for it
-    go_for_it_prob = 0.0
-
-    # 4th and goal situations - more aggressive
-    if fourth_and_goal:
-        if distance_to_goal <= 3:
-            go_for_it_prob = 0.60  # Very likely on 4th and goal from 3 or less
-        elif distance_to_goal <= 5:
-            go_for_it_prob = 0.40
-        else:
-            go_for_it_prob = 0.20
-    else:
-        # 4th and short
-        if yards_to_go <= 3:
-            go_for_it_prob = 0.30
-        elif yards_to_go <= 5:
-            go_for_it_prob = 0.15
-        else:
-            go_for_it_prob = 0.05
-
-    # Adjust based on field position
-    if distance_to_goal <= 20:  # In opponent's red zone
-        go_for_it_prob += 0.15
-    elif distance_to_goal <= 40:  # In opponent's territory
-        go_for_it_prob += 0.05
-
-    # Adjust based on game situation
-    if half == 2:  # Second half
-        if blocks_left <= 30:  # Last 5 minutes
-            if lead < -3:  # Trailing by more than a field goal
-                go_for_it_prob += 0.30
-            elif lead < 0:  # Trailing
-                go_for_it_prob += 0.15
-            elif lead <= 7:  # Close game
-                go_for_it_prob += 0.05
+    go_for_it_prob = go_for_it_probability(distance_to_goal, yards_to_go, fourth_and_goal, lead, blocks_left, half)
 
     # Random decision based on probability
-    return random.random() < go_for_it_prob, yards_to_go, fourth_and_goal
+    return DICE.chance(go_for_it_prob, "go_for_it"), yards_to_go, fourth_and_goal
 
-def attempt_fourth_down(team: str, x: int, yards_to_go: int, roll: int = None) -> tuple:
+def attempt_fourth_down(team: str, x: int, yards_to_go: int, roll: int = None,
+                        rules: RuleSet = DEFAULT_RULES) -> tuple:
     """
     Attempt a 4th down conversion using the d20 conversion table.
     Returns: (success: bool, yards_gained: int/str, is_td: bool, new_x: int, is_first_down: bool)
     """
+    tid = team_id(team)
+    success, yards_gained, is_td, new_pos, is_first_down = fourth_down_result(
+        to_relative(tid, x), yards_to_go, roll, rules)
+    return success, yards_gained, is_td, to_absolute(tid, new_pos), is_first_down
+
+def fourth_down_result(pos: int, yards_to_go: int, roll: int = None,
+                       rules: RuleSet = DEFAULT_RULES) -> tuple:
+    """attempt_fourth_down in the offense's frame (returns new_pos)"""
     # Use provided roll or roll d20 for attempt (1-20)
     if roll is None:
-        roll = random.randint(1, 20)
-    result = FOURTH_DOWN_CONVERSION[roll - 1]
+        roll = DICE.roll(20, "fourth_down")
 
     # All results are numeric yards now (max 50)
-    yards_gained = result
-    new_x = advance(team, x, yards_gained)
+    yards_gained = rules.fourth_down_conversion[roll - 1]
+    new_pos = pos + yards_gained if pos + yards_gained < 100 else 100
 
     # Check if yards gained reaches end zone
-    if is_td_yardage(team, new_x):
-        return True, yards_gained, True, new_x, False
+    if new_pos >= 100:
+        return True, yards_gained, True, new_pos, False
 
     # Check for first down (yards_gained >= yards_to_go)
     if yards_gained >= yards_to_go:
         # Successful conversion - first down, continue drive
-        return True, yards_gained, False, new_x, True
+        return True, yards_gained, False, new_pos, True
     else:
         # Failed conversion - turnover on downs
-        return False, yards_gained, False, new_x, False
+        return False, yards_gained, False, new_pos, False
 
-def punt_spot(offense: str, x: int) -> int:
+def punt_spot(offense: str, x: int, rules: RuleSet = DEFAULT_RULES) -> int:
     # Punt goes 40 toward opponent goal; touchback puts receiving team at their 20
-    if offense == "Bombers":
-        raw = x + PUNT_YARDS
-        return 80 if raw >= 100 else raw
-    else:
-        raw = x - PUNT_YARDS
-        return 20 if raw <= 0 else raw
+    tid = team_id(offense)
+    return to_absolute(tid, punt_pos(to_relative(tid, x), rules))
+
+def punt_pos(pos: int, rules: RuleSet = DEFAULT_RULES) -> int:
+    """punt_spot in the punting team's frame"""
+    raw = pos + rules.punt_yards
+    return OPP_20_POS if raw >= 100 else raw
 
-def missed_fg_spot(offense: str, x: int) -> int:
+def missed_fg_spot(offense: str, x: int, rules: RuleSet = DEFAULT_RULES) -> int:
     # After a missed FG, move ball back 7 yards from the attempt line
     # Then receiving team starts at that spot UNLESS it's inside their 20, then at their 20.
-    if offense == "Bombers":
-        new_spot = max(0, x - 7)  # move back toward Bombers' goal
-        # Receiving = Gunners (own 20 is x=80)
-        return 80 if new_spot > 80 else new_spot
-    else:
-        new_spot = min(100, x + 7)  # move back toward Gunners' goal
-        # Receiving = Bombers (own 20 is x=20)
-        return 20 if new_spot < 20 else new_spot
+    tid = team_id(offense)
+    return to_absolute(tid, missed_fg_pos(to_relative(tid, x), rules))
+
+def missed_fg_pos(pos: int, rules: RuleSet = DEFAULT_RULES) -> int:
+    """missed_fg_spot in the kicking team's frame"""
+    new_pos = max(0, pos - rules.missed_fg_backup)
+    return OPP_20_POS if new_pos > OPP_20_POS else new_pos
 
-def time_for_required_yards(style: str, yards_needed: int) -> int:
+def time_for_required_yards(style: str, yards_needed: int, rules: RuleSet = DEFAULT_RULES) -> int:
     """
     For TD time-capping rule:
     Find the smallest non-TD row with yards >= yards_needed; return its time.
     If none, return the largest non-TD time for that style.
+    (Precompiled per rule set for 0..100 yards.)
     """
-    rows = TABLES[style]
-    candidates = [t for (y,t) in rows if y != "TD"]
-    # rows are in order of roll; pick the first where yards >= needed:
-    for y, t in rows:
-        if y == "TD":
-            continue
-        if y >= yards_needed:
-            return t
-    # if none large enough, use the last non-TD time:
-    return candidates[-1]
+    if 0 <= yards_needed <= 100:
+        return rules.td_time_caps[style][yards_needed]
+    return _td_time_cap(rules.tables[style], yards_needed)
+
+def td_time_roll(style: str, yards_needed: int, rules: RuleSet = DEFAULT_RULES) -> Tuple[int,int]:
+    """The raw 1d20 TD time and its cap (time_for_required_yards)"""
+    return DICE.roll(20, "td_time"), time_for_required_yards(style, yards_needed, rules)
 
-def roll_time_for_td(style: str, yards_needed: int) -> int:
+def roll_time_for_td(style: str, yards_needed: int, rules: RuleSet = DEFAULT_RULES) -> int:
     # 1d20 time with cap by time_for_required_yards
-    raw = random.randint(1, 20)
-    cap = time_for_required_yards(style, yards_needed)
+    raw, cap = td_time_roll(style, yards_needed, rules)
     return min(raw, cap)
 
 def choose_style(team: str, lead: int, blocks_left_in_half: int) -> str:
     """
-    A simple 'AI coach':
+    A simple 'AI coach' (stock tables):
     - If trailing and <= 60 blocks (~10 min): more pass
     - If leading and <= 60 blocks: more run
     - Else: balanced bias
     """
-    if blocks_left_in_half <= 60:
-        if lead < 0:  # trailing
-            weights = {"pass": 0.55, "balanced": 0.35, "run": 0.10}
-        elif lead > 0:  # leading
-            weights = {"run": 0.50, "balanced": 0.40, "pass": 0.10}
-        else:  # tied late
-            weights = {"pass": 0.40, "balanced": 0.45, "run": 0.15}
+    coach = COACH
+    if blocks_left_in_half <= coach.style_late_blocks:
+        # trailing / tied late / leading
+        choice = coach.style[2 + (lead > 0) - (lead < 0)]
     else:
-        weights = {"balanced": 0.5, "pass": 0.30, "run": 0.20}
-
-    r = random.random()
-    cum = 0
-    for s, w in weights.items():
-        cum += w
-        if r <= cum:
-            return s
-    return "balanced"
+        choice = coach.style[0]
+    return DICE.choose(choice, "style")
+
+# Per-team game stats (the bot's GameState.stats counters), kept as one flat
+# list per game: stats[team_id * NUM_STATS + STAT_x]. Yards and time are the
+# drive's logged yards and time blocks; safeties count as turnovers.
+STAT_NAMES = ("yards", "possessions", "time_of_possession", "fgs_made", "fgs_missed", "punts", "turnovers")
+(STAT_YARDS, STAT_POSSESSIONS, STAT_TIME_OF_POSSESSION, STAT_FGS_MADE,
+ STAT_FGS_MISSED, STAT_PUNTS, STAT_TURNOVERS) = range(len(STAT_NAMES))
+NUM_STATS = len(STAT_NAMES)
+
+def new_stats() -> List[int]:
+    """Zeroed stat counters for both teams"""
+    return [0] * (2 * NUM_STATS)
+
+def team_stats(stats: List[int], team: str) -> Dict[str, int]:
+    """One team's counters as a {stat name: value} dict"""
+    base = team_id(team) * NUM_STATS
+    return dict(zip(STAT_NAMES, stats[base:base + NUM_STATS]))
 
 @dataclass
 class DriveLog:
@@ -471,372 +754,913 @@ class DriveLog:
 class GameResult:
     drives: List[DriveLog] = field(default_factory=list)
     score: Dict[str, int] = field(default_factory=lambda: {"Bombers":0, "Gunners":0})
+    stats: List[int] = field(default_factory=new_stats)
+
+    def team_stats(self, team: str) -> Dict[str, int]:
+        return team_stats(self.stats, team)
 
-def play_drive(team: str, opponent: str, x: int, style: str, blocks_left: int, half: int, score) -> Tuple[DriveLog, int, Optional[str], int]:
+def play_drive(team: str, opponent: str, x: int, style: str, blocks_left: int, half: int, score,
+               rules: RuleSet = DEFAULT_RULES) -> Tuple[DriveLog, int, Optional[str], int]:
     """
     Returns: (DriveLog, blocks_spent, next_possession_team, next_start_x)
     If next_possession_team is None, same team continues (shouldn't happen in this possession-based design).
     """
+    DICE.start_drive(team, x, blocks_left, half, score)
+    tid = team_id(team)
+    roll, yards, time_blocks, end_pos, result, points, safety, spent, keep, next_pos, _ = resolve_drive(
+        to_relative(tid, x), style, blocks_left, half, score[team] - score[opponent], rules)
+    log = DriveLog(half, team, x, style, roll, yards, time_blocks, to_absolute(tid, end_pos), result, points)
+    score[team] += points
+    score[opponent] += safety
+    return log, spent, (team if keep else opponent), to_absolute(tid, next_pos)
+
+def resolve_drive(pos: int, style: str, blocks_left: int, half: int, lead: int,
+                  rules: RuleSet = DEFAULT_RULES) -> tuple:
+    """
+    The drive kernel: play_drive in the offense's frame.
+    pos is yards from the offense's own goal line, lead the offense's lead.
+    Returns: (roll, yards, time_blocks, end_pos, result, points, safety_points,
+              blocks_spent, offense_keeps_ball, next_pos, tally)
+    end_pos and next_pos are in the offense's frame too; safety_points go to
+    the defense; tally is the offense's STAT_* counter the drive bumps (FG
+    made/missed, punt, turnover) or None. Draws dice in exactly the order
+    play_drive always has.
+    """
     # Roll 1d20 (1-20) on the chosen table
-    roll = random.randint(1, 20)
-    y, t = TABLES[style][roll - 1]
+    roll = DICE.roll(20, "drive")
+    y, t = rules.tables[style][roll - 1]
 
     # Roll for turnover
-    turnover_occurred = check_turnover(style)
+    turnover_occurred = check_turnover(style, rules)
 
     # If TD row:
     if y == "TD":
-        yards_needed = yards_to_endzone(team, x)
-        time_spent = roll_time_for_td(style, yards_needed)
+        yards_needed = 100 - pos
+        time_spent = roll_time_for_td(style, yards_needed, rules)
         # Late-half enforcement:
         if time_spent > blocks_left:
-            # Step back: find largest row that leaves >=1 block
-            adj_y, adj_t = largest_fitting_row(style, blocks_left)
-            # Apply adjusted row:
-            end_x = advance(team, x, adj_y)
-            # Check for safety BEFORE checking turnover or TD
-            if is_safety(team, end_x):
-                # Safety: opponent gets 2 points and ball at their 30
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Safety (late-half)", 0)
-                score[opponent] += 2
-                return log, blocks_left, opponent, kickoff_position(opponent)
-            # Check for turnover BEFORE resolving TD (late-half adjusted)
-            if turnover_occurred:
-                # Check if this would have been a TD
-                if is_td_yardage(team, end_x):
-                    # Would have been TD - opponent gets ball at their 20
-                    opponent_20 = 20 if opponent == "Bombers" else 80
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, opponent_20, "Turnover (late-half, would be TD)", 0)
-                    return log, blocks_left, opponent, opponent_20
-                else:
-                    # Not a TD - regular turnover
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Turnover (late-half)", 0)
-                    return log, blocks_left, opponent, end_x
-            # No turnover - check if adjusted yardage is a TD
-            if is_td_yardage(team, end_x):
-                # TD and end half immediately
-                # Award 6 for TD plus extra point attempt
-                extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-                total_pts = 6 + extra_pts
-                result_str = f"TD+{conv_type} (late-half adj)"
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, result_str, total_pts)
-                score[team] += total_pts
-                return log, blocks_left, opponent, kickoff_position(opponent)  # half ends by caller when it sees 0 left
-            # End of half - player can choose to let it end, attempt FG, or go for it
-            decision = end_of_half_decision(team, end_x, score, opponent, half)
-            if decision == "end":
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Half Ends (untimed down declined)", 0)
-                return log, blocks_left, opponent, end_x
-            elif decision == "fg":
-                if within_fg_range(team, end_x):
-                    fg_good = attempt_field_goal(team, end_x)
-                    if fg_good:
-                        log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "FG Good (untimed down)", 3)
-                        score[team] += 3
-                    else:
-                        miss_spot = missed_fg_spot(team, end_x)
-                        log = DriveLog(half, team, x, style, roll, adj_y, adj_t, miss_spot, "FG Miss (untimed down)", 0)
-                    return log, blocks_left, opponent, kickoff_position(opponent)
-                else:
-                    # Can't kick FG if not in range - treat as end
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Half Ends (untimed down declined)", 0)
-                    return log, blocks_left, opponent, end_x
-            else:  # go_for_it
-                # Calculate yards to goal (this is like 4th and goal from current position)
-                distance_to_goal = yards_to_endzone(team, end_x)
-                success, yards_gained, is_td, new_x, is_first_down = attempt_fourth_down(team, end_x, distance_to_goal)
-
-                if is_td:
-                    # TD on untimed down - award 6 plus extra point attempt
-                    extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-                    total_pts = 6 + extra_pts
-                    result_str = f"Untimed TD+{conv_type}"
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, new_x, result_str, total_pts)
-                    score[team] += total_pts
-                    return log, blocks_left, opponent, kickoff_position(opponent)
-                else:
-                    # Failed untimed down attempt - half ends
-                    result_str = "Untimed down failed"
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, new_x, result_str, 0)
-                    return log, blocks_left, opponent, new_x
-
-        # TD fits in time:
-        end_x = 100 if team == "Bombers" else 0
-        yards_gained = yards_to_endzone(team, x)
-
-        # Check for turnover
+            return _late_half_drive(roll, pos, style, blocks_left, half, lead, turnover_occurred, rules)
+
+        # TD fits in time. Check for turnover
         if turnover_occurred:
             # Turnover on TD: opponent gets ball at their 20
-            opponent_20 = 20 if opponent == "Bombers" else 80
-            log = DriveLog(half, team, x, style, roll, yards_gained, time_spent, opponent_20, "Turnover (would be TD)", 0)
-            return log, time_spent, opponent, opponent_20
+            return (roll, yards_needed, time_spent, OPP_20_POS, "Turnover (would be TD)", 0, 0,
+                    time_spent, False, OPP_20_POS, STAT_TURNOVERS)
 
         # Award 6 for TD plus extra point attempt
-        extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-        total_pts = 6 + extra_pts
-        result_str = f"TD+{conv_type}"
-        log = DriveLog(half, team, x, style, roll, yards_gained, time_spent, end_x, result_str, total_pts)
-        score[team] += total_pts
-        return log, time_spent, opponent, kickoff_position(opponent)
-
-    # Non-TD row
-    time_spent = t
-    yards = y
-
-    # Late-half enforcement if it would overflow:
-    if time_spent > blocks_left:
-        # Use largest row that leaves >=1 block
-        adj_y, adj_t = largest_fitting_row(style, blocks_left)
-        end_x = advance(team, x, adj_y)
-        # Check for safety BEFORE checking turnover or TD
-        if is_safety(team, end_x):
-            # Safety: opponent gets 2 points and ball at their 30
-            log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Safety (late-half)", 0)
-            score[opponent] += 2
-            return log, blocks_left, opponent, kickoff_position(opponent)
-        # Check for turnover BEFORE resolving TD (late-half non-TD row)
-        if turnover_occurred:
-            # Check if this would have been a TD
-            if is_td_yardage(team, end_x):
-                # Would have been TD - opponent gets ball at their 20
-                opponent_20 = 20 if opponent == "Bombers" else 80
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, opponent_20, "Turnover (late-half, would be TD)", 0)
-                return log, blocks_left, opponent, opponent_20
-            else:
-                # Not a TD - regular turnover
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Turnover (late-half)", 0)
-                return log, blocks_left, opponent, end_x
-        # No turnover - check if adjusted row reaches TD
-        if is_td_yardage(team, end_x):
-            # Award 6 for TD plus extra point attempt
-            extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-            total_pts = 6 + extra_pts
-            result_str = f"TD+{conv_type} (late-half adj)"
-            log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, result_str, total_pts)
-            score[team] += total_pts
-            return log, blocks_left, opponent, kickoff_position(opponent)  # half ends
-        # End of half - player can choose to let it end, attempt FG, or go for it
-        decision = end_of_half_decision(team, end_x, score, opponent, half)
-        if decision == "end":
-            log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Half Ends (untimed down declined)", 0)
-            return log, blocks_left, opponent, end_x
-        elif decision == "fg":
-            if within_fg_range(team, end_x):
-                fg_good = attempt_field_goal(team, end_x)
-                if fg_good:
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "FG Good (untimed down)", 3)
-                    score[team] += 3
-                else:
-                    miss_spot = missed_fg_spot(team, end_x)
-                    log = DriveLog(half, team, x, style, roll, adj_y, adj_t, miss_spot, "FG Miss (untimed down)", 0)
-                return log, blocks_left, opponent, kickoff_position(opponent)
-            else:
-                # Can't kick FG if not in range - treat as end
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, end_x, "Half Ends (untimed down declined)", 0)
-                return log, blocks_left, opponent, end_x
-        else:  # go_for_it
-            # Calculate yards to goal (this is like 4th and goal from current position)
-            distance_to_goal = yards_to_endzone(team, end_x)
-            success, yards_gained, is_td, new_x, is_first_down = attempt_fourth_down(team, end_x, distance_to_goal)
+        extra_pts, conv_type = extra_point(lead, blocks_left, rules)
+        return (roll, yards_needed, time_spent, 100, f"TD+{conv_type}", 6 + extra_pts, 0,
+                time_spent, False, OPP_KICKOFF_POS, None)
 
-            if is_td:
-                # TD on untimed down - award 6 plus extra point attempt
-                extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-                total_pts = 6 + extra_pts
-                result_str = f"Untimed TD+{conv_type}"
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, new_x, result_str, total_pts)
-                score[team] += total_pts
-                return log, blocks_left, opponent, kickoff_position(opponent)
-            else:
-                # Failed untimed down attempt - half ends
-                result_str = "Untimed down failed"
-                log = DriveLog(half, team, x, style, roll, adj_y, adj_t, new_x, result_str, 0)
-                return log, blocks_left, opponent, new_x
+    # Non-TD row. Late-half enforcement if it would overflow:
+    if t > blocks_left:
+        return _late_half_drive(roll, pos, style, blocks_left, half, lead, turnover_occurred, rules)
 
     # Fits in time -> resolve normally
-    end_x = advance(team, x, yards)
+    end_pos = pos + y if pos + y < 100 else 100
 
     # Check for safety BEFORE checking turnover
-    if is_safety(team, end_x):
+    if end_pos <= 0:
         # Safety: opponent gets 2 points and ball at their 30
-        log = DriveLog(half, team, x, style, roll, yards, time_spent, end_x, "Safety", 0)
-        score[opponent] += 2
-        return log, time_spent, opponent, kickoff_position(opponent)
+        return roll, y, t, end_pos, "Safety", 0, 2, t, False, OPP_KICKOFF_POS, STAT_TURNOVERS
 
     # Check for turnover BEFORE resolving TD
     # But if it would have been a TD, use TD time
     if turnover_occurred:
-        # Check if this would have been a TD
-        if is_td_yardage(team, end_x):
+        if end_pos >= 100:
             # Would have been TD - use TD time, opponent gets ball at their 20
-            yards_needed = yards_to_endzone(team, x)
-            td_time = roll_time_for_td(style, yards_needed)
-            time_spent = min(time_spent, td_time)
-            opponent_20 = 20 if opponent == "Bombers" else 80
-            log = DriveLog(half, team, x, style, roll, yards_needed, time_spent, opponent_20, "Turnover (would be TD)", 0)
-            return log, time_spent, opponent, opponent_20
-        else:
-            # Not a TD - regular turnover, use regular time
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, end_x, "Turnover", 0)
-            return log, time_spent, opponent, end_x
+            yards_needed = 100 - pos
+            time_spent = min(t, roll_time_for_td(style, yards_needed, rules))
+            return (roll, yards_needed, time_spent, OPP_20_POS, "Turnover (would be TD)", 0, 0,
+                    time_spent, False, OPP_20_POS, STAT_TURNOVERS)
+        # Not a TD - regular turnover, use regular time
+        return roll, y, t, end_pos, "Turnover", 0, 0, t, False, end_pos, STAT_TURNOVERS
 
     # No turnover - check for TD
-    if is_td_yardage(team, end_x):
+    if end_pos >= 100:
         # time cap by "required yards" row
-        yards_needed = yards_to_endzone(team, x)
-        td_time = roll_time_for_td(style, yards_needed)
-        time_spent = min(time_spent, td_time)
-        end_x_td = 100 if team == "Bombers" else 0
-
-        # Award 6 for TD plus extra point attempt
-        extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-        total_pts = 6 + extra_pts
-        result_str = f"TD+{conv_type} (by yardage)"
-        log = DriveLog(half, team, x, style, roll, yards_needed, time_spent, end_x_td, result_str, total_pts)
-        score[team] += total_pts
-        return log, time_spent, opponent, kickoff_position(opponent)
+        yards_needed = 100 - pos
+        time_spent = min(t, roll_time_for_td(style, yards_needed, rules))
+        extra_pts, conv_type = extra_point(lead, blocks_left, rules)
+        return (roll, yards_needed, time_spent, 100, f"TD+{conv_type} (by yardage)", 6 + extra_pts, 0,
+                time_spent, False, OPP_KICKOFF_POS, None)
 
     # 4th down decision (only if no turnover)
     # Pass yards gained to determine 4th down distance
-    go_for_it, yards_to_go, is_4th_and_goal = should_go_for_it(team, end_x, score, blocks_left, half, style, yards)
+    go_for_it, yards_to_go, is_4th_and_goal = go_for_it_choice(100 - end_pos, lead, blocks_left, half, style, y)
 
     if go_for_it:
         # Attempt 4th down conversion
-        success, yards_gained, is_td, new_x, is_first_down = attempt_fourth_down(team, end_x, yards_to_go)
+        success, yards_gained, is_td, new_pos, is_first_down = fourth_down_result(end_pos, yards_to_go, None, rules)
+        distance = 'goal' if is_4th_and_goal else yards_to_go
 
         if is_td:
             # Touchdown on 4th down attempt
-            # Award 6 for TD plus extra point attempt
-            extra_pts, conv_type = attempt_extra_point(team, score, blocks_left, half)
-            total_pts = 6 + extra_pts
-            result_str = f"4th down TD+{conv_type} ({'goal' if is_4th_and_goal else yards_to_go})"
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, new_x, result_str, total_pts)
-            score[team] += total_pts
-            return log, time_spent, opponent, kickoff_position(opponent)
+            extra_pts, conv_type = extra_point(lead, blocks_left, rules)
+            return (roll, y, t, new_pos, f"4th down TD+{conv_type} ({distance})", 6 + extra_pts, 0,
+                    t, False, OPP_KICKOFF_POS, None)
         elif is_first_down:
-            # Successful conversion - first down, drive continues with new style
-            result_str = f"4th down conversion ({'goal' if is_4th_and_goal else yards_to_go})"
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, new_x, result_str, 0)
-            # Same team keeps ball at new position for fresh drive
-            return log, time_spent, team, new_x
+            # Successful conversion - same team keeps ball at new position for fresh drive
+            return roll, y, t, new_pos, f"4th down conversion ({distance})", 0, 0, t, True, new_pos, None
         else:
             # Failed 4th down conversion - turnover on downs
-            result_str = f"4th down failed ({'goal' if is_4th_and_goal else yards_to_go})"
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, new_x, result_str, 0)
-            return log, time_spent, opponent, new_x
+            return roll, y, t, new_pos, f"4th down failed ({distance})", 0, 0, t, False, new_pos, None
 
     # Not going for it - normal FG/Punt decision
-    if within_fg_range(team, end_x):
-        fg_good = attempt_field_goal(team, end_x)
-        if fg_good:
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, end_x, "FG Good", 3)
-            score[team] += 3
-            return log, time_spent, opponent, kickoff_position(opponent)
-        else:
-            # missed FG: move back 7, clamp at receiving 20
-            miss_spot = missed_fg_spot(team, end_x)
-            log = DriveLog(half, team, x, style, roll, yards, time_spent, miss_spot, "FG Miss (spot set)", 0)
-            return log, time_spent, opponent, miss_spot
-    else:
-        # Punt
-        spot = punt_spot(team, end_x)
-        log = DriveLog(half, team, x, style, roll, yards, time_spent, spot, "Punt", 0)
-        return log, time_spent, opponent, spot
+    if end_pos >= 50:  # within_fg_range
+        if field_goal_good(100 - end_pos, rules):
+            return roll, y, t, end_pos, "FG Good", 3, 0, t, False, OPP_KICKOFF_POS, STAT_FGS_MADE
+        # missed FG: move back 7, clamp at receiving 20
+        miss_pos = missed_fg_pos(end_pos, rules)
+        return roll, y, t, miss_pos, "FG Miss (spot set)", 0, 0, t, False, miss_pos, STAT_FGS_MISSED
+
+    # Punt
+    spot = punt_pos(end_pos, rules)
+    return roll, y, t, spot, "Punt", 0, 0, t, False, spot, STAT_PUNTS
+
+def _late_half_drive(roll: int, pos: int, style: str, blocks_left: int, half: int, lead: int,
+                     turnover_occurred: bool, rules: RuleSet) -> tuple:
+    """
+    resolve_drive when the rolled row (TD or not) overflows the clock:
+    use the largest row that leaves >= 1 block, then the untimed down.
+    Every branch spends the rest of the half.
+    """
+    adj_y, adj_t = largest_fitting_row(style, blocks_left, rules)
+    end_pos = pos + adj_y if pos + adj_y < 100 else 100
+
+    # Check for safety BEFORE checking turnover or TD
+    if end_pos <= 0:
+        # Safety: opponent gets 2 points and ball at their 30
+        return (roll, adj_y, adj_t, end_pos, "Safety (late-half)", 0, 2,
+                blocks_left, False, OPP_KICKOFF_POS, STAT_TURNOVERS)
 
-def largest_fitting_row(style: str, blocks_left: int) -> Tuple[int,int]:
+    # Check for turnover BEFORE resolving TD
+    if turnover_occurred:
+        if end_pos >= 100:
+            # Would have been TD - opponent gets ball at their 20
+            return (roll, adj_y, adj_t, OPP_20_POS, "Turnover (late-half, would be TD)", 0, 0,
+                    blocks_left, False, OPP_20_POS, STAT_TURNOVERS)
+        # Not a TD - regular turnover
+        return (roll, adj_y, adj_t, end_pos, "Turnover (late-half)", 0, 0,
+                blocks_left, False, end_pos, STAT_TURNOVERS)
+
+    # No turnover - check if adjusted row reaches TD
+    if end_pos >= 100:
+        # TD and end half immediately (caller sees 0 blocks left)
+        extra_pts, conv_type = extra_point(lead, blocks_left, rules)
+        return (roll, adj_y, adj_t, end_pos, f"TD+{conv_type} (late-half adj)", 6 + extra_pts, 0,
+                blocks_left, False, OPP_KICKOFF_POS, None)
+
+    # End of half - player can choose to let it end, attempt FG, or go for it
+    decision = end_of_half_choice(100 - end_pos, lead, half)
+    if decision == "fg" and end_pos >= 50:  # can't kick FG if not in range - treated as end
+        if field_goal_good(100 - end_pos, rules):
+            return (roll, adj_y, adj_t, end_pos, "FG Good (untimed down)", 3, 0,
+                    blocks_left, False, OPP_KICKOFF_POS, STAT_FGS_MADE)
+        miss_pos = missed_fg_pos(end_pos, rules)
+        return (roll, adj_y, adj_t, miss_pos, "FG Miss (untimed down)", 0, 0,
+                blocks_left, False, OPP_KICKOFF_POS, STAT_FGS_MISSED)
+    if decision == "go_for_it":
+        # Like 4th and goal from current position
+        success, yards_gained, is_td, new_pos, is_first_down = fourth_down_result(
+            end_pos, 100 - end_pos, DICE.roll(20, "untimed_down"), rules)
+        if is_td:
+            # TD on untimed down - award 6 plus extra point attempt
+            extra_pts, conv_type = extra_point(lead, blocks_left, rules)
+            return (roll, adj_y, adj_t, new_pos, f"Untimed TD+{conv_type}", 6 + extra_pts, 0,
+                    blocks_left, False, OPP_KICKOFF_POS, None)
+        # Failed untimed down attempt - half ends
+        return roll, adj_y, adj_t, new_pos, "Untimed down failed", 0, 0, blocks_left, False, new_pos, None
+    return (roll, adj_y, adj_t, end_pos, "Half Ends (untimed down declined)", 0, 0,
+            blocks_left, False, end_pos, None)
+
+def largest_fitting_row(style: str, blocks_left: int, rules: RuleSet = DEFAULT_RULES) -> Tuple[int,int]:
     """
     Find the non-TD row with the largest time <= blocks_left-1 (leave >= 1 block).
     If none fit (e.g., blocks_left == 1), return (0,0).
+    (Precompiled per rule set.)
     """
-    limit = max(0, blocks_left - 1)
-    best = (0, 0)
-    for (y, t) in TABLES[style]:
-        if y == "TD":
-            continue
-        if t <= limit and t >= best[1]:
-            best = (y, t)
-    return best
+    rows = rules.fitting_rows[style]
+    return rows[max(0, blocks_left)] if blocks_left < len(rows) else rows[-1]
 
 def is_td_yardage(team: str, x: int) -> bool:
     return (x >= 100) if team == "Bombers" else (x <= 0)
 
-def simulate_half(start_team: str, start_x: int, score: Dict[str,int], half: int, rng_seed=None) -> Tuple[List[DriveLog], Dict[str,int], str, int]:
+# Drive results of a played untimed down
+UNTIMED_DOWN_RESULTS = frozenset([
+    "FG Good (untimed down)", "FG Miss (untimed down)",
+    "Untimed TD+1pt", "Untimed TD+2pt", "Untimed down failed",
+])
+# Drive results after which the half is over, whatever the clock says
+HALF_ENDING_RESULTS = UNTIMED_DOWN_RESULTS | {"Half Ends (untimed down declined)"}
+
+def simulate_half(start_team: str, start_x: int, score: Dict[str,int], half: int, rng_seed=None,
+                  rules: RuleSet = DEFAULT_RULES, stats: Optional[List[int]] = None
+                  ) -> Tuple[List[DriveLog], Dict[str,int], str, int]:
+    """stats, if given, is a new_stats() list the half's team stats are added to"""
     drives = []
-    team = start_team
-    opponent = "Gunners" if team == "Bombers" else "Bombers"
-    x = start_x
-    blocks = BLOCKS_PER_HALF
+    append = drives.append
+    if stats is None:
+        stats = new_stats()
+    # Int team id + offense-relative position; names and absolute x only for the logs
+    tid = team_id(start_team)
+    pos = to_relative(tid, start_x)
+    blocks = rules.blocks_per_half
+    stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
 
     while blocks > 0:
+        team = TEAMS[tid]
+        opponent = TEAMS[1 - tid]
         lead = score[team] - score[opponent]
         style = choose_style(team, lead, blocks)
-        log, spent, next_team, next_x = play_drive(team, opponent, x, style, blocks, half, score)
-        drives.append(log)
-
-        # deduct time:
-        # If late-half branch consumed "blocks_left" (we passed blocks_left in play_drive),
-        # we ensure the half ends right after recording the drive:
-        if (log.result.startswith("TD (late-half") or
-            log.result.startswith("FG Good (late-half)") or
-            log.result.startswith("FG Miss (late-half") or
-            log.result == "Half Ends (adj)" or
-            log.result.startswith("FG Good (untimed down)") or
-            log.result.startswith("FG Miss (untimed down)") or
-            log.result.startswith("Untimed TD+") or
-            log.result == "Untimed down failed" or
-            log.result == "Half Ends (untimed down declined)"):
-            # end half immediately after applying the adjustment
+        x = pos if tid == BOMBERS else 100 - pos
+        DICE.start_drive(team, x, blocks, half, score)
+        roll, yards, time_blocks, end_pos, result, points, safety, spent, keep, next_pos, tally = resolve_drive(
+            pos, style, blocks, half, lead, rules)
+        append(DriveLog(half, team, x, style, roll, yards, time_blocks,
+                        end_pos if tid == BOMBERS else 100 - end_pos, result, points))
+        if points:
+            score[team] += points
+        if safety:
+            score[opponent] += safety
+        base = tid * NUM_STATS
+        stats[base] += yards
+        stats[base + STAT_TIME_OF_POSSESSION] += time_blocks
+        if tally is not None:
+            stats[base + tally] += 1
+
+        # Untimed-down results end the half right after recording the drive;
+        # the other late-half results spend all remaining blocks
+        if result in HALF_ENDING_RESULTS:
             blocks = 0
             break
-        else:
-            blocks -= spent
+        blocks -= spent
 
-        # possession flips:
-        team = next_team
-        opponent = "Gunners" if team == "Bombers" else "Bombers"
-        x = next_x
+        # possession flips (next_pos is in the old offense's frame):
+        if keep:
+            pos = next_pos
+        else:
+            tid = 1 - tid
+            pos = 100 - next_pos
+            if blocks > 0:
+                stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
 
     # Return next half's opening possession:
     # The team that kicked off to start the half will receive next half (handled by caller).
-    return drives, score, team, x
+    return drives, score, TEAMS[tid], to_absolute(tid, pos)
 
-def simulate_game(seed: Optional[int]=SEED) -> GameResult:
+def simulate_game(seed: Optional[int]=SEED, rules: RuleSet = DEFAULT_RULES) -> GameResult:
     if seed is not None:
         random.seed(seed)
     else:
         random.seed()
+    return play_game(rules)
 
+def play_game(rules: RuleSet = DEFAULT_RULES) -> GameResult:
+    """Play one game with whatever dice are installed, without reseeding"""
     result = GameResult()
 
     # First half: Bombers receive at B30
     score = {"Bombers": 0, "Gunners": 0}
-    h1_drives, score, _, _ = simulate_half("Bombers", 30, score, half=1)
+    h1_drives, score, _, _ = simulate_half("Bombers", 30, score, half=1, rules=rules, stats=result.stats)
     result.drives.extend(h1_drives)
 
     # Second half: Gunners receive at G30 => x=70
-    h2_drives, score, _, _ = simulate_half("Gunners", 70, score, half=2)
+    h2_drives, score, _, _ = simulate_half("Gunners", 70, score, half=2, rules=rules, stats=result.stats)
     result.drives.extend(h2_drives)
 
     result.score = score
     return result
 
-def simulate_many(n: int=100, seed: Optional[int]=SEED) -> Dict[str, float]:
-    if seed is not None:
-        random.seed(seed)
-    totals = {"Bombers":0, "Gunners":0, "ties":0, "avg_pts":0.0}
-    for _ in range(n):
-        gr = simulate_game(seed=None)
-        b, g = gr.score["Bombers"], gr.score["Gunners"]
-        totals["avg_pts"] += (b + g)
-        if b > g:
-            totals["Bombers"] += 1
-        elif g > b:
-            totals["Gunners"] += 1
+# -----------------------------
+# Score-only games
+# play_game without the logs: no DriveLog, GameResult or score dict, just
+# the drive kernel and a two-slot score list. Same dice in the same order,
+# so for the same seed it ends with exactly simulate_game's score.
+# -----------------------------
+
+def _play_half_scores(tid: int, pos: int, score: List[int], half: int, rules: RuleSet,
+                      stats: Optional[List[int]]) -> int:
+    """simulate_half into score (indexed by team id) and stats; returns the number of drives"""
+    # Only dice that override start_drive (e.g. TiltedDice) need the drive context
+    dice = DICE
+    hooked = type(dice).start_drive is not Dice.start_drive
+    drives = 0
+    blocks = rules.blocks_per_half
+    if stats is not None:
+        stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
+    while blocks > 0:
+        lead = score[tid] - score[1 - tid]
+        style = choose_style(TEAMS[tid], lead, blocks)
+        if hooked:
+            dice.start_drive(TEAMS[tid], to_absolute(tid, pos), blocks, half,
+                             {"Bombers": score[BOMBERS], "Gunners": score[GUNNERS]})
+        _, yards, time_blocks, _, result, points, safety, spent, keep, next_pos, tally = resolve_drive(
+            pos, style, blocks, half, lead, rules)
+        drives += 1
+        score[tid] += points
+        score[1 - tid] += safety
+        if stats is not None:
+            base = tid * NUM_STATS
+            stats[base] += yards
+            stats[base + STAT_TIME_OF_POSSESSION] += time_blocks
+            if tally is not None:
+                stats[base + tally] += 1
+        if result in HALF_ENDING_RESULTS:
+            break
+        blocks -= spent
+        if keep:
+            pos = next_pos
         else:
-            totals["ties"] += 1
+            tid = 1 - tid
+            pos = 100 - next_pos
+            if stats is not None and blocks > 0:
+                stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
+    return drives
+
+def play_game_scores(rules: RuleSet = DEFAULT_RULES, stats: Optional[List[int]] = None) -> Tuple[int, int, int]:
+    """
+    play_game, scores only: (bombers, gunners, drives).
+    stats, if given, is a new_stats() list the game's team stats are added to,
+    so a batch can total its stats in one list with no logs to re-scan.
+    """
+    score = [0, 0]
+    # Bombers receive at their 30 in the first half, Gunners at theirs in the second
+    drives = _play_half_scores(BOMBERS, 30, score, 1, rules, stats)
+    drives += _play_half_scores(GUNNERS, 30, score, 2, rules, stats)
+    return score[BOMBERS], score[GUNNERS], drives
+
+@contextmanager
+def _batch_dice(seed: Optional[int]):
+    """
+    Dice for a batch of games: a buffered source seeded once (so a seed
+    reproduces the whole batch) unless a custom dice source is installed.
+    """
+    if type(DICE) is not Dice:
+        if seed is not None:
+            random.seed(seed)
+        yield
+        return
+    previous = use_dice(BufferedDice(seed))
+    try:
+        yield
+    finally:
+        use_dice(previous)
+
+def simulate_scores(n: int=100, seed: Optional[int]=SEED, rules: RuleSet = DEFAULT_RULES,
+                    stats: Optional[List[int]] = None) -> List[Tuple[int, int, int]]:
+    """n score-only games: [(bombers, gunners, drives), ...]; team stats are totalled into stats"""
+    with _batch_dice(seed):
+        return [play_game_scores(rules, stats) for _ in range(n)]
+
+def simulate_many(n: int=100, seed: Optional[int]=SEED, rules: RuleSet = DEFAULT_RULES) -> Dict[str, float]:
+    totals = {"Bombers":0, "Gunners":0, "ties":0, "avg_pts":0.0}
+    with _batch_dice(seed):
+        for _ in range(n):
+            b, g, _ = play_game_scores(rules)
+            totals["avg_pts"] += (b + g)
+            if b > g:
+                totals["Bombers"] += 1
+            elif g > b:
+                totals["Gunners"] += 1
+            else:
+                totals["ties"] += 1
     totals["avg_pts"] /= n
     return totals
 
+# -----------------------------
+# Step-by-step games
+# GameEngine plays one game a decision at a time, for front ends where a
+# person makes the calls (the Discord bot) and for rollouts from a given
+# state. It owns the whole game state, lists the legal actions for the
+# current phase, and advances on step(action), returning events (plain
+# dicts) that say what happened, for the front end to render. The rules are
+# resolve_drive's, split at its decision points, and draw the same dice in
+# the same order: a game stepped with ai_action() at every decision is
+# exactly play_game. to_dict() / from_dict() round-trip the state through
+# plain JSON types.
+# -----------------------------
+
+# Phases (what the engine is waiting for) and the actions they take
+PLAY_STYLE, FOURTH_DOWN, UNTIMED_DOWN, EXTRA_POINT, GAME_OVER = (
+    "play_style", "fourth_down", "untimed_down", "extra_point", "game_over")
+GO_FOR_IT, FIELD_GOAL, PUNT, END_HALF, ONE_POINT, TWO_POINT = (
+    "go_for_it", "field_goal", "punt", "end_half", "1pt", "2pt")
+
+# Die rolled for yards to go after a 10+ yard drive (go_for_it_choice)
+YARDS_TO_GO_SIDES = {"run": 8, "balanced": 10, "pass": 20}
+
+ENGINE_STATE_VERSION = 1
+
+def _event(kind: str, **fields) -> dict:
+    fields["event"] = kind
+    return fields
+
+class GameEngine:
+    """
+    One game, advanced a decision at a time.
+
+    State: half, blocks_left, possession (team id), pos (offense's frame),
+    score and stats (indexed by team id), phase, plus the drive in progress
+    while a decision on it is pending. Everything a front end shows is read
+    from here; it never changes the state itself.
+
+    Slotted, with stats in an int array, since a bot holds one per live game.
+    """
+
+    __slots__ = ("rules", "first_receiver", "half", "score", "stats", "drives", "drive", "pending",
+                 "yards_to_go", "fourth_and_goal", "possession", "pos", "blocks_left", "phase")
+
+    def __init__(self, rules: RuleSet = DEFAULT_RULES, first_receiver: int = BOMBERS, log: bool = True):
+        self.rules = rules
+        self.first_receiver = first_receiver
+        self.half = 1
+        self.score = [0, 0]
+        self.stats = array("i", new_stats())
+        self.drives: Optional[List[DriveLog]] = [] if log else None
+        # The drive awaiting a decision: (style, roll, start_pos, start_blocks, lead)
+        # and its row so far: (yards, time_blocks, end_pos, blocks_spent, td_result)
+        self.drive = None
+        self.pending = None
+        self.yards_to_go = 0
+        self.fourth_and_goal = False
+        self._start_half(first_receiver)
+
+    # -- views ------------------------------------------------------------
+
+    @property
+    def team(self) -> str:
+        return TEAMS[self.possession]
+
+    @property
+    def field_position(self) -> int:
+        """Ball position in absolute field coordinates"""
+        return to_absolute(self.possession, self.pos)
+
+    @property
+    def lead(self) -> int:
+        return self.score[self.possession] - self.score[1 - self.possession]
+
+    def score_dict(self) -> Dict[str, int]:
+        return {"Bombers": self.score[BOMBERS], "Gunners": self.score[GUNNERS]}
+
+    def result(self) -> GameResult:
+        """The game as simulate_game reports it (drives only if logged)"""
+        return GameResult(list(self.drives or ()), self.score_dict(), list(self.stats))
+
+    def legal_actions(self) -> Tuple[str, ...]:
+        phase = self.phase
+        if phase == PLAY_STYLE:
+            return STYLES
+        if phase == FOURTH_DOWN:
+            return (GO_FOR_IT, FIELD_GOAL, PUNT) if self.pending[2] >= 50 else (GO_FOR_IT, PUNT)
+        if phase == UNTIMED_DOWN:
+            return (GO_FOR_IT, FIELD_GOAL, END_HALF) if self.pending[2] >= 50 else (GO_FOR_IT, END_HALF)
+        if phase == EXTRA_POINT:
+            return (ONE_POINT, TWO_POINT)
+        return ()
+
+    def ai_action(self) -> str:
+        """The AI coach's call for the current phase (draws the coach's dice, like play_game)"""
+        phase = self.phase
+        if phase == PLAY_STYLE:
+            return choose_style(TEAMS[self.possession], self.lead, self.blocks_left)
+        if phase == GAME_OVER:
+            raise ValueError("the game is over")
+        # Decisions on a drive see the clock and lead from the drive's start
+        _, _, _, start_blocks, lead = self.drive
+        end_pos = self.pending[2]
+        if phase == FOURTH_DOWN:
+            p = go_for_it_probability(100 - end_pos, self.yards_to_go, self.fourth_and_goal,
+                                      lead, start_blocks, self.half)
+            if DICE.chance(p, "go_for_it"):
+                return GO_FOR_IT
+            return FIELD_GOAL if end_pos >= 50 else PUNT
+        if phase == UNTIMED_DOWN:
+            decision = end_of_half_choice(100 - end_pos, lead, self.half)
+            if decision == "go_for_it":
+                return GO_FOR_IT
+            # An "fg" out of range is treated as letting the half end
+            return FIELD_GOAL if decision == "fg" and end_pos >= 50 else END_HALF
+        p_two = two_point_probability(lead, start_blocks)
+        return TWO_POINT if p_two > 0 and DICE.chance(p_two, "go_for_two") else ONE_POINT
+
+    # -- transitions ------------------------------------------------------
+
+    def step(self, action: str) -> List[dict]:
+        """Take a legal action for the current phase; returns the events it produced"""
+        if action not in self.legal_actions():
+            raise ValueError(f"{action!r} is not a legal action in phase {self.phase!r}")
+        events = []
+        phase = self.phase
+        if phase == PLAY_STYLE:
+            self._drive(action, events)
+        elif phase == FOURTH_DOWN:
+            self._fourth_down(action, events)
+        elif phase == UNTIMED_DOWN:
+            self._untimed_down(action, events)
+        else:
+            self._extra_point(action, events)
+        return events
+
+    def _start_half(self, tid: int):
+        self.possession = tid
+        self.pos = 30
+        self.blocks_left = self.rules.blocks_per_half
+        self.stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
+        self.phase = PLAY_STYLE
+
+    def _drive(self, style: str, events: List[dict]):
+        rules = self.rules
+        tid = self.possession
+        pos = self.pos
+        blocks = self.blocks_left
+        lead = self.score[tid] - self.score[1 - tid]
+        DICE.start_drive(TEAMS[tid], to_absolute(tid, pos), blocks, self.half, self.score_dict())
+        roll = DICE.roll(20, "drive")
+        y, t = rules.tables[style][roll - 1]
+        turnover_roll = DICE.roll(20, "turnover")
+        turnover = turnover_roll in rules.turnover_rolls[style]
+        self.drive = (style, roll, pos, blocks, lead)
+
+        if y == "TD":
+            yards_needed = 100 - pos
+            time_spent = roll_time_for_td(style, yards_needed, rules)
+            if time_spent > blocks:
+                return self._late_half(turnover_roll, turnover, events)
+            self._drive_event(events, yards_needed, time_spent, 100, turnover_roll, turnover, False)
+            if turnover:
+                return self._finish(events, yards_needed, time_spent, OPP_20_POS, "Turnover (would be TD)",
+                                    0, 0, time_spent, False, OPP_20_POS, STAT_TURNOVERS)
+            return self._touchdown(events, "TD+{}", yards_needed, time_spent, 100, time_spent)
+
+        if t > blocks:
+            return self._late_half(turnover_roll, turnover, events)
+
+        end_pos = pos + y if pos + y < 100 else 100
+        if end_pos <= 0:
+            self._drive_event(events, y, t, end_pos, turnover_roll, turnover, False)
+            return self._finish(events, y, t, end_pos, "Safety", 0, 2, t, False, OPP_KICKOFF_POS, STAT_TURNOVERS)
+        if end_pos >= 100:
+            # Reaching the end zone takes only the time the yards need
+            yards_needed = 100 - pos
+            time_spent = min(t, roll_time_for_td(style, yards_needed, rules))
+            self._drive_event(events, yards_needed, time_spent, 100, turnover_roll, turnover, False)
+            if turnover:
+                return self._finish(events, yards_needed, time_spent, OPP_20_POS, "Turnover (would be TD)",
+                                    0, 0, time_spent, False, OPP_20_POS, STAT_TURNOVERS)
+            return self._touchdown(events, "TD+{} (by yardage)", yards_needed, time_spent, 100, time_spent)
+
+        self._drive_event(events, y, t, end_pos, turnover_roll, turnover, False)
+        if turnover:
+            return self._finish(events, y, t, end_pos, "Turnover", 0, 0, t, False, end_pos, STAT_TURNOVERS)
+
+        # 4th down: yards to go from the gain, or rolled after a 10+ yard drive
+        yards_to_go = 10 - y if y < 10 else DICE.roll(YARDS_TO_GO_SIDES[style], "yards_to_go")
+        distance = 100 - end_pos
+        self.fourth_and_goal = yards_to_go >= distance
+        self.yards_to_go = distance if self.fourth_and_goal else yards_to_go
+        self.pending = (y, t, end_pos, t, None)
+        self.pos = end_pos
+        self.blocks_left = blocks - t
+        self.phase = FOURTH_DOWN
+        events.append(_event("fourth_down", team=TEAMS[tid], yards_to_go=self.yards_to_go,
+                             goal=self.fourth_and_goal, x=to_absolute(tid, end_pos)))
+
+    def _late_half(self, turnover_roll: int, turnover: bool, events: List[dict]):
+        """The rolled row overflows the clock: the largest row that fits, then the untimed down"""
+        style, _, pos, blocks, _ = self.drive
+        tid = self.possession
+        adj_y, adj_t = largest_fitting_row(style, blocks, self.rules)
+        end_pos = pos + adj_y if pos + adj_y < 100 else 100
+        self._drive_event(events, adj_y, adj_t, end_pos, turnover_roll, turnover, True)
+        if end_pos <= 0:
+            return self._finish(events, adj_y, adj_t, end_pos, "Safety (late-half)", 0, 2,
+                                blocks, False, OPP_KICKOFF_POS, STAT_TURNOVERS)
+        if turnover:
+            if end_pos >= 100:
+                return self._finish(events, adj_y, adj_t, OPP_20_POS, "Turnover (late-half, would be TD)", 0, 0,
+                                    blocks, False, OPP_20_POS, STAT_TURNOVERS)
+            return self._finish(events, adj_y, adj_t, end_pos, "Turnover (late-half)", 0, 0,
+                                blocks, False, end_pos, STAT_TURNOVERS)
+        if end_pos >= 100:
+            return self._touchdown(events, "TD+{} (late-half adj)", adj_y, adj_t, end_pos, blocks)
+
+        self.pending = (adj_y, adj_t, end_pos, blocks, None)
+        self.pos = end_pos
+        self.blocks_left = 0
+        self.phase = UNTIMED_DOWN
+        events.append(_event("untimed_down", team=TEAMS[tid], x=to_absolute(tid, end_pos)))
+
+    def _fourth_down(self, action: str, events: List[dict]):
+        y, t, end_pos, spent, _ = self.pending
+        tid = self.possession
+        team = TEAMS[tid]
+        rules = self.rules
+        if action == GO_FOR_IT:
+            roll = DICE.roll(20, "fourth_down")
+            _, gained, is_td, new_pos, is_first_down = fourth_down_result(end_pos, self.yards_to_go, roll, rules)
+            distance = 'goal' if self.fourth_and_goal else self.yards_to_go
+            outcome = "touchdown" if is_td else "first_down" if is_first_down else "failed"
+            events.append(_event("conversion", team=team, roll=roll, yards=gained, outcome=outcome,
+                                 x=to_absolute(tid, new_pos)))
+            if is_td:
+                return self._touchdown(events, f"4th down TD+{{}} ({distance})", y, t, new_pos, spent)
+            if is_first_down:
+                return self._finish(events, y, t, new_pos, f"4th down conversion ({distance})", 0, 0,
+                                    spent, True, new_pos, None)
+            return self._finish(events, y, t, new_pos, f"4th down failed ({distance})", 0, 0,
+                                spent, False, new_pos, None)
+        if action == FIELD_GOAL:
+            good, miss_pos = self._kick(events, end_pos)
+            if good:
+                return self._finish(events, y, t, end_pos, "FG Good", 3, 0, spent, False,
+                                    OPP_KICKOFF_POS, STAT_FGS_MADE)
+            return self._finish(events, y, t, miss_pos, "FG Miss (spot set)", 0, 0, spent, False,
+                                miss_pos, STAT_FGS_MISSED)
+        spot = punt_pos(end_pos, rules)
+        events.append(_event("punt", team=team, x=to_absolute(tid, spot)))
+        return self._finish(events, y, t, spot, "Punt", 0, 0, spent, False, spot, STAT_PUNTS)
+
+    def _untimed_down(self, action: str, events: List[dict]):
+        adj_y, adj_t, end_pos, spent, _ = self.pending
+        tid = self.possession
+        if action == FIELD_GOAL:
+            good, miss_pos = self._kick(events, end_pos)
+            if good:
+                return self._finish(events, adj_y, adj_t, end_pos, "FG Good (untimed down)", 3, 0,
+                                    spent, False, OPP_KICKOFF_POS, STAT_FGS_MADE)
+            return self._finish(events, adj_y, adj_t, miss_pos, "FG Miss (untimed down)", 0, 0,
+                                spent, False, OPP_KICKOFF_POS, STAT_FGS_MISSED)
+        if action == GO_FOR_IT:
+            # Like 4th and goal from the current spot
+            roll = DICE.roll(20, "untimed_down")
+            _, gained, is_td, new_pos, _ = fourth_down_result(end_pos, 100 - end_pos, roll, self.rules)
+            events.append(_event("conversion", team=TEAMS[tid], roll=roll, yards=gained,
+                                 outcome="touchdown" if is_td else "failed", x=to_absolute(tid, new_pos)))
+            if is_td:
+                return self._touchdown(events, "Untimed TD+{}", adj_y, adj_t, new_pos, spent)
+            return self._finish(events, adj_y, adj_t, new_pos, "Untimed down failed", 0, 0,
+                                spent, False, new_pos, None)
+        events.append(_event("kneel", team=TEAMS[tid]))
+        return self._finish(events, adj_y, adj_t, end_pos, "Half Ends (untimed down declined)", 0, 0,
+                            spent, False, end_pos, None)
+
+    def _extra_point(self, action: str, events: List[dict]):
+        yards, time_blocks, end_pos, spent, result = self.pending
+        if action == TWO_POINT:
+            # d10, good on 7+
+            roll = DICE.roll(10, "two_point")
+            points = 2 if roll >= 7 else 0
+            make_distance = None
+        else:
+            # Kicked from 15 yards on the FG table
+            roll = DICE.roll(20, "one_point")
+            make_distance = self.rules.field_goal_distance[roll - 1]
+            points = 1 if make_distance >= 15 else 0
+        events.append(_event("extra_point", team=TEAMS[self.possession], conversion=action, roll=roll,
+                             make_distance=make_distance, good=points > 0, points=points))
+        self._finish(events, yards, time_blocks, end_pos, result.format(action), 6 + points, 0,
+                     spent, False, OPP_KICKOFF_POS, None, credited=6)
+
+    def _kick(self, events: List[dict], end_pos: int) -> Tuple[bool, int]:
+        """A field goal try from end_pos: (good, spot if missed)"""
+        tid = self.possession
+        distance = 100 - end_pos
+        roll = DICE.roll(20, "field_goal")
+        make_distance = self.rules.field_goal_distance[roll - 1]
+        good = make_distance >= distance
+        miss_pos = end_pos if good else missed_fg_pos(end_pos, self.rules)
+        events.append(_event("field_goal", team=TEAMS[tid], roll=roll, distance=distance,
+                             make_distance=make_distance, good=good, x=to_absolute(tid, miss_pos)))
+        return good, miss_pos
+
+    def _drive_event(self, events: List[dict], yards: int, time_blocks: int, end_pos: int,
+                     turnover_roll: int, turnover: bool, late_half: bool):
+        style, roll, pos, blocks, _ = self.drive
+        tid = self.possession
+        events.append(_event("drive", team=TEAMS[tid], style=style, roll=roll, yards=yards,
+                             time_blocks=time_blocks, start_x=to_absolute(tid, pos),
+                             x=to_absolute(tid, end_pos), turnover_roll=turnover_roll,
+                             turnover=turnover, late_half=late_half))
+
+    def _touchdown(self, events: List[dict], result: str, yards: int, time_blocks: int, end_pos: int,
+                   spent: int):
+        """Six points now; the drive finishes after the conversion try"""
+        tid = self.possession
+        self.score[tid] += 6
+        self.pending = (yards, time_blocks, end_pos, spent, result)
+        self.pos = end_pos
+        self.blocks_left = self.drive[3] - spent
+        self.phase = EXTRA_POINT
+        events.append(_event("touchdown", team=TEAMS[tid], points=6))
+
+    def _finish(self, events: List[dict], yards: int, time_blocks: int, end_pos: int, result: str,
+                points: int, safety: int, spent: int, keep: bool, next_pos: int, tally: Optional[int],
+                credited: int = 0):
+        """
+        Record a finished drive (as simulate_half does) and move on to the
+        next possession, half or the end of the game. credited is points
+        already put on the board (a touchdown's six).
+        """
+        tid = self.possession
+        style, roll, start_pos, start_blocks, _ = self.drive
+        if self.drives is not None:
+            self.drives.append(DriveLog(self.half, TEAMS[tid], to_absolute(tid, start_pos), style, roll,
+                                        yards, time_blocks, to_absolute(tid, end_pos), result, points))
+        self.score[tid] += points - credited
+        self.score[1 - tid] += safety
+        base = tid * NUM_STATS
+        self.stats[base] += yards
+        self.stats[base + STAT_TIME_OF_POSSESSION] += time_blocks
+        if tally is not None:
+            self.stats[base + tally] += 1
+        events.append(_event("result", team=TEAMS[tid], result=result, points=points, safety=safety))
+        self.drive = self.pending = None
+
+        blocks = 0 if result in HALF_ENDING_RESULTS else start_blocks - spent
+        self.blocks_left = blocks
+        if keep:
+            self.pos = next_pos
+        else:
+            tid = self.possession = 1 - tid
+            self.pos = 100 - next_pos
+            if blocks > 0:
+                self.stats[tid * NUM_STATS + STAT_POSSESSIONS] += 1
+        if blocks > 0:
+            self.phase = PLAY_STYLE
+            events.append(_event("possession", team=TEAMS[tid], x=self.field_position, kept=keep))
+            return
+
+        events.append(_event("end_of_half", half=self.half, score=self.score_dict()))
+        if self.half == 2:
+            self.blocks_left = 0
+            self.phase = GAME_OVER
+            events.append(_event("game_over", score=self.score_dict()))
+            return
+        # The team that kicked off the first half receives the second
+        self.half = 2
+        self._start_half(1 - self.first_receiver)
+        events.append(_event("possession", team=TEAMS[self.possession], x=self.field_position, kept=False))
+
+    # -- serialisation ------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        """The state as plain JSON types (the rules are not included)"""
+        return {
+            "version": ENGINE_STATE_VERSION,
+            "first_receiver": self.first_receiver,
+            "half": self.half,
+            "blocks_left": self.blocks_left,
+            "possession": self.possession,
+            "pos": self.pos,
+            "score": list(self.score),
+            "stats": list(self.stats),
+            "phase": self.phase,
+            "drive": list(self.drive) if self.drive is not None else None,
+            "pending": list(self.pending) if self.pending is not None else None,
+            "yards_to_go": self.yards_to_go,
+            "fourth_and_goal": self.fourth_and_goal,
+            "drives": [astuple(d) for d in self.drives] if self.drives is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, rules: RuleSet = DEFAULT_RULES) -> "GameEngine":
+        """Rebuild an engine from to_dict() output, under the given rules"""
+        if data.get("version") != ENGINE_STATE_VERSION:
+            raise ValueError(f"unsupported engine state version {data.get('version')!r}")
+        engine = cls.__new__(cls)
+        engine.rules = rules
+        engine.first_receiver = data["first_receiver"]
+        engine.half = data["half"]
+        engine.blocks_left = data["blocks_left"]
+        engine.possession = data["possession"]
+        engine.pos = data["pos"]
+        engine.score = list(data["score"])
+        engine.stats = array("i", data["stats"])
+        engine.phase = data["phase"]
+        engine.drive = tuple(data["drive"]) if data["drive"] is not None else None
+        engine.pending = tuple(data["pending"]) if data["pending"] is not None else None
+        engine.yards_to_go = data["yards_to_go"]
+        engine.fourth_and_goal = data["fourth_and_goal"]
+        drives = data["drives"]
+        engine.drives = [DriveLog(*d) for d in drives] if drives is not None else None
+        return engine
+
+def play_engine_game(rules: RuleSet = DEFAULT_RULES, first_receiver: int = BOMBERS) -> GameEngine:
+    """A whole game on a GameEngine with the AI making every call (play_game, stepwise)"""
+    engine = GameEngine(rules, first_receiver)
+    while engine.phase != GAME_OVER:
+        engine.step(engine.ai_action())
+    return engine
+
+# -----------------------------
+# Roll tapes
+# A game's decisions and the face of every roll the engine made, a byte
+# each, are all it takes to play it again: inside step() the engine's only
+# randomness is DICE.roll (the AI's chance/choose draws only pick actions,
+# and those are on the tape already). Record with Tape.step in place of
+# engine.step; Tape.replay plays the rolls back through TapeDice on a fresh
+# engine under the same rules.
+# -----------------------------
+
+TAPE_ACTIONS = STYLES + (GO_FOR_IT, FIELD_GOAL, PUNT, END_HALF, ONE_POINT, TWO_POINT)
+TAPE_CODES = {action: code for code, action in enumerate(TAPE_ACTIONS)}
+
+class RecordingDice(Dice):
+    """Dice that roll from another source and append each face to rolls"""
+
+    def __init__(self, source: Dice, rolls: bytearray):
+        self.source = source
+        self.rolls = rolls
+
+    def start_drive(self, team: str, x: int, blocks_left: int, half: int, score: Dict[str, int]):
+        self.source.start_drive(team, x, blocks_left, half, score)
+
+    def roll(self, sides: int, tag: str) -> int:
+        face = self.source.roll(sides, tag)
+        self.rolls.append(face)
+        return face
+
+    def chance(self, p: float, tag: str) -> bool:
+        return self.source.chance(p, tag)
+
+    def pick(self, probs, tag: str) -> int:
+        return self.source.pick(probs, tag)
+
+    def choose(self, choice: Choice, tag: str):
+        return self.source.choose(choice, tag)
+
+class TapeDice(Dice):
+    """Dice that play back recorded rolls; any other draw means the tape doesn't fit"""
+
+    def __init__(self, rolls: bytes):
+        self._rolls = iter(rolls)
+
+    def roll(self, sides: int, tag: str) -> int:
+        face = next(self._rolls, 0)
+        if not 1 <= face <= sides:
+            raise ValueError(f"tape doesn't fit: {tag} roll of a d{sides} read {face}")
+        return face
+
+    def chance(self, p: float, tag: str) -> bool:
+        raise ValueError(f"tape doesn't fit: unrecorded {tag} draw")
+
+    def pick(self, probs, tag: str) -> int:
+        raise ValueError(f"tape doesn't fit: unrecorded {tag} draw")
+
+    def choose(self, choice: Choice, tag: str):
+        raise ValueError(f"tape doesn't fit: unrecorded {tag} draw")
+
+    def exhausted(self) -> bool:
+        return next(self._rolls, None) is None
+
+class Tape:
+    """A game's decisions and rolls, one byte each"""
+
+    __slots__ = ("decisions", "rolls")
+
+    def __init__(self, decisions: bytes = b"", rolls: bytes = b""):
+        self.decisions = bytearray(decisions)
+        self.rolls = bytearray(rolls)
+
+    def __eq__(self, other):
+        return isinstance(other, Tape) and (self.decisions, self.rolls) == (other.decisions, other.rolls)
+
+    def step(self, engine: GameEngine, action: str) -> List[dict]:
+        """engine.step(action), with the action and its rolls recorded"""
+        code = TAPE_CODES[action]
+        previous = use_dice(RecordingDice(DICE, self.rolls))
+        try:
+            events = engine.step(action)
+        finally:
+            use_dice(previous)
+        self.decisions.append(code)
+        return events
+
+    def replay(self, first_receiver: int, rules: RuleSet = DEFAULT_RULES,
+               log: bool = True) -> Tuple[GameEngine, List[dict]]:
+        """Play the tape on a fresh engine; returns it and every event, in order"""
+        engine = GameEngine(rules, first_receiver, log=log)
+        events = []
+        dice = TapeDice(self.rolls)
+        previous = use_dice(dice)
+        try:
+            for code in self.decisions:
+                if code >= len(TAPE_ACTIONS):
+                    raise ValueError(f"tape doesn't fit: unknown decision code {code}")
+                events.extend(engine.step(TAPE_ACTIONS[code]))
+        finally:
+            use_dice(previous)
+        if not dice.exhausted():
+            raise ValueError("tape doesn't fit: rolls left over")
+        return engine, events
+
+# Opt-in profiling for whole runs (see gridiron_profile.py)
+if os.environ.get("GRIDIRON_PROFILE", "0") != "0":
+    import gridiron_profile
+    gridiron_profile.enable_from_env(sys.modules[__name__])
+
 # -----------------------------
 # Example usage
 # -----------------------------
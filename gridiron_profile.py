@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for the gridiron_dice engine
+
+Records call counts, cumulative time and branch frequencies for the drive
+engine and the AI coach:
+- play_drive / resolve_drive: which path the drive took (normal, late-half,
+  untimed down played)
+- go_for_it_choice / end_of_half_choice / extra_point / choose_style: what
+  the coach decided
+- roll_time_for_td / td_time_roll / time_for_required_yards /
+  largest_fitting_row: the TD time-capping helpers, and whether the cap
+  cut the roll short
+
+Profiling works by swapping the engine's module-level functions for
+counting wrappers while it is on and putting the originals back afterwards,
+so with profiling off the engine runs its plain functions - no flag checks,
+no overhead. Times are inclusive (play_drive includes the AI calls it makes).
+
+Usage:
+    with profile() as prof:
+        simulate_many(100_000)
+    prof.report()
+
+or set GRIDIRON_PROFILE=1 to profile a whole run and print the report at
+exit (to stderr):
+    GRIDIRON_PROFILE=1 python analyze_games.py
+
+Only calls made through gridiron_dice are seen: code that imported a
+function by name before profiling started (e.g. the Discord bot) keeps
+calling the original.
+"""
+
+import atexit
+import sys
+import time
+from types import SimpleNamespace
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+def _drive_path(gd, result: str) -> str:
+    if result in gd.UNTIMED_DOWN_RESULTS:
+        return "untimed"
+    # Including an untimed down declined: the half ran out on the drive
+    if "late-half" in result or result in gd.HALF_ENDING_RESULTS:
+        return "late-half"
+    return "normal"
+
+
+# Function name -> branch classifier(module, args, result), or None for timing only
+INSTRUMENTED = {
+    "simulate_game": None,
+    "play_game": None,
+    "simulate_half": None,
+    "play_drive": lambda gd, args, result: _drive_path(gd, result[0].result),
+    "resolve_drive": lambda gd, args, result: _drive_path(gd, result[4]),
+    "choose_style": lambda gd, args, result: result,
+    # The drive kernel calls the offense-frame AI functions directly; the
+    # team-name wrappers (should_go_for_it, ...) go through these too
+    "go_for_it_choice": lambda gd, args, result: "go for it" if result[0] else "kick/punt",
+    "end_of_half_choice": lambda gd, args, result: result,
+    "extra_point": lambda gd, args, result: result[1],
+    "roll_time_for_td": None,
+    # A raw roll equal to the cap isn't capped, so this is where the branch shows
+    "td_time_roll": lambda gd, args, result: "capped" if result[0] > result[1] else "rolled",
+    "time_for_required_yards": None,
+    "largest_fitting_row": lambda gd, args, result: "no row fits" if result == (0, 0) else "row fits",
+}
+
+
+class Profile:
+    """Counters filled in while profiling is on"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.branches = defaultdict(Counter)
+
+    def report(self, file=None):
+        """Print calls, time and branch frequencies, busiest function first"""
+        file = file or sys.stdout
+        print("=" * 70, file=file)
+        print("GRIDIRON ENGINE PROFILE", file=file)
+        print("=" * 70, file=file)
+        print(f"{'Function':<26} {'Calls':>12} {'Total ms':>12} {'us/call':>10}", file=file)
+        print("-" * 70, file=file)
+        for name in sorted(self.calls, key=lambda n: -self.seconds[n]):
+            calls = self.calls[name]
+            total = self.seconds[name]
+            print(f"{name:<26} {calls:>12,} {total*1000:>12.1f} {total/calls*1e6:>10.2f}", file=file)
+            branches = self.branches.get(name)
+            if branches:
+                counted = sum(branches.values())
+                parts = ", ".join(f"{branch} {count/counted*100:.1f}%"
+                                  for branch, count in branches.most_common())
+                print(f"    {parts}", file=file)
+        print(file=file)
+
+
+_active = None  # (profile, module, originals) while profiling is on
+
+
+def _wrap(gd, name, func, prof, classify):
+    calls = prof.calls
+    seconds = prof.seconds
+    branches = prof.branches[name]
+    clock = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        result = func(*args, **kwargs)
+        seconds[name] += clock() - start
+        calls[name] += 1
+        if classify is not None:
+            branches[classify(gd, args, result)] += 1
+        return result
+
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def enable(prof: Profile = None, module=None) -> Profile:
+    """Start profiling the engine (module defaults to gridiron_dice)"""
+    global _active
+    if _active is not None:
+        raise RuntimeError("Engine profiling is already on")
+    if module is None:
+        import gridiron_dice as module
+    prof = prof or Profile()
+
+    originals = {name: getattr(module, name) for name in INSTRUMENTED}
+    # Classifiers see the module's constants and the unwrapped helpers, so they don't count themselves
+    plain = SimpleNamespace(**{**vars(module), **originals})
+    for name, classify in INSTRUMENTED.items():
+        setattr(module, name, _wrap(plain, name, originals[name], prof, classify))
+    _active = (prof, module, originals)
+    return prof
+
+
+def disable() -> Profile:
+    """Stop profiling and put the original functions back; returns the profile"""
+    global _active
+    if _active is None:
+        return None
+    prof, module, originals = _active
+    for name, func in originals.items():
+        setattr(module, name, func)
+    _active = None
+    return prof
+
+
+@contextmanager
+def profile(prof: Profile = None):
+    """Profile the engine for the duration of a with-block"""
+    prof = enable(prof)
+    try:
+        yield prof
+    finally:
+        disable()
+
+
+def enable_from_env(module):
+    """Called by gridiron_dice when GRIDIRON_PROFILE is set: profile the whole run"""
+    prof = enable(module=module)
+    atexit.register(lambda: prof.report(file=sys.stderr))
@@ -0,0 +1,119 @@
+"""
+Outgoing message queue for one Discord channel
+
+Everything the bot posts to a channel on its own (not as a reply to a
+command) goes through the channel's Outbox. post() only queues embeds; a
+worker task sends whatever has queued up as few messages as the API
+allows - up to MAX_EMBEDS embeds and MAX_EMBED_CHARS characters each - so
+a burst like an AI turn plus the end-of-half and stats embeds becomes one
+message instead of four. Messages go out in order. When Discord says the
+channel is rate limited the worker waits as long as it's told (or backs
+off exponentially if it isn't told) and retries the same message.
+
+Kept free of discord imports: the send function and the embeds are
+whatever the caller passes.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+# Discord's per-message limits
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+# Rate-limit backoff when the error doesn't say how long to wait
+BACKOFF_START = 0.5
+BACKOFF_MAX = 30.0
+MAX_ATTEMPTS = 6
+
+
+def batches(embeds: list, max_embeds: int = MAX_EMBEDS, max_chars: int = MAX_EMBED_CHARS,
+            size: Callable[[object], int] = len) -> List[list]:
+    """Split embeds, in order, into the fewest messages within the limits"""
+    messages = []
+    current, chars = [], 0
+    for embed in embeds:
+        n = size(embed)
+        if current and (len(current) == max_embeds or chars + n > max_chars):
+            messages.append(current)
+            current, chars = [], 0
+        current.append(embed)
+        chars += n
+    if current:
+        messages.append(current)
+    return messages
+
+
+def retry_delay(exc: BaseException) -> Optional[float]:
+    """
+    Seconds to wait before retrying after exc, if it's a rate limit
+    (0.0 = rate limited but no delay given), else None.
+    """
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    if getattr(exc, "status", None) == 429:
+        return 0.0
+    return None
+
+
+class Outbox:
+    """
+    One channel's queue of outgoing embeds.
+
+    send:    async function(embeds) posting one message.
+    on_idle: called when the queue has drained and the worker stops.
+    on_rate_limited: called each time a send is rate limited.
+    """
+
+    def __init__(self, send: Callable[[list], Awaitable[object]], on_idle: Optional[Callable[[], None]] = None,
+                 size: Callable[[object], int] = len, on_rate_limited: Optional[Callable[[], None]] = None):
+        self._send = send
+        self._on_idle = on_idle
+        self._on_rate_limited = on_rate_limited
+        self._size = size
+        self._pending: list = []
+        self._task: Optional[asyncio.Task] = None
+        self.messages_sent = 0
+        self.rate_limited = 0
+
+    def post(self, embeds: list):
+        """Queue embeds to go out after everything already queued"""
+        self._pending.extend(embeds)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def drain(self):
+        """Wait until everything posted so far has been sent"""
+        while self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _run(self):
+        try:
+            while self._pending:
+                message = batches(self._pending, size=self._size)[0]
+                del self._pending[:len(message)]
+                await self._deliver(message)
+        finally:
+            self._task = None
+            if self._on_idle is not None and not self._pending:
+                self._on_idle()
+
+    async def _deliver(self, message: list):
+        backoff = BACKOFF_START
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                await self._send(message)
+                self.messages_sent += 1
+                return
+            except Exception as exc:
+                delay = retry_delay(exc)
+                if delay is None:
+                    print(f"Error sending message: {exc}")
+                    return
+                self.rate_limited += 1
+                if self._on_rate_limited is not None:
+                    self._on_rate_limited()
+                await asyncio.sleep(delay or backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX)
+        print(f"Dropped a message after {MAX_ATTEMPTS} rate-limited attempts")
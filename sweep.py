@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Sweep the game rules over a grid and tabulate the results
+
+Each grid cell is one RuleSet (punt yards, blocks per half, turnover rolls
+per style, missed-FG backup) simulated for --games games. Cells run in a
+process pool and each finished cell is written to the cache directory as
+it completes, keyed by its rules, game count and seed - so an interrupted
+sweep picks up where it stopped, and overlapping sweeps share cells.
+
+Every cell uses the same seed, so cells are compared on common dice and
+differences between them are mostly the rules, not the luck.
+
+Ranges are comma lists or start:stop[:step] (stop inclusive). A turnover
+value k means the style turns the ball over on d20 rolls 1..k.
+
+Example (a 5x5x5 grid):
+    python sweep.py --punt-yards 30:50:5 --blocks-per-half 140:220:20 \\
+        --turnovers-pass 2:6 --games 20000 --out punt_clock_pass.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from itertools import product
+from typing import Dict, List
+
+from gridiron_dice import (
+    DEFAULT_RULES, RuleSet, BufferedDice, STYLES, use_dice, play_game,
+    BOMBERS, GUNNERS, NUM_STATS, STAT_FGS_MADE, STAT_PUNTS, STAT_TURNOVERS,
+)
+
+DEFAULT_CACHE = ".sweep_cache"
+# Bumped when the metrics change, so older cached cells are rerun
+CACHE_VERSION = 2
+
+# Swept parameter -> (flag, stock value)
+PARAMETERS = {
+    "punt_yards": ("--punt-yards", DEFAULT_RULES.punt_yards),
+    "blocks_per_half": ("--blocks-per-half", DEFAULT_RULES.blocks_per_half),
+    "missed_fg_backup": ("--missed-fg-backup", DEFAULT_RULES.missed_fg_backup),
+}
+for _style in STYLES:
+    PARAMETERS[f"turnovers_{_style}"] = (f"--turnovers-{_style}", len(DEFAULT_RULES.turnover_thresholds[_style]))
+
+METRICS = ["avg_total", "avg_margin", "bombers_win_pct", "tie_pct", "drives_per_game",
+           "td_per_game", "fg_per_game", "turnovers_per_game", "punts_per_game"]
+
+
+def parse_range(text: str) -> List[int]:
+    """'30,35,40' or '30:40:5' (stop inclusive) -> list of ints"""
+    if ":" in text:
+        parts = [int(p) for p in text.split(":")]
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) > 2 else 1
+        if step <= 0:
+            raise argparse.ArgumentTypeError(f"step must be positive: {text}")
+        return list(range(start, stop + 1, step))
+    return [int(p) for p in text.split(",")]
+
+
+def rules_for(cell: Dict[str, int]) -> RuleSet:
+    """The RuleSet for one grid cell"""
+    thresholds = {style: tuple(range(1, cell[f"turnovers_{style}"] + 1)) for style in STYLES}
+    return DEFAULT_RULES.replace(
+        punt_yards=cell["punt_yards"],
+        blocks_per_half=cell["blocks_per_half"],
+        missed_fg_backup=cell["missed_fg_backup"],
+        turnover_thresholds=thresholds,
+    )
+
+
+def cell_key(rules: RuleSet, games: int, seed: int) -> str:
+    """Stable cache key (hash() is salted per process, so hash the repr instead)"""
+    return hashlib.sha1(repr((CACHE_VERSION, rules.key(), games, seed)).encode()).hexdigest()
+
+
+def run_cell(rules: RuleSet, games: int, seed: int) -> Dict[str, float]:
+    """Simulate one cell; returns the METRICS averaged over its games"""
+    sums = dict.fromkeys(METRICS, 0.0)
+    previous = use_dice(BufferedDice(seed))
+    try:
+        for _ in range(games):
+            gr = play_game(rules)
+            b, g = gr.score["Bombers"], gr.score["Gunners"]
+            sums["avg_total"] += b + g
+            sums["avg_margin"] += abs(b - g)
+            sums["bombers_win_pct"] += 100 * (b > g)
+            sums["tie_pct"] += 100 * (b == g)
+            sums["drives_per_game"] += len(gr.drives)
+            sums["td_per_game"] += sum(1 for d in gr.drives if "TD" in d.result and d.points >= 6)
+            # The engine's own counters cover every variant of each result
+            # (late-half, untimed down, would-be TD); turnovers include safeties
+            for tid in (BOMBERS, GUNNERS):
+                base = tid * NUM_STATS
+                sums["fg_per_game"] += gr.stats[base + STAT_FGS_MADE]
+                sums["turnovers_per_game"] += gr.stats[base + STAT_TURNOVERS]
+                sums["punts_per_game"] += gr.stats[base + STAT_PUNTS]
+    finally:
+        use_dice(previous)
+    return {m: round(v / games, 4) for m, v in sums.items()}
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def load_cached(cache_dir: str, key: str):
+    try:
+        with open(_cache_path(cache_dir, key)) as f:
+            return json.load(f)["metrics"]
+    except (OSError, ValueError, KeyError):
+        # Missing, or a half-written file from an older crash: rerun the cell
+        return None
+
+
+def store_cached(cache_dir: str, key: str, cell: Dict[str, int], metrics: Dict[str, float]):
+    # Write-then-rename, so a killed sweep never leaves a truncated cell behind
+    path = _cache_path(cache_dir, key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"cell": cell, "metrics": metrics}, f, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _worker(job):
+    index, cell, games, seed = job
+    return index, run_cell(rules_for(cell), games, seed)
+
+
+def sweep(grid: Dict[str, List[int]], games: int, seed: int, cache_dir: str = DEFAULT_CACHE,
+          processes: int = None, progress=None) -> List[Dict[str, float]]:
+    """
+    Run every cell of the grid (parameter -> values), reusing cached cells.
+    Returns one row per cell: the parameters followed by the metrics.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    names = list(grid)
+    cells = [dict(zip(names, values)) for values in product(*(grid[n] for n in names))]
+    keys = [cell_key(rules_for(cell), games, seed) for cell in cells]
+
+    results = [load_cached(cache_dir, key) for key in keys]
+    pending = [(i, cells[i], games, seed) for i, r in enumerate(results) if r is None]
+    done = len(cells) - len(pending)
+    if progress:
+        progress(done, len(cells))
+
+    if pending:
+        processes = processes or os.cpu_count() or 1
+        with multiprocessing.Pool(min(processes, len(pending))) as pool:
+            for i, metrics in pool.imap_unordered(_worker, pending):
+                store_cached(cache_dir, keys[i], cells[i], metrics)
+                results[i] = metrics
+                done += 1
+                if progress:
+                    progress(done, len(cells))
+
+    return [{**cell, **metrics} for cell, metrics in zip(cells, results)]
+
+
+def write_table(rows: List[Dict[str, float]], path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate a grid of rule variants")
+    for name, (flag, stock) in PARAMETERS.items():
+        parser.add_argument(flag, dest=name, type=parse_range, default=[stock],
+                            help=f"values to sweep (default: stock {stock})")
+    parser.add_argument("--games", type=int, default=10_000, help="games per cell (default 10000)")
+    parser.add_argument("--seed", type=int, default=1, help="seed shared by every cell (default 1)")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help=f"cell cache directory (default {DEFAULT_CACHE})")
+    parser.add_argument("--out", default="sweep_results.csv", help="result table (CSV)")
+    args = parser.parse_args(argv)
+
+    grid = {name: getattr(args, name) for name in PARAMETERS}
+    total = 1
+    for values in grid.values():
+        total *= len(values)
+    print(f"Sweeping {total} cell(s) x {args.games:,} games (seed {args.seed})")
+
+    def progress(done, total):
+        print(f"\r  {done}/{total} cells done", end="", file=sys.stderr, flush=True)
+
+    rows = sweep(grid, args.games, args.seed, args.cache, args.processes, progress)
+    print(file=sys.stderr)
+    write_table(rows, args.out)
+    print(f"Wrote {len(rows)} row(s) to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
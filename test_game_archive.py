@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test roll tapes and the archive of finished games
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from game_archive import GameArchive, GameRecord
+from gridiron_dice import GameEngine, Tape, GAME_OVER, use_dice, BufferedDice, DEFAULT_RULES
+
+NUM_GAMES = 2000
+
+print("Testing roll tapes and the game archive:")
+print("=" * 70)
+print()
+
+# Test 1: replaying a tape rebuilds the game exactly
+print(f"Test 1: record {NUM_GAMES} AI games, replay their tapes")
+random.seed(1)
+games = []
+for n in range(NUM_GAMES):
+    engine = GameEngine(first_receiver=n % 2)
+    tape = Tape()
+    while engine.phase != GAME_OVER:
+        tape.step(engine, engine.ai_action())
+    games.append((engine, tape))
+mismatches = 0
+for engine, tape in games:
+    replayed, _ = tape.replay(engine.first_receiver)
+    if (replayed.drives, replayed.score, list(replayed.stats)) != (engine.drives, engine.score, list(engine.stats)):
+        mismatches += 1
+print(f"  Mismatches: {mismatches}")
+print(f"  Result: {'PASS' if mismatches == 0 else 'FAIL'}")
+print()
+
+# Test 2: recording works over any dice source, and a tape that doesn't fit is caught
+print("Test 2: recording from BufferedDice; truncated and changed tapes")
+previous = use_dice(BufferedDice(seed=7))
+engine = GameEngine()
+tape = Tape()
+while engine.phase != GAME_OVER:
+    tape.step(engine, engine.ai_action())
+use_dice(previous)
+same = tape.replay(engine.first_receiver)[0].score == engine.score
+errors = 0
+for broken in (Tape(tape.decisions, tape.rolls[:-1]), Tape(tape.decisions, tape.rolls + b"\x01"),
+               Tape(tape.decisions + b"\xff", tape.rolls)):
+    try:
+        broken.replay(engine.first_receiver)
+    except ValueError:
+        errors += 1
+shorter_halves = DEFAULT_RULES.replace(blocks_per_half=120)
+record = GameRecord(1, (10, 20), ("Home", "Away"), engine.first_receiver, tuple(engine.score), tape)
+try:
+    record.replay(shorter_halves)
+    errors_rules = 0
+except ValueError:
+    errors_rules = 1
+print(f"  Replays: {same}, broken tapes caught: {errors}/3, other rules caught: {errors_rules}")
+print(f"  Result: {'PASS' if same and errors == 3 and errors_rules else 'FAIL'}")
+print()
+
+# Test 3: records round-trip through the archive and stay small
+print("Test 3: archive, look up and replay")
+workdir = tempfile.mkdtemp()
+archive = GameArchive(os.path.join(workdir, "archive.db"))
+records = []
+for n, (engine, tape) in enumerate(games):
+    record = GameRecord(n % 50, (1000 + n % 7, 2000 + n % 11), ("Bombers", "Gunners ✈"),
+                        engine.first_receiver, tuple(engine.score), tape, ai_team=n % 2)
+    archive.add(record)
+    records.append(record)
+sizes = [len(record.pack()) for record in records]
+archive.close()
+archive = GameArchive(os.path.join(workdir, "archive.db"))
+loaded = [archive.get(record.game_id) for record in records]
+in_channel = archive.recent(channel_id=3, limit=5)
+with_player = archive.recent(player_id=2005, limit=1000)
+ok = (loaded == records
+      and [r.game_id for r in in_channel] == [r.game_id for r in reversed(records) if r.channel_id == 3][:5]
+      and sorted(r.game_id for r in with_player) == [r.game_id for r in records if 2005 in r.player_ids]
+      and archive.get(-1) is None
+      and all(r.replay()[0].drives == engine.drives for r, (engine, _) in zip(loaded[:200], games)))
+archive.close()
+shutil.rmtree(workdir)
+print(f"  Record size: mean {sum(sizes) / len(sizes):.0f} bytes, max {max(sizes)}")
+print(f"  Result: {'PASS' if ok and max(sizes) < 512 else 'FAIL'}")
+print()
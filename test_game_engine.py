@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the step-by-step GameEngine against full simulated games
+"""
+
+import json
+import random
+from dataclasses import astuple
+from gridiron_dice import (
+    simulate_game, play_engine_game, GameEngine, GAME_OVER, PLAY_STYLE,
+)
+
+NUM_GAMES = 1000
+
+print("Testing GameEngine against simulate_game:")
+print("=" * 70)
+print()
+
+# Test 1: stepped with the AI's calls, the engine plays exactly play_game
+print(f"Test 1: AI-stepped engine vs simulate_game, seeds 0..{NUM_GAMES - 1}")
+mismatches = 0
+for seed in range(NUM_GAMES):
+    game = simulate_game(seed)
+    random.seed(seed)
+    engine = play_engine_game()
+    same = ([astuple(d) for d in engine.drives] == [astuple(d) for d in game.drives]
+            and engine.score_dict() == game.score and list(engine.stats) == game.stats)
+    if not same:
+        mismatches += 1
+        if mismatches <= 3:
+            print(f"  Seed {seed}: engine {engine.score_dict()}, simulate_game {game.score}")
+print(f"  Mismatches: {mismatches}")
+print(f"  Result: {'PASS' if mismatches == 0 else 'FAIL'}")
+print()
+
+# Test 2: a JSON round trip at every decision changes nothing
+print("Test 2: to_dict/from_dict round trip at every step (seeds 0..99)")
+failures = 0
+for seed in range(100):
+    random.seed(seed)
+    engine = GameEngine()
+    while engine.phase != GAME_OVER:
+        restored = GameEngine.from_dict(json.loads(json.dumps(engine.to_dict())))
+        state = random.getstate()
+        events = engine.step(engine.ai_action())
+        random.setstate(state)
+        if restored.step(restored.ai_action()) != events or restored.to_dict() != engine.to_dict():
+            failures += 1
+            break
+print(f"  Games that diverged: {failures}")
+print(f"  Result: {'PASS' if failures == 0 else 'FAIL'}")
+print()
+
+# Test 3: only the current phase's actions are accepted
+print("Test 3: illegal actions are rejected")
+engine = GameEngine()
+rejected = 0
+for action in ("punt", "1pt", "end_half", "bogus"):
+    try:
+        engine.step(action)
+    except ValueError:
+        rejected += 1
+print(f"  Rejected {rejected}/4, phase still {engine.phase!r}")
+print(f"  Result: {'PASS' if rejected == 4 and engine.phase == PLAY_STYLE else 'FAIL'}")
+print()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the bot's game store: journal, snapshots and restore
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from game_store import GameStore, StoreError
+from gridiron_dice import GameEngine, GAME_OVER
+
+NUM_GAMES = 3000
+
+print("Testing the game store:")
+print("=" * 70)
+print()
+
+workdir = tempfile.mkdtemp()
+path = os.path.join(workdir, "games.db")
+
+# Test 1: the latest state of each game comes back; finished games don't
+print(f"Test 1: {NUM_GAMES} games, a few transitions each, some finished")
+random.seed(1)
+store = GameStore(path, snapshot_every=5000)
+expected = {}
+engines = {channel_id: GameEngine(log=False) for channel_id in range(NUM_GAMES)}
+for _ in range(5):
+    for channel_id, engine in engines.items():
+        if engine.phase != GAME_OVER:
+            engine.step(engine.ai_action())
+            expected[channel_id] = engine.to_dict()
+            store.save(channel_id, expected[channel_id])
+for channel_id in range(0, NUM_GAMES, 7):
+    store.delete(channel_id)
+    del expected[channel_id]
+store.flush()
+loaded = store.load_all()
+store.close()
+print(f"  Live games: {len(expected)}, loaded: {len(loaded)}")
+print(f"  Result: {'PASS' if loaded == expected else 'FAIL'}")
+print()
+
+# Test 2: reopening folds the journal into snapshots and loses nothing
+print("Test 2: reopen (journal folded into snapshots)")
+store = GameStore(path)
+journal_rows = store._conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+start = time.perf_counter()
+loaded = store.load_all()
+elapsed = time.perf_counter() - start
+store.close()
+print(f"  Journal rows after reopen: {journal_rows}")
+print(f"  Loaded {len(loaded)} games in {elapsed*1000:.1f} ms")
+print(f"  Result: {'PASS' if loaded == expected and journal_rows == 0 else 'FAIL'}")
+print()
+
+# Test 3: single-game loads see queued saves and deletes
+print("Test 3: load() one game at a time")
+store = GameStore(path)
+channel_id = next(iter(expected))
+engine = GameEngine.from_dict(expected[channel_id])
+engine.step(engine.ai_action())
+store.save(channel_id, engine.to_dict())
+fresh = store.load(channel_id) == engine.to_dict()
+snapshotted = all(store.load(c) == expected[c] for c in list(expected)[1:50])
+store.delete(channel_id)
+deleted = store.load(channel_id) is None and store.load(-1) is None
+store.close()
+print(f"  Queued save seen: {fresh}, snapshots: {snapshotted}, deletes: {deleted}")
+print(f"  Result: {'PASS' if fresh and snapshotted and deleted else 'FAIL'}")
+print()
+
+# Test 4: a failing commit keeps the writer alive, is reported, and is retried
+print("Test 4: writer survives a failing database")
+store = GameStore(path)
+other = sqlite3.connect(path)
+other.execute("ALTER TABLE journal RENAME TO journal_away")
+other.commit()
+engine = GameEngine(log=False)
+store.save(-2, engine.to_dict())
+stuck = not store.flush(timeout=0.5)
+try:
+    store.save(-2, engine.to_dict())
+    reported = False
+except StoreError:
+    reported = True
+try:
+    store.load(-2, timeout=0.2)
+    load_refused = False
+except StoreError:
+    load_refused = True
+other.execute("ALTER TABLE journal_away RENAME TO journal")
+other.commit()
+other.close()
+recovered = store.flush(timeout=10) and store.load(-2) == engine.to_dict() and store._thread.is_alive()
+store.close()
+print(f"  Stuck while failing: {stuck}, reported: {reported}, load refused: {load_refused}, "
+      f"recovered: {recovered}")
+print(f"  Result: {'PASS' if stuck and reported and load_refused and recovered else 'FAIL'}")
+print()
+
+# Test 5: loads from other threads, while the writer commits, read their own connection
+print("Test 5: concurrent loads from worker threads")
+store = GameStore(path)
+engine = GameEngine(log=False)
+states = []
+while engine.phase != GAME_OVER and len(states) < 40:
+    engine.step(engine.ai_action())
+    states.append(engine.to_dict())
+errors = []
+seen = []
+
+
+def load_repeatedly():
+    try:
+        for _ in range(20):
+            seen.append(store.load(-3))
+    except Exception as exc:
+        errors.append(exc)
+
+
+workers = [threading.Thread(target=load_repeatedly) for _ in range(4)]
+for worker in workers:
+    worker.start()
+for state in states:
+    store.save(-3, state)
+for worker in workers:
+    worker.join()
+latest = store.load(-3) == states[-1]
+store.close()
+valid = all(state is None or state in states for state in seen)
+print(f"  Loads: {len(seen)}, errors: {len(errors)}, all valid: {valid}, latest seen: {latest}")
+print(f"  Result: {'PASS' if not errors and valid and latest else 'FAIL'}")
+print()
+
+shutil.rmtree(workdir)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the metrics registry and its HTTP endpoint
+"""
+
+import asyncio
+from metrics import Registry, serve, rss_bytes
+
+print("Testing metrics:")
+print("=" * 70)
+print()
+
+registry = Registry()
+commands = registry.histogram("test_command_seconds", "Command time", ("command",), buckets=(0.1, 1.0))
+sent = registry.counter("test_sent_total", "Messages sent")
+games = registry.gauge("test_games", "Games", ("state",))
+registry.collect(lambda: games.set(3, state="play_style"))
+
+# Test 1: histogram buckets are cumulative; sum and count add up
+print("Test 1: histogram, counter and collected gauge")
+for seconds in (0.05, 0.5, 0.5, 2.0):
+    commands.observe(seconds, command="pass")
+sent.inc()
+sent.inc(2)
+text = registry.render()
+expected = [
+    'test_command_seconds_bucket{command="pass",le="0.1"} 1',
+    'test_command_seconds_bucket{command="pass",le="1.0"} 3',
+    'test_command_seconds_bucket{command="pass",le="+Inf"} 4',
+    'test_command_seconds_sum{command="pass"} 3.05',
+    'test_command_seconds_count{command="pass"} 4',
+    'test_sent_total 3',
+    'test_games{state="play_style"} 3',
+    '# TYPE test_command_seconds histogram',
+]
+missing = [line for line in expected if line not in text.splitlines()]
+for line in missing:
+    print(f"  Missing: {line}")
+print(f"  Result: {'PASS' if not missing else 'FAIL'}")
+print()
+
+# Test 2: the endpoint serves metrics, health and readiness
+print("Test 2: /metrics, /healthz, /ready over HTTP")
+state = {"ready": False}
+
+
+async def get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status = response.split(b"\r\n", 1)[0].decode()
+    return status.split(" ", 1)[1], response.split(b"\r\n\r\n", 1)[1].decode()
+
+
+async def scrape():
+    server = await serve(registry, 0, ready=lambda: state["ready"])
+    port = server.sockets[0].getsockname()[1]
+    results = [await get(port, "/ready")]
+    state["ready"] = True
+    for path in ("/ready", "/healthz", "/metrics", "/nope"):
+        results.append(await get(port, path))
+    server.close()
+    await server.wait_closed()
+    return results
+
+
+results = asyncio.run(scrape())
+statuses = [status for status, _ in results]
+print(f"  Statuses: {statuses}")
+ok = (statuses == ["503 Service Unavailable", "200 OK", "200 OK", "200 OK", "404 Not Found"]
+      and "test_sent_total 3" in results[3][1])
+print(f"  Result: {'PASS' if ok else 'FAIL'}")
+print()
+
+# Test 3: memory reads as something plausible
+print("Test 3: rss_bytes")
+rss = rss_bytes()
+print(f"  RSS: {rss / 1e6:.1f} MB")
+print(f"  Result: {'PASS' if 1e6 < rss < 1e11 else 'FAIL'}")
+print()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the per-channel outbox: coalescing, ordering and rate-limit retries
+"""
+
+import asyncio
+import outbox
+from outbox import Outbox, batches
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after=None, status=429):
+        super().__init__("rate limited")
+        if retry_after is not None:
+            self.retry_after = retry_after
+        self.status = status
+
+
+class FakeChannel:
+    """Records messages; raises a rate limit on every `limit_every`th send"""
+
+    def __init__(self, limit_every=0):
+        self.limit_every = limit_every
+        self.calls = 0
+        self.messages = []
+
+    async def send(self, embeds):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.limit_every and self.calls % self.limit_every == 0:
+            raise RateLimited(retry_after=0.001 if self.calls % 2 else None)
+        self.messages.append(list(embeds))
+
+
+print("Testing the outbox:")
+print("=" * 70)
+print()
+
+# Test 1: batches respects the embed count and character limits, in order
+print("Test 1: batches() limits")
+embeds = ["x" * n for n in (100, 2500, 2500, 2000, 10, 10)] + ["y"] * 12
+split = batches(embeds)
+ok = (sum(split, []) == embeds
+      and all(len(m) <= outbox.MAX_EMBEDS and sum(map(len, m)) <= outbox.MAX_EMBED_CHARS for m in split)
+      and len(split) == 3)
+print(f"  {len(embeds)} embeds -> {[len(m) for m in split]}")
+print(f"  Result: {'PASS' if ok else 'FAIL'}")
+print()
+
+# Test 2: posts queued while a send is in flight go out together, in order
+print("Test 2: coalescing 40 turns of 3 embeds")
+
+
+async def coalesce():
+    channel = FakeChannel()
+    idle = []
+    box = Outbox(channel.send, on_idle=lambda: idle.append(True))
+    for turn in range(40):
+        box.post([f"{turn}.{i}" for i in range(3)])
+    await box.drain()
+    return channel, box, idle
+
+
+channel, box, idle = asyncio.run(coalesce())
+expected = [f"{turn}.{i}" for turn in range(40) for i in range(3)]
+ok = sum(channel.messages, []) == expected and len(channel.messages) == 12 and idle == [True]
+print(f"  Messages: {len(channel.messages)} (120 embeds), sent counter {box.messages_sent}")
+print(f"  Result: {'PASS' if ok else 'FAIL'}")
+print()
+
+# Test 3: rate-limited sends are retried without losing or reordering anything
+print("Test 3: retries on rate limits")
+outbox.BACKOFF_START = 0.001
+
+
+async def rate_limited():
+    channel = FakeChannel(limit_every=3)
+    box = Outbox(channel.send)
+    for turn in range(30):
+        box.post([f"{turn}"])
+        await asyncio.sleep(0)
+    await box.drain()
+    return channel, box
+
+
+channel, box = asyncio.run(rate_limited())
+ok = sum(channel.messages, []) == [f"{turn}" for turn in range(30)] and box.rate_limited > 0
+print(f"  Messages: {len(channel.messages)}, rate limited {box.rate_limited} time(s)")
+print(f"  Result: {'PASS' if ok else 'FAIL'}")
+print()
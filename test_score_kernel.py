@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test the score-only game kernel against full simulated games
+"""
+
+import random
+from gridiron_dice import (
+    simulate_game, play_game, play_game_scores, simulate_scores,
+    BufferedDice, use_dice,
+)
+
+NUM_GAMES = 1000
+
+print("Testing score-only games against simulate_game:")
+print("=" * 70)
+print()
+
+# Test 1: same seed, same final score and drive count
+print(f"Test 1: play_game_scores vs simulate_game, seeds 0..{NUM_GAMES - 1}")
+mismatches = 0
+for seed in range(NUM_GAMES):
+    game = simulate_game(seed)
+    random.seed(seed)
+    scores = play_game_scores()
+    expected = (game.score["Bombers"], game.score["Gunners"], len(game.drives))
+    if scores != expected:
+        mismatches += 1
+        if mismatches <= 3:
+            print(f"  Seed {seed}: expected {expected}, got {scores}")
+print(f"  Mismatches: {mismatches}")
+print(f"  Result: {'PASS' if mismatches == 0 else 'FAIL'}")
+print()
+
+# Test 2: a seeded batch matches full games played on the same buffered dice
+print(f"Test 2: simulate_scores({NUM_GAMES}, seed=7) vs play_game on BufferedDice(7)")
+batch = simulate_scores(NUM_GAMES, seed=7)
+previous = use_dice(BufferedDice(7))
+try:
+    full = [play_game() for _ in range(NUM_GAMES)]
+finally:
+    use_dice(previous)
+expected = [(g.score["Bombers"], g.score["Gunners"], len(g.drives)) for g in full]
+print(f"  Games compared: {len(batch)}")
+print(f"  Result: {'PASS' if batch == expected else 'FAIL'}")
+print()
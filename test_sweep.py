@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test the rule sweep's per-cell metrics against the drive logs
+"""
+
+from gridiron_dice import DEFAULT_RULES, BufferedDice, use_dice, play_game
+from sweep import run_cell
+
+NUM_GAMES = 2000
+SEED = 3
+
+print("Testing sweep metrics:")
+print("=" * 70)
+print()
+
+# Test 1: FG, turnover and punt rates count every variant of each result
+print(f"Test 1: run_cell({NUM_GAMES} games, seed={SEED}) vs the games' drive logs")
+metrics = run_cell(DEFAULT_RULES, NUM_GAMES, SEED)
+previous = use_dice(BufferedDice(SEED))
+try:
+    games = [play_game(DEFAULT_RULES) for _ in range(NUM_GAMES)]
+finally:
+    use_dice(previous)
+counts = {"fg_per_game": 0, "turnovers_per_game": 0, "punts_per_game": 0}
+for game in games:
+    for d in game.drives:
+        if d.result.startswith("FG Good"):
+            counts["fg_per_game"] += 1
+        elif d.result.startswith(("Turnover", "Safety")):
+            counts["turnovers_per_game"] += 1
+        elif d.result == "Punt":
+            counts["punts_per_game"] += 1
+expected = {name: round(count / NUM_GAMES, 4) for name, count in counts.items()}
+got = {name: metrics[name] for name in expected}
+print(f"  Expected: {expected}")
+print(f"  Got:      {got}")
+print(f"  Result: {'PASS' if got == expected else 'FAIL'}")
+print()